@@ -0,0 +1,179 @@
+"""Tüm geçmiş üzerinde vektörel analizler (parça parça okunan sütunlar + pandas/NumPy)
+
+Ham işlemler PARCA_BOYUTU satırlık parçalarla okunur ve her parça hemen gün x tip x kategori
+toplamlarına indirgenir; bellek kullanımı satır sayısıyla değil gün ve kategori sayısıyla büyür.
+Arşivlenmiş yıllar varsa tum_islemler görünümü üzerinden onlar da okunur.
+Fonksiyonlar TL cinsinden (float) DataFrame döndürür; veri yoksa DataFrame boştur.
+"""
+import numpy as np
+import pandas as pd
+
+import arsiv
+from para import KURUS
+
+PARCA_BOYUTU = 100_000
+TIPLER = ["Gelir", "Gider"]
+
+
+def gunluk_toplamlar(conn, parca_boyutu=PARCA_BOYUTU):
+    """(tarih, tip, kategori_id, toplam) satırlarından oluşan gün bazında kuruş toplamları"""
+    parcalar = []
+    with arsiv.arsivler_bagli(conn) as arsivler:
+        kaynak = "tum_islemler" if arsivler else "islemler"
+        for parca in pd.read_sql(f"SELECT tarih, tip, IFNULL(kategori_id, 0) AS kategori_id, miktar FROM {kaynak}",
+                                 conn, chunksize=parca_boyutu):
+            parcalar.append(parca.groupby(["tarih", "tip", "kategori_id"], sort=False)["miktar"].sum())
+
+    if not parcalar:
+        return pd.DataFrame({"tarih": pd.Series(dtype="datetime64[ns]"), "tip": pd.Series(dtype=object),
+                             "kategori_id": pd.Series(dtype="int64"), "toplam": pd.Series(dtype="int64")})
+    # Bir gün birden fazla parçaya düşebileceğinden parça toplamları bir kez daha toplanır
+    gunluk = pd.concat(parcalar).groupby(level=[0, 1, 2]).sum().rename("toplam").reset_index()
+    gunluk["tarih"] = pd.to_datetime(gunluk["tarih"], format="%Y-%m-%d")
+    return gunluk
+
+
+def _tip_serileri(conn, gunluk=None):
+    """Gün x (Gelir, Gider) TL tablosu; işlem olmayan günler 0 ile doldurulur"""
+    if gunluk is None:
+        gunluk = gunluk_toplamlar(conn)
+    if gunluk.empty:
+        return pd.DataFrame(columns=TIPLER, dtype=float)
+    tablo = gunluk.pivot_table(index="tarih", columns="tip", values="toplam", aggfunc="sum", fill_value=0)
+    tablo = tablo.reindex(columns=TIPLER, fill_value=0).asfreq("D", fill_value=0)
+    tablo.columns.name = None
+    return tablo.astype(float) / KURUS
+
+
+def _aylik(tablo):
+    """Günlük tabloyu ay başı indeksli aylık toplamlara çevirir"""
+    return tablo.resample("MS").sum()
+
+
+def hareketli_ortalamalar(conn, pencereler=(7, 30, 90)):
+    """Günlük gider ve pencereler (gün) boyunca hareketli ortalamaları"""
+    gider = _tip_serileri(conn)["Gider"]
+    sonuc = pd.DataFrame({"Günlük Gider": gider})
+    for pencere in pencereler:
+        sonuc[f"{pencere} Günlük Ortalama"] = gider.rolling(pencere, min_periods=1).mean()
+    return sonuc
+
+
+def kumulatif_bakiye(conn):
+    """Günlük gelir, gider, net akış ve ilk işlemden bu yana birikimli bakiye"""
+    tablo = _tip_serileri(conn)
+    sonuc = tablo.copy()
+    sonuc["Net"] = tablo["Gelir"] - tablo["Gider"]
+    sonuc["Bakiye"] = sonuc["Net"].cumsum()
+    return sonuc
+
+
+def kategori_egilimleri(conn, en_fazla=6):
+    """Ay x kategori gider tablosu; toplamı en büyük en_fazla kategori dışındakiler 'Diğer'de birleşir"""
+    gunluk = gunluk_toplamlar(conn)
+    gunluk = gunluk[gunluk["tip"] == "Gider"]
+    if gunluk.empty:
+        return pd.DataFrame(dtype=float)
+
+    adlar = dict(conn.execute("SELECT id, ad FROM kategoriler"))
+    gunluk = gunluk.assign(kategori=gunluk["kategori_id"].map(adlar).fillna("Kategorisiz"))
+    tablo = gunluk.pivot_table(index="tarih", columns="kategori", values="toplam", aggfunc="sum", fill_value=0)
+    tablo.columns.name = None
+    aylik = _aylik(tablo.astype(float) / KURUS)
+
+    sira = aylik.sum().sort_values(ascending=False).index
+    if len(sira) > en_fazla:
+        diger = aylik[sira[en_fazla:]].sum(axis=1)
+        aylik = aylik[sira[:en_fazla]].assign(Diğer=diger)
+    else:
+        aylik = aylik[sira]
+    return aylik
+
+
+def egimler(aylik):
+    """Her sütun için en küçük kareler doğrusunun eğimi (TL/ay); tüm sütunlar tek polyfit çağrısıyla"""
+    if len(aylik) < 2:
+        return pd.Series(0.0, index=aylik.columns)
+    x = np.arange(len(aylik), dtype=float)
+    egim, _ = np.polyfit(x, aylik.to_numpy(dtype=float), 1)
+    return pd.Series(np.atleast_1d(egim), index=aylik.columns)
+
+
+def tasarruf_orani(conn, pencere=12):
+    """Aylık gelir, gider, tasarruf ve tasarruf oranı (%); oran geliri olmayan aylarda boştur.
+
+    Tek tek ayların oynaklığını yumuşatmak için son pencere ayın toplamlarıyla hesaplanan oran da verilir.
+    """
+    aylik = _aylik(_tip_serileri(conn))
+    sonuc = aylik.copy()
+    sonuc["Tasarruf"] = aylik["Gelir"] - aylik["Gider"]
+    gelir = aylik["Gelir"].where(aylik["Gelir"] > 0)
+    sonuc["Tasarruf Oranı (%)"] = sonuc["Tasarruf"] / gelir * 100
+    donem_geliri = aylik["Gelir"].rolling(pencere, min_periods=1).sum()
+    donem_tasarrufu = sonuc["Tasarruf"].rolling(pencere, min_periods=1).sum()
+    sonuc[f"{pencere} Aylık Oran (%)"] = donem_tasarrufu / donem_geliri.where(donem_geliri > 0) * 100
+    return sonuc
+
+
+def harcama_tahmini(conn, ay_sayisi=6, gecmis=24):
+    """Aylık giderler ve doğrusal eğilimle önümüzdeki ay_sayisi ay için tahmin.
+
+    Eğilim, içinde bulunulan (henüz kapanmamış) ay hariç son gecmis tam aydan kestirilir;
+    tahmin bu aydan başlar ve negatif değerler sıfıra çekilir.
+    """
+    gider = _aylik(_tip_serileri(conn))["Gider"]
+    if gider.empty:
+        return pd.DataFrame(columns=["Gerçekleşen", "Tahmin"], dtype=float)
+
+    bu_ay = pd.Timestamp.today().normalize().replace(day=1)
+    tam_aylar = gider[gider.index < bu_ay].iloc[-gecmis:]
+    gelecek = pd.date_range(bu_ay, periods=ay_sayisi, freq="MS")
+    if len(tam_aylar) >= 2:
+        x = np.arange(len(tam_aylar), dtype=float)
+        egim, kesisim = np.polyfit(x, tam_aylar.to_numpy(dtype=float), 1)
+        # Son tam aydan bu aya kadar geçen ay sayısı (arada işlemsiz ay yoksa 1)
+        ara = (bu_ay.to_period("M") - tam_aylar.index[-1].to_period("M")).n
+        tahmin = np.clip(kesisim + egim * (x[-1] + ara + np.arange(len(gelecek))), 0, None)
+    else:
+        tahmin = np.full(len(gelecek), tam_aylar.mean() if len(tam_aylar) else gider.mean())
+
+    sonuc = pd.DataFrame({"Gerçekleşen": gider[gider.index < bu_ay]})
+    sonuc = sonuc.reindex(sonuc.index.union(gelecek))
+    sonuc.loc[gelecek, "Tahmin"] = tahmin
+    if len(tam_aylar):
+        # Çizgiler kopuk görünmesin diye tahmin son gerçekleşen aydan başlatılır
+        sonuc.loc[tam_aylar.index[-1], "Tahmin"] = tam_aylar.iloc[-1]
+    return sonuc
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    import veritabani
+
+    ANALIZLER = {
+        "hareketli": hareketli_ortalamalar,
+        "bakiye": kumulatif_bakiye,
+        "egilim": kategori_egilimleri,
+        "tasarruf": tasarruf_orani,
+        "tahmin": harcama_tahmini,
+    }
+
+    parser = argparse.ArgumentParser(description="Tüm geçmiş üzerinde analizleri çalıştırır ve özetini yazar")
+    parser.add_argument("analizler", nargs="*", help=f"Çalıştırılacak analizler: {', '.join(ANALIZLER)} (boşsa tümü)")
+    parser.add_argument("--veritabani", default=veritabani.VERITABANI_YOLU, help="Veritabanı dosyası")
+    args = parser.parse_args()
+    for ad in args.analizler:
+        if ad not in ANALIZLER:
+            parser.error(f"bilinmeyen analiz: {ad}")
+
+    conn = veritabani.salt_okunur_baglan(args.veritabani)
+    try:
+        for ad in args.analizler or ANALIZLER:
+            baslangic = time.perf_counter()
+            df = ANALIZLER[ad](conn)
+            print(f"--- {ad} ({time.perf_counter() - baslangic:.2f} sn, {len(df):,} satır)")
+            print(df.tail().round(2).to_string())
+    finally:
+        conn.close()
@@ -0,0 +1,154 @@
+"""Uzun süren okuma işlerini Tk ana döngüsünü bloklamadan çalıştıran yürütücü"""
+import queue
+import sqlite3
+import threading
+from collections import namedtuple
+
+from depo import FinansDeposu
+
+_Is = namedtuple("_Is", ["anahtar", "fonksiyon", "tamamlandi", "hata"])
+
+
+class IptalEdildi(Exception):
+    """İş, kullanıcı tarafından iptal edildi"""
+
+
+class ArkaPlanYurutucu:
+    """İşleri tek bir iş parçacığında, bağlantı havuzundan ödünç alınan salt okunur bağlantıyla yürütür.
+
+    Sonuçlar ana iş parçacığına root.after ile yoklanarak iletilir; Tk nesnelerine yalnızca
+    tamamlandi/hata geri çağrılarında dokunulmalıdır. Aynı anahtarlı iş zaten çalışıyor ya da
+    bekliyorsa yeni istek yok sayılır; farklı anahtarlı bir istek çalışan işi iptal edip yerine geçer.
+    """
+
+    YOKLAMA_ARALIGI_MS = 50
+
+    def __init__(self, root, baglantilar, durum_degisti=None):
+        self.root = root
+        self.baglantilar = baglantilar
+        self.durum_degisti = durum_degisti
+
+        self._kosul = threading.Condition()
+        self._bekleyen = None
+        self._calisan = None
+        self._conn = None
+        self._kapaniyor = False
+        self._iptal = threading.Event()
+        self._sonuclar = queue.Queue()
+        self._yoklaniyor = False
+
+        self._is_parcacigi = threading.Thread(target=self._dongu, name="arka-plan-yurutucu", daemon=True)
+        self._is_parcacigi.start()
+
+    @property
+    def calisiyor(self):
+        with self._kosul:
+            return self._calisan is not None or self._bekleyen is not None
+
+    def calistir(self, anahtar, fonksiyon, tamamlandi, hata=None):
+        """fonksiyon(depo, iptal_olayi) işini sıraya koyar; yok sayılırsa False döner"""
+        with self._kosul:
+            if self._bekleyen is not None and self._bekleyen.anahtar == anahtar:
+                return False
+            if self._bekleyen is None and self._calisan is not None and self._calisan.anahtar == anahtar:
+                return False
+            if self._calisan is not None:
+                self._calisani_iptal_et()
+            self._bekleyen = _Is(anahtar, fonksiyon, tamamlandi, hata)
+            self._kosul.notify()
+
+        self._durum_bildir(True)
+        self._yoklamayi_baslat()
+        return True
+
+    def iptal(self):
+        """Bekleyen ve çalışan işi iptal eder"""
+        with self._kosul:
+            self._bekleyen = None
+            if self._calisan is not None:
+                self._calisani_iptal_et()
+
+    def kapat(self, bekleme_suresi=1.0):
+        """İş parçacığını durdurur ve ödünç aldığı bağlantıyı bırakmasını bekler"""
+        with self._kosul:
+            self._kapaniyor = True
+            self._bekleyen = None
+            if self._calisan is not None:
+                self._calisani_iptal_et()
+            self._kosul.notify()
+        self._is_parcacigi.join(bekleme_suresi)
+
+    def _calisani_iptal_et(self):
+        self._iptal.set()
+        if self._conn is not None:
+            # Sürmekte olan SQLite sorgusunu yarıda keser (başka iş parçacığından çağrılabilir)
+            self._conn.interrupt()
+
+    def _dongu(self):
+        while True:
+            with self._kosul:
+                while self._bekleyen is None and not self._kapaniyor:
+                    self._kosul.wait()
+                if self._kapaniyor:
+                    return
+                is_ = self._calisan = self._bekleyen
+                self._bekleyen = None
+                self._iptal.clear()
+
+            try:
+                with self.baglantilar.okuyucu() as conn:
+                    with self._kosul:
+                        self._conn = conn
+                        if self._iptal.is_set():
+                            raise IptalEdildi()
+                    try:
+                        sonuc = is_.fonksiyon(FinansDeposu(conn), self._iptal)
+                    finally:
+                        with self._kosul:
+                            self._conn = None
+                if self._iptal.is_set():
+                    raise IptalEdildi()
+                cikti = (is_, sonuc, None)
+            except IptalEdildi:
+                cikti = None
+            except sqlite3.OperationalError as e:
+                cikti = None if self._iptal.is_set() else (is_, None, e)
+            except Exception as e:
+                cikti = (is_, None, e)
+
+            with self._kosul:
+                self._calisan = None
+            if cikti is not None:
+                self._sonuclar.put(cikti)
+
+    def _durum_bildir(self, calisiyor):
+        if self.durum_degisti:
+            self.durum_degisti(calisiyor)
+
+    def _yoklamayi_baslat(self):
+        if not self._yoklaniyor:
+            self._yoklaniyor = True
+            self.root.after(self.YOKLAMA_ARALIGI_MS, self._yokla)
+
+    def _yokla(self):
+        """Tamamlanan işlerin geri çağrılarını ana iş parçacığında çalıştırır"""
+        while True:
+            try:
+                is_, sonuc, hata = self._sonuclar.get_nowait()
+            except queue.Empty:
+                break
+            with self._kosul:
+                # Bu arada yerine yenisi istenmiş bir işin sonucu artık gösterilmez
+                yerine_gecildi = self._bekleyen is not None
+            if yerine_gecildi:
+                continue
+            if hata is None:
+                is_.tamamlandi(sonuc)
+            elif is_.hata:
+                is_.hata(hata)
+
+        if self.calisiyor or not self._sonuclar.empty():
+            self.root.after(self.YOKLAMA_ARALIGI_MS, self._yokla)
+        else:
+            self._yoklaniyor = False
+            self._durum_bildir(False)
@@ -0,0 +1,259 @@
+"""Kapanmış yılların işlemlerini yıl başına ayrı arşiv veritabanlarına taşıma
+
+Arşiv dosyaları (data/arsiv/finans_YYYY.db) sıcak veritabanıyla aynı şemaya sahiptir ve
+kategorilerin o anki bir kopyasını taşır. Taşınan yılların aylık toplamları sıcak veritabanının
+aylik_toplamlar özetinde kalır; böylece tüm zamanlar raporları arşive dokunmadan çalışır.
+Ham satırlar gerektiğinde arşivler ATTACH edilir ve TEMP VIEW tum_islemler hepsini birleştirir.
+"""
+import os
+import re
+from contextlib import contextmanager
+from datetime import date, timedelta
+from typing import NamedTuple
+
+import veritabani
+
+ARSIV_KLASOR_ADI = "arsiv"
+ARSIV_DOSYASI = re.compile(r"finans_(\d{4})\.db$")
+SEMA_ON_EKI = "arsiv_"
+
+# Raporların ham işlem okuduğu en uzun pencere (son 6 ay) her zaman sıcak veritabanında kalır
+SICAK_GUN_SAYISI = 190
+
+
+class ArsivHatasi(Exception):
+    """Arşivleme yapılamadığında (ör. yıl henüz kapanmadı) oluşur"""
+
+
+class ArsivSonucu(NamedTuple):
+    yil: int
+    yol: str
+    satir_sayisi: int
+
+
+def arsiv_klasoru(conn):
+    """Ana veritabanı dosyasının yanındaki arşiv klasörü"""
+    ana_dosya = next(dosya for _, ad, dosya in conn.execute("PRAGMA database_list") if ad == "main")
+    return os.path.join(os.path.dirname(ana_dosya), ARSIV_KLASOR_ADI)
+
+
+def arsiv_dosyalari(klasor):
+    """{yıl: dosya yolu} sözlüğünü yıla göre sıralı döndürür"""
+    if not os.path.isdir(klasor):
+        return {}
+    dosyalar = {}
+    for ad in os.listdir(klasor):
+        eslesme = ARSIV_DOSYASI.match(ad)
+        if eslesme:
+            dosyalar[int(eslesme.group(1))] = os.path.join(klasor, ad)
+    return dict(sorted(dosyalar.items()))
+
+
+def son_arsivlenebilir_yil(bugun=None):
+    """Tüm günleri sıcak pencerenin dışında kalan en yeni yıl"""
+    bugun = bugun or date.today()
+    return (bugun - timedelta(days=SICAK_GUN_SAYISI)).year - 1
+
+
+def arsivlenebilir_yillar(conn):
+    """Sıcak veritabanında işlemi bulunan ve arşivlenebilecek yıllar"""
+    sinir = f"{son_arsivlenebilir_yil() + 1:04d}-01"
+    return [int(yil) for (yil,) in conn.execute(
+        "SELECT DISTINCT substr(ay, 1, 4) FROM islemler WHERE ay < ? ORDER BY 1", (sinir,))]
+
+
+def _arsiv_olustur(yol):
+    """Arşiv dosyasını güncel şemayla oluşturur/yükseltir; arşivler tek dosya kalsın diye WAL kullanmaz"""
+    conn = veritabani.baglan(yol)
+    try:
+        conn.execute("PRAGMA journal_mode = DELETE")
+    finally:
+        conn.close()
+
+
+def arsivle(conn, yil, sikistir=False):
+    """yil'ın işlemlerini arşiv dosyasına taşır.
+
+    İki ayrı işlemde (transaction) yapılır; iki dosyaya yayılan tek bir işlem, sıcak veritabanı WAL
+    kipinde olduğundan çökmeye karşı atomik değildir:
+
+    1. Satırlar id'leriyle arşive kopyalanır (INSERT OR IGNORE) ve arşiv kendi başına, eşzamanlı
+       (synchronous = FULL) olarak kaydedilir.
+    2. Sıcak veritabanından yalnızca arşivde aynı id ve parmak iziyle bulunan satırlar silinir ve
+       toplamları özetlere geri eklenir.
+
+    Hata ya da çökme iki adımın arasında olursa satırlar geçici olarak iki tarafta da bulunur
+    (aylik_toplamlar özeti yine tek sayar); arsivle yeniden çalıştırılınca satır kaybetmeden ya da
+    çoğaltmadan taşımayı tamamlar. Arşivde aynı id'li farklı bir işlem varsa o satırlar sıcak
+    veritabanında bırakılır ve ArsivHatasi oluşur. sikistir verilirse ardından VACUUM çalıştırılır.
+    """
+    if yil > son_arsivlenebilir_yil():
+        raise ArsivHatasi(f"{yil} yılı henüz arşivlenemez (son {SICAK_GUN_SAYISI} gün sıcak veritabanında kalır)")
+
+    klasor = arsiv_klasoru(conn)
+    os.makedirs(klasor, exist_ok=True)
+    yol = os.path.join(klasor, f"finans_{yil:04d}.db")
+    _arsiv_olustur(yol)
+
+    aralik = (veritabani.gun_numarasi(f"{yil:04d}-01-01"), veritabani.gun_numarasi(f"{yil + 1:04d}-01-01"))
+    sema = f"{SEMA_ON_EKI}{yil:04d}"
+    # Arşive eksiksiz kopyalanmış (aynı id ve parmak izi) sıcak satırlar
+    tasinanlar = f"""
+        FROM main.islemler i
+        WHERE i.gun >= ? AND i.gun < ?
+          AND EXISTS (SELECT 1 FROM {sema}.islemler a WHERE a.id = i.id AND a.parmak_izi IS i.parmak_izi)
+    """
+    conn.execute("ATTACH DATABASE ? AS " + sema, (yol,))
+    try:
+        conn.execute(f"PRAGMA {sema}.synchronous = FULL")
+
+        # 1. Kopyalama: yalnızca arşiv dosyasına yazar
+        conn.execute("BEGIN")
+        try:
+            conn.execute(f"DELETE FROM {sema}.kategoriler")
+            conn.execute(f"INSERT INTO {sema}.kategoriler (id, ad, tip) SELECT id, ad, tip FROM main.kategoriler")
+            conn.execute(f"""
+            INSERT OR IGNORE INTO {sema}.islemler (id, gun, miktar, aciklama, kategori_id, tip, parmak_izi)
+            SELECT id, gun, miktar, aciklama, kategori_id, tip, parmak_izi FROM main.islemler
+            WHERE gun >= ? AND gun < ?
+            """, aralik)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+        # 2. Silme: yalnızca sıcak veritabanına yazar. Silme tetikleyicileri bu satırların toplamlarını
+        # özetlerden düşer; tüm zamanlar raporları için aynı toplamlar geri eklenir.
+        conn.execute("BEGIN")
+        try:
+            tasinan = conn.execute(f"""
+            SELECT i.ay, i.tip, IFNULL(i.kategori_id, 0), SUM(i.miktar), COUNT(*)
+            {tasinanlar}
+            GROUP BY 1, 2, 3
+            """, aralik).fetchall()
+            tasinan_gunluk = conn.execute(f"""
+            SELECT i.gun, i.tip, SUM(i.miktar), COUNT(*)
+            {tasinanlar}
+            GROUP BY 1, 2
+            """, aralik).fetchall()
+            satir_sayisi = conn.execute(f"DELETE FROM main.islemler WHERE id IN (SELECT i.id {tasinanlar})",
+                                        aralik).rowcount
+            conn.executemany("""
+            INSERT INTO main.aylik_toplamlar (ay, tip, kategori_id, toplam, adet)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (ay, tip, kategori_id) DO UPDATE
+            SET toplam = toplam + excluded.toplam, adet = adet + excluded.adet
+            """, tasinan)
+            conn.executemany("""
+            INSERT INTO main.gunluk_toplamlar (gun, tip, toplam, adet)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT (gun, tip) DO UPDATE
+            SET toplam = toplam + excluded.toplam, adet = adet + excluded.adet
+            """, tasinan_gunluk)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+        (cakisan,) = conn.execute(f"""
+        SELECT COUNT(*) FROM main.islemler i
+        WHERE i.gun >= ? AND i.gun < ? AND EXISTS (SELECT 1 FROM {sema}.islemler a WHERE a.id = i.id)
+        """, aralik).fetchone()
+    finally:
+        conn.execute("DETACH DATABASE " + sema)
+
+    if cakisan:
+        raise ArsivHatasi(f"{yil} arşivinde aynı id'li farklı {cakisan} işlem var; "
+                          "bu işlemler sıcak veritabanında bırakıldı")
+    if sikistir:
+        conn.execute("VACUUM")
+    return ArsivSonucu(yil, yol, satir_sayisi)
+
+
+def arsivleri_bagla(conn):
+    """Tüm arşivleri ATTACH eder ve TEMP VIEW tum_islemler'i (sıcak + arşiv) kurar.
+
+    ATTACH bir işlem (transaction) içindeyken yapılamaz. Bağlanan şema adlarını döndürür.
+    """
+    bagli = {ad for _, ad, _ in conn.execute("PRAGMA database_list")}
+    semalar = []
+    for yil, yol in arsiv_dosyalari(arsiv_klasoru(conn)).items():
+        sema = f"{SEMA_ON_EKI}{yil:04d}"
+        if sema not in bagli:
+            conn.execute("ATTACH DATABASE ? AS " + sema, (yol,))
+        semalar.append(sema)
+
+    secimler = " UNION ALL ".join(
+        f"SELECT id, tarih, miktar, aciklama, kategori_id, tip FROM {sema}.islemler" for sema in ["main", *semalar])
+    conn.execute("DROP VIEW IF EXISTS temp.tum_islemler")
+    conn.execute(f"CREATE TEMP VIEW tum_islemler AS {secimler}")
+    return semalar
+
+
+def arsivleri_ayir(conn):
+    """arsivleri_bagla ile bağlanan arşivleri ve tum_islemler görünümünü kaldırır"""
+    conn.execute("DROP VIEW IF EXISTS temp.tum_islemler")
+    for _, ad, _ in conn.execute("PRAGMA database_list").fetchall():
+        if ad.startswith(SEMA_ON_EKI):
+            conn.execute("DETACH DATABASE " + ad)
+
+
+@contextmanager
+def yillar_bagli(conn, yillar):
+    """Blok süresince yalnızca verilen yılların arşivlerini (varsa) bağlı tutar; {yıl: şema adı} verir.
+
+    Zaten bağlı şemalara dokunulmaz; blok sonunda yalnızca burada bağlananlar ayrılır.
+    """
+    dosyalar = arsiv_dosyalari(arsiv_klasoru(conn)) if yillar else {}
+    bagli = {ad for _, ad, _ in conn.execute("PRAGMA database_list")}
+    semalar, baglanan = {}, []
+    try:
+        for yil in sorted(set(yillar) & dosyalar.keys()):
+            sema = f"{SEMA_ON_EKI}{yil:04d}"
+            if sema not in bagli:
+                conn.execute("ATTACH DATABASE ? AS " + sema, (dosyalar[yil],))
+                baglanan.append(sema)
+            semalar[yil] = sema
+        yield semalar
+    finally:
+        for sema in baglanan:
+            conn.execute("DETACH DATABASE " + sema)
+
+
+@contextmanager
+def arsivler_bagli(conn):
+    """Blok süresince arşivleri bağlı tutar: with arsivler_bagli(conn): ... tum_islemler ..."""
+    semalar = arsivleri_bagla(conn)
+    try:
+        yield semalar
+    finally:
+        arsivleri_ayir(conn)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Kapanmış yılların işlemlerini arşiv dosyalarına taşır")
+    parser.add_argument("yillar", nargs="*", type=int, help="Arşivlenecek yıllar (boşsa arşivlenebilir tüm yıllar)")
+    parser.add_argument("--veritabani", default=veritabani.VERITABANI_YOLU, help="Veritabanı dosyası")
+    parser.add_argument("--liste", action="store_true", help="Arşivleri ve arşivlenebilir yılları listeler")
+    parser.add_argument("--sikistir", action="store_true", help="Taşımadan sonra sıcak veritabanını VACUUM'lar")
+    args = parser.parse_args()
+
+    conn = veritabani.baglan(args.veritabani)
+    try:
+        if args.liste:
+            for yil, yol in arsiv_dosyalari(arsiv_klasoru(conn)).items():
+                print(f"{yil}: {yol} ({os.path.getsize(yol) / 1024:,.0f} KB)")
+            print("Arşivlenebilir yıllar:", ", ".join(map(str, arsivlenebilir_yillar(conn))) or "yok")
+        else:
+            yillar = args.yillar or arsivlenebilir_yillar(conn)
+            for sira, yil in enumerate(yillar):
+                try:
+                    sonuc = arsivle(conn, yil, sikistir=args.sikistir and sira == len(yillar) - 1)
+                except ArsivHatasi as e:
+                    print(f"Hata: {e}")
+                    raise SystemExit(1)
+                print(f"{sonuc.yil}: {sonuc.satir_sayisi:,} işlem {sonuc.yol} dosyasına taşındı")
+    finally:
+        conn.close()
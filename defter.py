@@ -0,0 +1,515 @@
+"""Tüm işlem geçmişini sanal kaydırma ile gezmeye yarayan defter penceresi"""
+import tkinter as tk
+from datetime import datetime
+from tkinter import ttk, messagebox
+
+from depo import IslemFiltresi
+from para import kurusa_cevir, tl_metni
+
+ISLEM_SUTUNLARI = (
+    ("id", "ID", 50),
+    ("tarih", "Tarih", 90),
+    ("tip", "Tip", 60),
+    ("kategori", "Kategori", 120),
+    ("miktar", "Miktar (TL)", 90),
+    ("aciklama", "Açıklama", 250),
+)
+
+
+def agac_degerleri(islem):
+    """İşlemi Treeview satırı değerlerine çevirir (kuruş tutar TL metni olarak gösterilir)"""
+    return islem.id, islem.tarih, islem.tip, islem.kategori, tl_metni(islem.miktar), islem.aciklama
+
+
+class AgacEsitleyici:
+    """Bir Treeview'ı satır kimliğine (iid) göre fark alarak günceller.
+
+    kaynak() istenen satırları sırasıyla (iid, değerler) olarak döndürür. Yalnızca yeni satırlar
+    eklenir, kaybolanlar silinir, değerleri değişenler güncellenir ve yeri değişenler taşınır;
+    son çizilen durum bellekte tutulduğundan karşılaştırma için Tk'ye gidilmez ve seçim korunur.
+    yenile() çağrıları boşta (after_idle) tek bir eşitlemede birleşir. Ağaç yalnızca bu
+    nesne üzerinden değiştirilmelidir.
+    """
+
+    def __init__(self, tree, kaynak):
+        self.tree = tree
+        self.kaynak = kaynak
+        self._degerler = {}  # iid -> değerler
+        self._sira = []  # ağaçtaki iid sırası
+        self._planlandi = False
+
+    def yenile(self):
+        """Bir sonraki boşta eşitleme planlar; o zamana kadarki tüm istekler tek yenilemede birleşir"""
+        if not self._planlandi:
+            self._planlandi = True
+            self.tree.after_idle(self._planli_yenile)
+
+    def _planli_yenile(self):
+        self._planlandi = False
+        if self.tree.winfo_exists():
+            self.esitle(self.kaynak())
+
+    def esitle(self, satirlar):
+        """Ağacı satirlar ile hemen eşitler"""
+        yeni = {str(iid): tuple(degerler) for iid, degerler in satirlar}
+
+        silinecek = [iid for iid in self._sira if iid not in yeni]
+        if silinecek:
+            self.tree.delete(*silinecek)
+            silinen = set(silinecek)
+            self._sira = [iid for iid in self._sira if iid not in silinen]
+
+        for sira, (iid, degerler) in enumerate(yeni.items()):
+            eski = self._degerler.get(iid)
+            if eski is None:
+                self.tree.insert("", sira, iid=iid, values=degerler)
+                self._sira.insert(sira, iid)
+                continue
+            if eski != degerler:
+                self.tree.item(iid, values=degerler)
+            if self._sira[sira] != iid:
+                self.tree.move(iid, "", sira)
+                self._sira.remove(iid)
+                self._sira.insert(sira, iid)
+        self._degerler = yeni
+
+
+class DefterPenceresi:
+    """İşlemleri (tarih, id) anahtarıyla sayfa sayfa yükleyen pencere.
+
+    Treeview'da en fazla EN_FAZLA_SAYFA sayfa tutulur: kullanıcı alt uca yaklaştıkça
+    daha eski sayfa eklenip en üstteki atılır, üst uca yaklaştıkça tersi yapılır.
+    Böylece bellek ve gecikme, defterde kaç işlem olduğundan bağımsız kalır.
+    Üstteki arama paneli bir IslemFiltresi kurar; sonuçlar aynı sayfalama ile gezilir.
+    degisti verilirse toplu silme ve toplu düzenlemeden sonra çağrılır (ör. ana penceredeki
+    son işlemler listesini yenilemek için).
+    """
+
+    SAYFA_BOYUTU = 100
+    EN_FAZLA_SAYFA = 3
+    KENAR_ESIGI = 0.1  # Görünür alanın uca bu oranda yaklaşması yeni sayfa ister
+    TUMU = "Tümü"
+
+    def __init__(self, root, depo, duzenle=None, degisti=None):
+        self.depo = depo
+        self.duzenle = duzenle
+        self.degisti = degisti
+
+        self.pencere = tk.Toplevel(root)
+        self.pencere.title("Tüm İşlemler")
+        self.pencere.geometry("900x600")
+
+        self.filtre = None
+        self.arama_paneli_olustur()
+
+        frame = ttk.Frame(self.pencere, padding="10")
+        frame.pack(fill="both", expand=True)
+        frame.columnconfigure(0, weight=1)
+        frame.rowconfigure(0, weight=1)
+
+        self.tree = ttk.Treeview(frame, columns=[s[0] for s in ISLEM_SUTUNLARI], show="headings")
+        for sutun, baslik, genislik in ISLEM_SUTUNLARI:
+            self.tree.heading(sutun, text=baslik)
+            self.tree.column(sutun, width=genislik)
+        self.tree.grid(column=0, row=0, sticky=tk.NSEW)
+
+        self.scrollbar = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=self.tree.yview)
+        self.scrollbar.grid(column=1, row=0, sticky=tk.NS)
+        self.tree.configure(yscrollcommand=self._kaydirildi)
+        self.tree.bind("<Double-1>", lambda event: self.secili_islemi_duzenle())
+
+        alt_frame = ttk.Frame(frame)
+        alt_frame.grid(column=0, row=1, columnspan=2, sticky=tk.EW, pady=(10, 0))
+
+        self.durum = ttk.Label(alt_frame, text="")
+        self.durum.pack(side=tk.LEFT)
+
+        ttk.Button(alt_frame, text="Yenile", command=self.yenile).pack(side=tk.RIGHT, padx=5)
+        ttk.Button(alt_frame, text="Seçilenleri Sil", command=self.secili_islemleri_sil).pack(side=tk.RIGHT, padx=5)
+        ttk.Button(alt_frame, text="Toplu Düzenle", command=self.toplu_duzenle).pack(side=tk.RIGHT, padx=5)
+        ttk.Button(alt_frame, text="Seçili İşlemi Güncelle",
+                   command=self.secili_islemi_duzenle).pack(side=tk.RIGHT, padx=5)
+
+        self.sayfa_boyutlari = []  # Ağaçtaki her sayfanın satır sayısı (yukarıdan aşağıya)
+        self.yukarida_var = False  # Pencerenin üstünde atılmış (daha yeni) işlem var mı
+        self.asagida_var = False  # Pencerenin altında henüz yüklenmemiş (daha eski) işlem var mı
+        self._yukleme_planlandi = False
+
+        self.yenile()
+
+    def arama_paneli_olustur(self):
+        """Açıklama metni, tarih aralığı, tip, kategori ve tutar aralığı filtreleri"""
+        panel = ttk.LabelFrame(self.pencere, text="Arama", padding="5")
+        panel.pack(fill="x", padx=10, pady=(10, 0))
+
+        self.arama_metni = tk.StringVar()
+        self.arama_baslangic = tk.StringVar()
+        self.arama_bitis = tk.StringVar()
+        self.arama_en_az = tk.StringVar()
+        self.arama_en_cok = tk.StringVar()
+
+        ttk.Label(panel, text="Açıklama:").grid(column=0, row=0, padx=5, pady=2, sticky=tk.W)
+        metin_entry = ttk.Entry(panel, textvariable=self.arama_metni, width=30)
+        metin_entry.grid(column=1, row=0, columnspan=3, padx=5, pady=2, sticky=tk.EW)
+
+        ttk.Label(panel, text="Tip:").grid(column=4, row=0, padx=5, pady=2, sticky=tk.W)
+        self.arama_tipi = ttk.Combobox(panel, values=[self.TUMU, "Gelir", "Gider"], state="readonly", width=10)
+        self.arama_tipi.grid(column=5, row=0, padx=5, pady=2, sticky=tk.W)
+        self.arama_tipi.current(0)
+
+        ttk.Label(panel, text="Kategori:").grid(column=6, row=0, padx=5, pady=2, sticky=tk.W)
+        self.arama_kategorisi = ttk.Combobox(panel, state="readonly", width=15,
+                                             postcommand=self._kategori_secenekleri_guncelle)
+        self.arama_kategorisi.grid(column=7, row=0, padx=5, pady=2, sticky=tk.W)
+        self.arama_kategorisi.set(self.TUMU)
+
+        ttk.Label(panel, text="Tarih (YYYY-AA-GG):").grid(column=0, row=1, padx=5, pady=2, sticky=tk.W)
+        ttk.Entry(panel, textvariable=self.arama_baslangic, width=12).grid(column=1, row=1, padx=5, pady=2)
+        ttk.Label(panel, text="-").grid(column=2, row=1)
+        ttk.Entry(panel, textvariable=self.arama_bitis, width=12).grid(column=3, row=1, padx=5, pady=2)
+
+        ttk.Label(panel, text="Miktar (TL):").grid(column=4, row=1, padx=5, pady=2, sticky=tk.W)
+        ttk.Entry(panel, textvariable=self.arama_en_az, width=10).grid(column=5, row=1, padx=5, pady=2, sticky=tk.W)
+        ttk.Label(panel, text="-").grid(column=6, row=1)
+        ttk.Entry(panel, textvariable=self.arama_en_cok, width=10).grid(column=7, row=1, padx=5, pady=2, sticky=tk.W)
+
+        ttk.Button(panel, text="Ara", command=self.ara).grid(column=8, row=0, padx=5, pady=2)
+        ttk.Button(panel, text="Temizle", command=self.aramayi_temizle).grid(column=8, row=1, padx=5, pady=2)
+        # Toplevel bağlaması penceredeki tüm alanlar için geçerlidir
+        self.pencere.bind("<Return>", lambda event: self.ara())
+        metin_entry.focus_set()
+
+    def _kategori_secenekleri_guncelle(self):
+        tip = self.arama_tipi.get()
+        adlar = sorted({kategori.ad for kategori in self.depo.kategoriler() if tip == self.TUMU or kategori.tip == tip})
+        self.arama_kategorisi['values'] = [self.TUMU] + adlar
+
+    def _filtreyi_oku(self):
+        """Paneldeki alanlardan IslemFiltresi kurar; geçersiz girdide ValueError"""
+        tarihler = []
+        for deger in (self.arama_baslangic.get().strip(), self.arama_bitis.get().strip()):
+            if deger:
+                try:
+                    datetime.strptime(deger, "%Y-%m-%d")
+                except ValueError:
+                    raise ValueError(f"Geçersiz tarih: {deger} (YYYY-AA-GG biçiminde olmalı)") from None
+            tarihler.append(deger or None)
+        tutarlar = [kurusa_cevir(deger) if deger.strip() else None
+                    for deger in (self.arama_en_az.get(), self.arama_en_cok.get())]
+
+        tip = self.arama_tipi.get()
+        tip = None if tip == self.TUMU else tip
+        kategori_idleri = None
+        kategori_adi = self.arama_kategorisi.get()
+        if kategori_adi and kategori_adi != self.TUMU:
+            kategori_idleri = tuple(kategori.id for kategori in self.depo.kategoriler()
+                                    if kategori.ad == kategori_adi and tip in (None, kategori.tip))
+
+        return IslemFiltresi(self.arama_metni.get().strip() or None, *tarihler, tip, kategori_idleri, *tutarlar)
+
+    def ara(self):
+        """Paneldeki ölçütlerle ilk sonuç sayfasını yükler"""
+        try:
+            filtre = self._filtreyi_oku()
+        except ValueError as e:
+            messagebox.showerror("Hata", str(e), parent=self.pencere)
+            return
+        self.filtre = None if filtre == IslemFiltresi() else filtre
+        self.yenile()
+
+    def aramayi_temizle(self):
+        for degisken in (self.arama_metni, self.arama_baslangic, self.arama_bitis, self.arama_en_az, self.arama_en_cok):
+            degisken.set("")
+        self.arama_tipi.current(0)
+        self.arama_kategorisi.set(self.TUMU)
+        self.filtre = None
+        self.yenile()
+
+    def _anahtar(self, iid):
+        """Ağaç satırının (tarih, id) sayfalama anahtarı"""
+        degerler = self.tree.item(iid, "values")
+        return degerler[1], int(degerler[0])
+
+    def _satirlari_ekle(self, islemler, konum):
+        for sira, islem in enumerate(islemler):
+            # Tarihi düzenlenmiş bir işlem yeni konumunda tekrar gelebilir
+            if self.tree.exists(str(islem.id)):
+                self._satiri_cikar(str(islem.id))
+            self.tree.insert("", konum if konum == tk.END else konum + sira, iid=str(islem.id), values=agac_degerleri(islem))
+
+    def _durumu_guncelle(self):
+        cocuklar = self.tree.get_children()
+        if not cocuklar:
+            self.durum.config(text="Kayıtlı işlem yok" if self.filtre is None else "Eşleşen işlem yok")
+            return
+        tur = "işlem" if self.filtre is None else "eşleşme"
+        self.durum.config(text=f"{self._anahtar(cocuklar[-1])[0]} - {self._anahtar(cocuklar[0])[0]} "
+                               f"arası {len(cocuklar)} {tur} gösteriliyor")
+
+    def yenile(self):
+        """Pencereyi en yeni işlemlerden başlayarak yeniden yükler"""
+        self.tree.delete(*self.tree.get_children())
+        islemler = self.depo.islem_sayfasi(self.SAYFA_BOYUTU, filtre=self.filtre)
+        self._satirlari_ekle(islemler, tk.END)
+        self.sayfa_boyutlari = [len(islemler)] if islemler else []
+        self.yukarida_var = False
+        self.asagida_var = len(islemler) == self.SAYFA_BOYUTU
+        self.tree.yview_moveto(0)
+        self._durumu_guncelle()
+
+    def _kaydirildi(self, ilk, son):
+        """Treeview kaydırma bildirimi: kaydırma çubuğunu günceller, gerekirse sayfa ister"""
+        self.scrollbar.set(ilk, son)
+        ilk, son = float(ilk), float(son)
+        if self._yukleme_planlandi:
+            return
+        if (son > 1 - self.KENAR_ESIGI and self.asagida_var) or (ilk < self.KENAR_ESIGI and self.yukarida_var):
+            self._yukleme_planlandi = True
+            self.pencere.after_idle(self._sayfa_yukle)
+
+    def _sayfa_yukle(self):
+        self._yukleme_planlandi = False
+        ilk, son = self.tree.yview()
+        cocuklar = self.tree.get_children()
+        if not cocuklar:
+            return
+        ust_sira = ilk * len(cocuklar)
+
+        if son > 1 - self.KENAR_ESIGI and self.asagida_var:
+            islemler = self.depo.islem_sayfasi(self.SAYFA_BOYUTU, sonra=self._anahtar(cocuklar[-1]),
+                                               filtre=self.filtre)
+            self.asagida_var = len(islemler) == self.SAYFA_BOYUTU
+            if islemler:
+                self._satirlari_ekle(islemler, tk.END)
+                self.sayfa_boyutlari.append(len(islemler))
+            if len(self.sayfa_boyutlari) > self.EN_FAZLA_SAYFA:
+                atilan = self.sayfa_boyutlari.pop(0)
+                self.tree.delete(*self.tree.get_children()[:atilan])
+                self.yukarida_var = True
+                ust_sira -= atilan
+
+        elif ilk < self.KENAR_ESIGI and self.yukarida_var:
+            islemler = self.depo.islem_sayfasi(self.SAYFA_BOYUTU, once=self._anahtar(cocuklar[0]),
+                                               filtre=self.filtre)
+            self.yukarida_var = len(islemler) == self.SAYFA_BOYUTU
+            if islemler:
+                self._satirlari_ekle(islemler, 0)
+                self.sayfa_boyutlari.insert(0, len(islemler))
+                ust_sira += len(islemler)
+            if len(self.sayfa_boyutlari) > self.EN_FAZLA_SAYFA:
+                atilan = self.sayfa_boyutlari.pop()
+                self.tree.delete(*self.tree.get_children()[-atilan:])
+                self.asagida_var = True
+        else:
+            return
+
+        # Satır eklenip atıldıktan sonra kullanıcının baktığı satırı yerinde tut
+        self.tree.yview_moveto(max(ust_sira, 0) / max(len(self.tree.get_children()), 1))
+        self._durumu_guncelle()
+
+    def _secili_islem_id(self, islem_turu):
+        secili = self.tree.selection()
+        if not secili:
+            messagebox.showerror("Hata", f"Lütfen {islem_turu} için bir işlem seçin", parent=self.pencere)
+            return None
+        return int(secili[0])
+
+    def secili_islemi_duzenle(self):
+        """Seçili işlem için güncelleme formunu açar"""
+        islem_id = self._secili_islem_id("güncellemek")
+        if islem_id is None or self.duzenle is None:
+            return
+        self.duzenle(islem_id, lambda: self.satiri_yenile(islem_id))
+
+    def satiri_yenile(self, islem_id):
+        """Güncellenen işlemin satırını yerinde yeniler"""
+        islem = self.depo.islem_getir(islem_id)
+        if islem is not None and self.tree.exists(str(islem_id)):
+            self.tree.item(str(islem_id), values=agac_degerleri(islem))
+
+    def _satiri_cikar(self, iid):
+        """Satırı ağaçtan siler ve ait olduğu sayfanın boyutunu düşürür"""
+        sira = self.tree.index(iid)
+        for sayfa, boyut in enumerate(self.sayfa_boyutlari):
+            if sira < boyut:
+                self.sayfa_boyutlari[sayfa] -= 1
+                break
+            sira -= boyut
+        self.sayfa_boyutlari = [boyut for boyut in self.sayfa_boyutlari if boyut]
+        self.tree.delete(iid)
+
+    def secili_islemleri_sil(self):
+        """Seçili tüm işlemleri tek işlemde (transaction) siler"""
+        secili = self.tree.selection()
+        if not secili:
+            messagebox.showerror("Hata", "Lütfen silmek için en az bir işlem seçin", parent=self.pencere)
+            return
+        soru = ("Bu işlemi silmek istediğinizden emin misiniz?" if len(secili) == 1
+                else f"Seçili {len(secili)} işlemi silmek istediğinizden emin misiniz?")
+        if not messagebox.askyesno("Onay", soru, parent=self.pencere):
+            return
+        try:
+            silinen = self.depo.toplu_sil(secili)
+        except Exception as e:
+            messagebox.showerror("Hata", f"İşlemler silinirken bir hata oluştu: {str(e)}", parent=self.pencere)
+            return
+        for iid in secili:
+            self._satiri_cikar(iid)
+        self._durumu_guncelle()
+        self._degisiklik_bildir()
+        messagebox.showinfo("Başarılı", f"{silinen} işlem silindi", parent=self.pencere)
+
+    def _degisiklik_bildir(self):
+        if self.degisti is not None:
+            self.degisti()
+
+    def toplu_duzenle(self):
+        """Seçili (ya da aramaya uyan tüm) işlemler için toplu düzenleme penceresini açar"""
+        secili = self.tree.selection()
+        if not secili and self.filtre is None:
+            messagebox.showerror("Hata", "Lütfen düzenlemek için en az bir işlem seçin", parent=self.pencere)
+            return
+        TopluDuzenlemePenceresi(self, [int(iid) for iid in secili])
+
+
+class TopluDuzenlemePenceresi:
+    """Birden çok işlemin kategorisini, tarihini ya da tutarını tek işlemde değiştiren form.
+
+    Değişiklik tek bir executemany ile uygulanır; ardından defter bir kez yenilenir ve
+    tek bir özet mesajı gösterilir.
+    """
+
+    KATEGORI = "kategori"
+    TARIH_KAYDIR = "tarih_kaydir"
+    TARIH_ATA = "tarih_ata"
+    MIKTAR_ATA = "miktar_ata"
+    MIKTAR_YUZDE = "miktar_yuzde"
+    MIKTAR_EKLE = "miktar_ekle"
+
+    def __init__(self, defter, islem_idleri):
+        self.defter = defter
+        self.depo = defter.depo
+        self.islem_idleri = islem_idleri
+
+        self.pencere = tk.Toplevel(defter.pencere)
+        self.pencere.title("Toplu Düzenle")
+        self.pencere.transient(defter.pencere)
+        self.pencere.grab_set()
+
+        frame = ttk.Frame(self.pencere, padding="10")
+        frame.pack(fill="both", expand=True)
+
+        self.kapsam = tk.StringVar(value="secili" if islem_idleri else "tumu")
+        ttk.Radiobutton(frame, text=f"Seçili {len(islem_idleri)} işlem", variable=self.kapsam, value="secili",
+                        state=tk.NORMAL if islem_idleri else tk.DISABLED).grid(column=0, row=0, columnspan=3,
+                                                                                 sticky=tk.W)
+        ttk.Radiobutton(frame, text="Aramaya uyan tüm işlemler", variable=self.kapsam, value="tumu",
+                        state=tk.NORMAL if defter.filtre is not None else tk.DISABLED).grid(
+            column=0, row=1, columnspan=3, sticky=tk.W)
+        ttk.Separator(frame).grid(column=0, row=2, columnspan=3, sticky=tk.EW, pady=5)
+
+        self.islem = tk.StringVar(value=self.KATEGORI)
+        self.degerler = {}
+
+        def secenek(satir, deger, metin, genislik=12, birim=""):
+            ttk.Radiobutton(frame, text=metin, variable=self.islem, value=deger).grid(
+                column=0, row=satir, padx=5, pady=3, sticky=tk.W)
+            degisken = tk.StringVar()
+            ttk.Entry(frame, textvariable=degisken, width=genislik).grid(column=1, row=satir, padx=5, pady=3,
+                                                                         sticky=tk.W)
+            if birim:
+                ttk.Label(frame, text=birim).grid(column=2, row=satir, sticky=tk.W)
+            self.degerler[deger] = degisken
+
+        ttk.Radiobutton(frame, text="Kategoriyi değiştir:", variable=self.islem, value=self.KATEGORI).grid(
+            column=0, row=3, padx=5, pady=3, sticky=tk.W)
+        kategori_frame = ttk.Frame(frame)
+        kategori_frame.grid(column=1, row=3, columnspan=2, sticky=tk.W)
+        self.tip = ttk.Combobox(kategori_frame, values=["Gelir", "Gider"], state="readonly", width=8)
+        self.tip.pack(side=tk.LEFT, padx=5)
+        self.tip.current(1)
+        self.kategori = ttk.Combobox(kategori_frame, state="readonly", width=15)
+        self.kategori.pack(side=tk.LEFT, padx=5)
+        self.tip.bind("<<ComboboxSelected>>", lambda event: self._kategorileri_guncelle())
+        self._kategorileri_guncelle()
+
+        secenek(4, self.TARIH_KAYDIR, "Tarihi kaydır:", 6, "gün (geri için eksi)")
+        secenek(5, self.TARIH_ATA, "Tarihi ayarla:", 12, "YYYY-AA-GG")
+        secenek(6, self.MIKTAR_ATA, "Miktarı ayarla:", 12, "TL")
+        secenek(7, self.MIKTAR_YUZDE, "Miktarı değiştir:", 6, "% (azaltmak için eksi)")
+        secenek(8, self.MIKTAR_EKLE, "Miktara ekle:", 12, "TL (çıkarmak için eksi)")
+
+        buton_frame = ttk.Frame(frame)
+        buton_frame.grid(column=0, row=9, columnspan=3, pady=10)
+        ttk.Button(buton_frame, text="Uygula", command=self.uygula).pack(side=tk.LEFT, padx=5)
+        ttk.Button(buton_frame, text="İptal", command=self.pencere.destroy).pack(side=tk.LEFT, padx=5)
+
+    def _kategorileri_guncelle(self):
+        adlar = self.depo.kategori_adlari(self.tip.get())
+        self.kategori['values'] = adlar
+        if adlar:
+            self.kategori.current(0)
+
+    def _degisikligi_oku(self):
+        """Seçilen değişikliği (özet metni, depo çağrısı) olarak döndürür; geçersiz girdide ValueError"""
+        islem = self.islem.get()
+        if islem == self.KATEGORI:
+            kategori, tip = self.kategori.get(), self.tip.get()
+            if not kategori:
+                raise ValueError("Lütfen bir kategori seçin")
+            return f"kategori → {kategori}", lambda idler: self.depo.toplu_kategori_degistir(idler, kategori, tip)
+
+        metin = self.degerler[islem].get().strip()
+        if not metin:
+            raise ValueError("Lütfen bir değer girin")
+        if islem == self.TARIH_KAYDIR:
+            try:
+                gun = int(metin)
+            except ValueError:
+                raise ValueError("Gün sayısı tam sayı olmalıdır") from None
+            return f"tarih {gun:+d} gün", lambda idler: self.depo.toplu_tarih_degistir(idler, gun_farki=gun)
+        if islem == self.TARIH_ATA:
+            try:
+                datetime.strptime(metin, "%Y-%m-%d")
+            except ValueError:
+                raise ValueError("Tarih YYYY-AA-GG formatında olmalıdır") from None
+            return f"tarih → {metin}", lambda idler: self.depo.toplu_tarih_degistir(idler, tarih=metin)
+        if islem == self.MIKTAR_YUZDE:
+            try:
+                yuzde = float(metin.replace(",", "."))
+            except ValueError:
+                raise ValueError("Yüzde bir sayı olmalıdır") from None
+            return f"tutar %{yuzde:+g}", lambda idler: self.depo.toplu_miktar_degistir(idler, yuzde=yuzde)
+
+        kurus = kurusa_cevir(metin)
+        if islem == self.MIKTAR_ATA:
+            if kurus <= 0:
+                raise ValueError("Miktar pozitif bir sayı olmalıdır")
+            return f"tutar → {tl_metni(kurus)} TL", lambda idler: self.depo.toplu_miktar_degistir(idler, miktar=kurus)
+        return f"tutar {'+' if kurus >= 0 else ''}{tl_metni(kurus)} TL", lambda idler: self.depo.toplu_miktar_degistir(
+            idler, fark=kurus)
+
+    def uygula(self):
+        try:
+            ozet, degistir = self._degisikligi_oku()
+        except ValueError as e:
+            messagebox.showerror("Hata", str(e), parent=self.pencere)
+            return
+
+        idler = self.islem_idleri if self.kapsam.get() == "secili" else self.depo.filtre_idleri(self.defter.filtre)
+        if not idler:
+            messagebox.showinfo("Bilgi", "Değiştirilecek işlem yok", parent=self.pencere)
+            return
+        if len(idler) > 1 and not messagebox.askyesno(
+                "Onay", f"{len(idler)} işleme uygulanacak: {ozet}. Devam edilsin mi?", parent=self.pencere):
+            return
+        try:
+            guncellenen = degistir(idler)
+        except Exception as e:
+            messagebox.showerror("Hata", f"İşlemler güncellenirken bir hata oluştu: {str(e)}", parent=self.pencere)
+            return
+
+        self.pencere.destroy()
+        self.defter.yenile()
+        self.defter._degisiklik_bildir()
+        messagebox.showinfo("Başarılı", f"{guncellenen} işlem güncellendi: {ozet}", parent=self.defter.pencere)
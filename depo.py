@@ -0,0 +1,627 @@
+"""Arayüzden bağımsız veri erişim katmanı (işlemler, kategoriler, rapor sorguları)"""
+import sqlite3
+from contextlib import contextmanager
+from datetime import date, timedelta
+from typing import NamedTuple
+
+import arsiv
+from veritabani import JULYEN_FARKI, gun_numarasi, parmak_izi
+
+
+class Kategori(NamedTuple):
+    id: int
+    ad: str
+    tip: str
+
+
+class Islem(NamedTuple):
+    id: int
+    tarih: str
+    tip: str
+    kategori: str
+    miktar: int  # kuruş
+    aciklama: str | None
+
+
+class IslemFiltresi(NamedTuple):
+    """İşlem arama ölçütleri; None bırakılan alanlar filtre uygulamaz"""
+    metin: str | None = None  # açıklamada tam metin arama (FTS5)
+    baslangic: str | None = None  # YYYY-MM-DD, dahil
+    bitis: str | None = None  # YYYY-MM-DD, dahil
+    tip: str | None = None
+    kategori_idleri: tuple[int, ...] | None = None
+    en_az: int | None = None  # kuruş, dahil
+    en_cok: int | None = None  # kuruş, dahil
+
+
+def fts_sorgusu(metin: str) -> str | None:
+    """Kullanıcı metnini FTS5 sorgusuna çevirir: her sözcük önek olarak aranır ve hepsi bulunmalıdır.
+
+    Sözcükler tırnak içine alındığından FTS5 işleçleri (AND, NEAR, *, :) düz metin sayılır.
+    Dizindeki gibi noktasız ı/I, i'ye çevrilir.
+    """
+    sozcukler = metin.replace("ı", "i").replace("I", "i").split()
+    if not sozcukler:
+        return None
+    return " ".join('"' + sozcuk.replace('"', '""') + '"*' for sozcuk in sozcukler)
+
+
+def _islem_satiri(tarih: str, miktar: int, aciklama: str, kategori_id: int | None, tip: str) -> tuple:
+    """islemler'e yazılacak (gun, miktar, aciklama, kategori_id, tip, parmak_izi) değerleri"""
+    gun = gun_numarasi(tarih)
+    return gun, miktar, aciklama, kategori_id, tip, parmak_izi(gun, miktar, kategori_id, tip, aciklama)
+
+
+class DepoHatasi(Exception):
+    """Veri katmanında iş kuralı ihlali (ör. bilinmeyen kategori)"""
+
+
+class KategoriKaydi:
+    """Kategorilerin bellekteki kaydı: (ad, tip) -> id, tip -> adlar ve kategori başına işlem sayısı.
+
+    Tek seferde yüklenir; form, combobox ve toplu işlemler kategorileri SQLite'a gitmeden O(1)
+    çözer. Kullanım sayıları aylik_toplamlar özetindeki adetlerden okunur ve depo üzerinden
+    yapılan işlem yazmalarıyla yerinde güncellenir. Başka bir bağlantı (ör. sunucu ya da komut
+    satırından içe aktarma) yazınca PRAGMA data_version değişir ve kayıt yeniden yüklenir.
+    """
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.kategoriler: dict[int, Kategori] = {}
+        self.kimlikler: dict[tuple[str, str], int] = {}
+        self.tip_adlari: dict[str, list[str]] = {}
+        for kategori in map(Kategori._make, conn.execute("SELECT id, ad, tip FROM kategoriler ORDER BY id")):
+            self.kategoriler[kategori.id] = kategori
+            self.kimlikler[(kategori.ad, kategori.tip)] = kategori.id
+            self.tip_adlari.setdefault(kategori.tip, []).append(kategori.ad)
+        self.kullanim: dict[int, int] = dict(conn.execute(
+            "SELECT kategori_id, SUM(adet) FROM aylik_toplamlar GROUP BY kategori_id"))
+
+    def kullanim_degisti(self, kategori_id: int, fark: int) -> None:
+        self.kullanim[kategori_id] = self.kullanim.get(kategori_id, 0) + fark
+
+
+class FinansDeposu:
+    """Tek bir SQLite bağlantısı üzerinden tüm okuma/yazma işlemlerini yürütür.
+
+    Tkinter'a bağımlı değildir; toplu işler, ölçümler ve testler doğrudan kullanabilir.
+    Yazma metotları kendi işlemlerini (transaction) tamamlar. Tüm tutarlar tam sayı kuruştur;
+    TL metnine/sayısına dönüşüm para modülüyle arayüz sınırında yapılır.
+    """
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        # Bu bağlantı üzerinden yapılan yazmaların tablo bazında sayacı (önbellek anahtarları için)
+        self._yazma_sayaclari = {"islemler": 0, "kategoriler": 0}
+        self._kayit: KategoriKaydi | None = None
+        self._kayit_surumu = None  # kayıt yüklenirken PRAGMA data_version
+
+    def yazildi(self, *tablolar: str) -> None:
+        """Depo dışından (ör. toplu içe aktarma) bu bağlantıyla yapılan yazmaları bildirir.
+
+        Dışarıdan yapılan yazmalar kategori kaydının sayılarını bilemeyeceğinden kayıt da yenilenir.
+        """
+        for tablo in tablolar:
+            self._yazma_sayaclari[tablo] += 1
+        self._kayit = None
+
+    @property
+    def kategori_kaydi(self) -> KategoriKaydi:
+        """Kategori kaydı; ilk kullanımda, kategori ekle/sil sonrasında ve başka bağlantı yazınca yüklenir"""
+        data_version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+        if self._kayit is None or self._kayit_surumu != data_version:
+            self._kayit, self._kayit_surumu = KategoriKaydi(self.conn), data_version
+        return self._kayit
+
+    def veri_surumu(self, tablolar: tuple[str, ...]) -> tuple[int, ...]:
+        """Verilen tabloların içeriği değiştikçe değişen sürüm değeri.
+
+        Bu bağlantının yazmaları sayaçlarla, başka bağlantıların (ör. başka bir süreç)
+        kayıtları PRAGMA data_version ile yakalanır.
+        """
+        data_version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+        return (data_version, *(self._yazma_sayaclari[tablo] for tablo in tablolar))
+
+    def kapat(self) -> None:
+        self.conn.close()
+
+    # --- Kategoriler ---
+
+    def kategoriler(self) -> list[Kategori]:
+        """Tüm kategorileri tip ve ada göre sıralı döndürür"""
+        return sorted(self.kategori_kaydi.kategoriler.values(), key=lambda kategori: (kategori.tip, kategori.ad))
+
+    def kategori_adlari(self, tip: str) -> list[str]:
+        """Verilen tipteki kategori adlarını döndürür"""
+        return list(self.kategori_kaydi.tip_adlari.get(tip, ()))
+
+    def kategori_id(self, ad: str, tip: str) -> int | None:
+        return self.kategori_kaydi.kimlikler.get((ad, tip))
+
+    def kategori_var_mi(self, ad: str, tip: str) -> bool:
+        return self.kategori_id(ad, tip) is not None
+
+    def kategori_ekle(self, ad: str, tip: str) -> int:
+        """Yeni kategori ekler ve id'sini döndürür"""
+        if self.kategori_var_mi(ad, tip):
+            raise DepoHatasi("Bu kategori zaten mevcut")
+        with self.conn:
+            kategori_id = self.conn.execute("INSERT INTO kategoriler (ad, tip) VALUES (?, ?)", (ad, tip)).lastrowid
+        self.yazildi("kategoriler")
+        return kategori_id
+
+    def kategori_kullanim_sayisi(self, kategori_id: int) -> int:
+        """Kategoriye bağlı işlem sayısını döndürür"""
+        return self.kategori_kaydi.kullanim.get(int(kategori_id), 0)
+
+    def kategori_sil(self, kategori_id: int) -> None:
+        """İşlemlerde kullanılmayan bir kategoriyi siler"""
+        hata = DepoHatasi("Bu kategoriye bağlı işlemler var. Önce bu işlemleri silmeniz gerekiyor.")
+        if self.kategori_kullanim_sayisi(kategori_id) > 0:
+            raise hata
+        with self.conn:
+            self.conn.execute("DELETE FROM kategoriler WHERE id = ?", (kategori_id,))
+            # Silme yazma kilidini aldığından bu denetim ile silme arasında başka bağlantı işlem ekleyemez;
+            # arşivlenmiş yılların işlemleri yalnızca aylik_toplamlar özetinde görünür
+            (kullaniliyor,) = self.conn.execute("""
+            SELECT EXISTS (SELECT 1 FROM islemler WHERE kategori_id = ?)
+                OR EXISTS (SELECT 1 FROM aylik_toplamlar WHERE kategori_id = ? AND adet > 0)
+            """, (kategori_id, kategori_id)).fetchone()
+            if kullaniliyor:
+                raise hata
+        self.yazildi("kategoriler")
+
+    def _kategori_id_zorunlu(self, ad: str, tip: str, kayit: KategoriKaydi | None = None) -> int:
+        kategori_id = (kayit or self.kategori_kaydi).kimlikler.get((ad, tip))
+        if kategori_id is None:
+            raise DepoHatasi(f"'{ad}' ({tip}) kategorisi bulunamadı")
+        return kategori_id
+
+    # --- İşlemler ---
+
+    def son_islemler(self, limit: int = 10) -> list[Islem]:
+        """En yeni işlemleri döndürür"""
+        return [Islem(*row) for row in self.conn.execute("""
+        SELECT islemler.id, islemler.tarih, islemler.tip, kategoriler.ad, islemler.miktar, islemler.aciklama
+        FROM islemler
+        JOIN kategoriler ON islemler.kategori_id = kategoriler.id
+        ORDER BY islemler.gun DESC, islemler.id DESC LIMIT ?
+        """, (limit,))]
+
+    # Bir aramanın "seçici" sayılması için en fazla eşleşme sayısı (bkz. _secici_mi)
+    SECICILIK_ESIGI = 5000
+
+    def _secici_mi(self, sorgu: str, parametreler: tuple) -> bool:
+        """Sorgunun en fazla SECICILIK_ESIGI satır döndürüp döndürmediğini sınırlı bir okumayla yoklar"""
+        return self.conn.execute(f"SELECT COUNT(*) FROM ({sorgu} LIMIT ?)",
+                                 (*parametreler, self.SECICILIK_ESIGI + 1)).fetchone()[0] <= self.SECICILIK_ESIGI
+
+    def _filtre_kosullari(self, filtre: IslemFiltresi | None) -> tuple[list[str], list]:
+        """Filtreyi islemler üzerinde WHERE koşullarına ve parametrelerine çevirir.
+
+        Metin ve tutar aralığı az satıra uyuyorsa sorgu o dizinden başlar ve sonuçlar sıralanır;
+        çok satıra uyuyorsa sütun '+' ile dizinden ayrılır ve satırlar gun indeksinden sırayla
+        taranır, böylece ilk sayfa için yalnızca birkaç yüz satır okunur.
+        """
+        kosullar, parametreler = [], []
+        if filtre is None:
+            return kosullar, parametreler
+        sorgu = fts_sorgusu(filtre.metin) if filtre.metin else None
+        if sorgu is not None:
+            alt_sorgu = "SELECT rowid FROM islemler_fts WHERE islemler_fts MATCH ?"
+            on_ek = "" if self._secici_mi(alt_sorgu, (sorgu,)) else "+"
+            kosullar.append(f"{on_ek}islemler.id IN ({alt_sorgu})")
+            parametreler.append(sorgu)
+        if filtre.baslangic is not None:
+            kosullar.append("islemler.gun >= ?")
+            parametreler.append(gun_numarasi(filtre.baslangic))
+        if filtre.bitis is not None:
+            kosullar.append("islemler.gun <= ?")
+            parametreler.append(gun_numarasi(filtre.bitis))
+        if filtre.tip is not None:
+            kosullar.append("islemler.tip = ?")
+            parametreler.append(filtre.tip)
+        if filtre.kategori_idleri is not None:
+            kosullar.append(f"islemler.kategori_id IN ({', '.join('?' * len(filtre.kategori_idleri))})")
+            parametreler.extend(filtre.kategori_idleri)
+        if filtre.en_az is not None or filtre.en_cok is not None:
+            araliklar = (filtre.en_az if filtre.en_az is not None else -2 ** 63,
+                         filtre.en_cok if filtre.en_cok is not None else 2 ** 63 - 1)
+            dar = self._secici_mi("SELECT 1 FROM islemler WHERE miktar BETWEEN ? AND ?", araliklar)
+            kosullar.append(f"{'' if dar else '+'}islemler.miktar BETWEEN ? AND ?")
+            parametreler.extend(araliklar)
+        return kosullar, parametreler
+
+    def islem_sayfasi(self, limit: int, sonra: tuple[str, int] | None = None,
+                      once: tuple[str, int] | None = None, filtre: IslemFiltresi | None = None) -> list[Islem]:
+        """(tarih, id) anahtarına göre sayfalanmış işlemleri yeniden eskiye sıralı döndürür.
+
+        sonra verilirse bu anahtardan daha eski, once verilirse daha yeni en fazla limit satır gelir.
+        Anahtarın tarihi gun numarasına çevrilir; karşılaştırma ve sıralama (gun, id) üzerindendir.
+        OFFSET kullanılmadığından her sayfa, defterin büyüklüğünden bağımsız olarak indeksten okunur.
+        filtre verilirse yalnızca ölçütlere uyan işlemler aynı şekilde sayfalanır.
+        """
+        kosullar, parametreler = self._filtre_kosullari(filtre)
+        if once is not None:
+            kosullar.append("(islemler.gun, islemler.id) > (?, ?)")
+            parametreler.extend((gun_numarasi(once[0]), once[1]))
+            sira = "islemler.gun, islemler.id"
+        else:
+            if sonra is not None:
+                kosullar.append("(islemler.gun, islemler.id) < (?, ?)")
+                parametreler.extend((gun_numarasi(sonra[0]), sonra[1]))
+            sira = "islemler.gun DESC, islemler.id DESC"
+        where = f"WHERE {' AND '.join(kosullar)}" if kosullar else ""
+
+        satirlar = self.conn.execute(f"""
+        SELECT islemler.id, islemler.tarih, islemler.tip, kategoriler.ad, islemler.miktar, islemler.aciklama
+        FROM islemler
+        JOIN kategoriler ON islemler.kategori_id = kategoriler.id
+        {where}
+        ORDER BY {sira} LIMIT ?
+        """, (*parametreler, limit)).fetchall()
+        if once is not None:
+            satirlar.reverse()
+        return [Islem(*row) for row in satirlar]
+
+    def islem_parcalari(self, filtre: IslemFiltresi | None = None, parca_boyutu: int = 5000):
+        """Filtreye uyan işlemleri eskiden yeniye, en fazla parca_boyutu satırlık listeler halinde üretir.
+
+        Satırlar (id, tarih, tip, kategori, miktar, aciklama) demetleridir ve imleçten fetchmany ile
+        okunur; defter ne kadar büyük olursa olsun bellekte yalnızca bir parça tutulur. Dışa aktarmada
+        hiçbir kayıt düşmesin diye kategorisiz işlemler de (kategori None) gelir.
+        """
+        kosullar, parametreler = self._filtre_kosullari(filtre)
+        where = f"WHERE {' AND '.join(kosullar)}" if kosullar else ""
+        imlec = self.conn.execute(f"""
+        SELECT islemler.id, islemler.tarih, islemler.tip, kategoriler.ad, islemler.miktar, islemler.aciklama
+        FROM islemler
+        LEFT JOIN kategoriler ON islemler.kategori_id = kategoriler.id
+        {where}
+        ORDER BY islemler.gun, islemler.id
+        """, parametreler)
+        try:
+            while parca := imlec.fetchmany(parca_boyutu):
+                yield parca
+        finally:
+            imlec.close()
+
+    def islem_getir(self, islem_id: int) -> Islem | None:
+        row = self.conn.execute("""
+        SELECT islemler.id, islemler.tarih, islemler.tip, kategoriler.ad, islemler.miktar, islemler.aciklama
+        FROM islemler
+        JOIN kategoriler ON islemler.kategori_id = kategoriler.id
+        WHERE islemler.id = ?
+        """, (islem_id,)).fetchone()
+        return Islem(*row) if row else None
+
+    def islem_ekle(self, tarih: str, miktar: int, aciklama: str, kategori_adi: str, tip: str) -> int:
+        """Yeni işlem ekler ve id'sini döndürür"""
+        kategori_id = self._kategori_id_zorunlu(kategori_adi, tip)
+        with self.conn:
+            islem_id = self.conn.execute("""
+            INSERT INTO islemler (gun, miktar, aciklama, kategori_id, tip, parmak_izi)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """, _islem_satiri(tarih, miktar, aciklama, kategori_id, tip)).lastrowid
+        self._yazma_sayaclari["islemler"] += 1
+        self.kategori_kaydi.kullanim_degisti(kategori_id, +1)
+        return islem_id
+
+    def islemler_ekle(self, islemler: list[tuple[str, int, str, str, str]]) -> list[int]:
+        """(tarih, miktar, aciklama, kategori_adi, tip) satırlarını tek işlem içinde ekler; id'leri sırasıyla döndürür.
+
+        Kategorilerden biri bilinmiyorsa hiçbir satır eklenmez.
+        """
+        kayit = self.kategori_kaydi
+        satirlar = [_islem_satiri(tarih, miktar, aciklama, self._kategori_id_zorunlu(kategori_adi, tip, kayit), tip)
+                    for tarih, miktar, aciklama, kategori_adi, tip in islemler]
+        with self.conn:
+            idler = [self.conn.execute("""
+            INSERT INTO islemler (gun, miktar, aciklama, kategori_id, tip, parmak_izi)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """, satir).lastrowid for satir in satirlar]
+        self._yazma_sayaclari["islemler"] += 1
+        for satir in satirlar:
+            kayit.kullanim_degisti(satir[3], +1)
+        return idler
+
+    def islem_guncelle(self, islem_id: int, tarih: str, miktar: int, aciklama: str,
+                       kategori_adi: str, tip: str) -> None:
+        kategori_id = self._kategori_id_zorunlu(kategori_adi, tip)
+        with self.conn:
+            eski = self.conn.execute("SELECT kategori_id FROM islemler WHERE id = ?", (islem_id,)).fetchone()
+            self.conn.execute("""
+            UPDATE islemler
+            SET gun = ?, miktar = ?, aciklama = ?, kategori_id = ?, tip = ?, parmak_izi = ?
+            WHERE id = ?
+            """, (*_islem_satiri(tarih, miktar, aciklama, kategori_id, tip), islem_id))
+        self._yazma_sayaclari["islemler"] += 1
+        if eski is not None and eski[0] != kategori_id:
+            self.kategori_kaydi.kullanim_degisti(eski[0], -1)
+            self.kategori_kaydi.kullanim_degisti(kategori_id, +1)
+
+    def ayni_islemler(self, tarih: str, miktar: int, aciklama: str, kategori_adi: str, tip: str) -> list[Islem]:
+        """Verilen alanlarla zaten kayıtlı işlemler (açıklama sadeleştirilerek karşılaştırılır).
+
+        Parmak izi indeksinden tek aramayla bulunur; girişte kopya uyarısı için kullanılır.
+        """
+        kategori_id = self.kategori_id(kategori_adi, tip)
+        gun = gun_numarasi(tarih)
+        satirlar = self.conn.execute("""
+        SELECT islemler.id, islemler.tarih, islemler.tip, kategoriler.ad, islemler.miktar, islemler.aciklama
+        FROM islemler
+        LEFT JOIN kategoriler ON islemler.kategori_id = kategoriler.id
+        WHERE islemler.parmak_izi = ? AND islemler.gun = ? AND islemler.miktar = ? AND islemler.tip = ?
+        ORDER BY islemler.id
+        """, (parmak_izi(gun, miktar, kategori_id, tip, aciklama), gun, miktar, tip)).fetchall()
+        return [Islem(*row) for row in satirlar]
+
+    def kopya_adaylari(self, parca_boyutu: int = 5000):
+        """Tüm işlemleri (miktar, tip, gun, id) sırasıyla parça parça üretir (kopya taraması için).
+
+        Satırlar (id, tarih, tip, kategori, miktar, aciklama, gun, parmak_izi) demetleridir. Sıralamanın
+        ilk anahtarı miktar indeksinden gelir; geri kalanı yalnızca aynı tutarlı satırlar arasında sıralanır.
+        """
+        imlec = self.conn.execute("""
+        SELECT islemler.id, islemler.tarih, islemler.tip, kategoriler.ad, islemler.miktar, islemler.aciklama,
+               islemler.gun, islemler.parmak_izi
+        FROM islemler
+        LEFT JOIN kategoriler ON islemler.kategori_id = kategoriler.id
+        ORDER BY islemler.miktar, islemler.tip, islemler.gun, islemler.id
+        """)
+        try:
+            while parca := imlec.fetchmany(parca_boyutu):
+                yield parca
+        finally:
+            imlec.close()
+
+    def islem_sil(self, islem_id: int) -> None:
+        with self.conn:
+            eski = self.conn.execute("DELETE FROM islemler WHERE id = ? RETURNING kategori_id", (islem_id,)).fetchone()
+        self._yazma_sayaclari["islemler"] += 1
+        if eski is not None:
+            self.kategori_kaydi.kullanim_degisti(eski[0], -1)
+
+    # --- Toplu işlemler ---
+
+    # IN (...) listesine tek seferde verilen en fazla id (SQLite parametre sınırının altında)
+    TOPLU_PARCA_BOYUTU = 900
+
+    def filtre_idleri(self, filtre: IslemFiltresi | None) -> list[int]:
+        """Filtreye uyan tüm işlemlerin id'leri (toplu düzenleme için)"""
+        kosullar, parametreler = self._filtre_kosullari(filtre)
+        where = f"WHERE {' AND '.join(kosullar)}" if kosullar else ""
+        sorgu = f"SELECT islemler.id FROM islemler {where}"
+        return [islem_id for (islem_id,) in self.conn.execute(sorgu, parametreler)]
+
+    def _parcalar(self, islem_idleri: list[int]):
+        """id listesini IN (...) parametre sınırına uyan parçalara böler"""
+        for baslangic in range(0, len(islem_idleri), self.TOPLU_PARCA_BOYUTU):
+            parca = islem_idleri[baslangic:baslangic + self.TOPLU_PARCA_BOYUTU]
+            yield parca, ", ".join("?" * len(parca))
+
+    def _parmak_izlerini_yenile(self, islem_idleri: list[int]) -> None:
+        """Toplu güncellenen işlemlerin parmak izlerini yeniden hesaplar (açık bir işlem içinde çağrılır)"""
+        for parca, yer_tutucular in self._parcalar(islem_idleri):
+            satirlar = self.conn.execute(
+                f"SELECT id, gun, miktar, kategori_id, tip, aciklama FROM islemler WHERE id IN ({yer_tutucular})",
+                parca).fetchall()
+            self.conn.executemany("UPDATE islemler SET parmak_izi = ? WHERE id = ?",
+                                  [(parmak_izi(*satir[1:]), satir[0]) for satir in satirlar])
+
+    def _kategori_dagilimi(self, islem_idleri: list[int]) -> dict[int, int]:
+        """İşlemlerin kategori_id -> adet dağılımı (kullanım sayılarını düzeltmek için)"""
+        dagilim: dict[int, int] = {}
+        for parca, yer_tutucular in self._parcalar(islem_idleri):
+            for kategori_id, adet in self.conn.execute(
+                    f"SELECT IFNULL(kategori_id, 0), COUNT(*) FROM islemler WHERE id IN ({yer_tutucular}) GROUP BY 1",
+                    parca):
+                dagilim[kategori_id] = dagilim.get(kategori_id, 0) + adet
+        return dagilim
+
+    def toplu_sil(self, islem_idleri) -> int:
+        """İşlemleri tek işlem (transaction) içinde siler; silinen satır sayısını döndürür"""
+        islem_idleri = list(dict.fromkeys(map(int, islem_idleri)))
+        with self.conn:
+            dagilim = self._kategori_dagilimi(islem_idleri)
+            silinen = self.conn.executemany("DELETE FROM islemler WHERE id = ?",
+                                            [(islem_id,) for islem_id in islem_idleri]).rowcount
+        self._yazma_sayaclari["islemler"] += 1
+        for kategori_id, adet in dagilim.items():
+            self.kategori_kaydi.kullanim_degisti(kategori_id, -adet)
+        return silinen
+
+    def toplu_kategori_degistir(self, islem_idleri, kategori_adi: str, tip: str) -> int:
+        """İşlemleri verilen kategoriye (ve onun tipine) taşır; güncellenen satır sayısını döndürür"""
+        kategori_id = self._kategori_id_zorunlu(kategori_adi, tip)
+        islem_idleri = list(dict.fromkeys(map(int, islem_idleri)))
+        with self.conn:
+            dagilim = self._kategori_dagilimi(islem_idleri)
+            guncellenen = self.conn.executemany("UPDATE islemler SET kategori_id = ?, tip = ? WHERE id = ?",
+                                                [(kategori_id, tip, islem_id) for islem_id in islem_idleri]).rowcount
+            self._parmak_izlerini_yenile(islem_idleri)
+        self._yazma_sayaclari["islemler"] += 1
+        for eski_id, adet in dagilim.items():
+            self.kategori_kaydi.kullanim_degisti(eski_id, -adet)
+        self.kategori_kaydi.kullanim_degisti(kategori_id, sum(dagilim.values()))
+        return guncellenen
+
+    def toplu_tarih_degistir(self, islem_idleri, tarih: str | None = None, gun_farki: int | None = None) -> int:
+        """İşlemlerin tarihini tarih'e ayarlar ya da gun_farki gün kaydırır (ikisinden biri verilmeli)"""
+        if (tarih is None) == (gun_farki is None):
+            raise DepoHatasi("Yeni tarih ya da gün farkından yalnızca biri verilmelidir")
+        if tarih is not None:
+            sorgu, deger = "UPDATE islemler SET gun = ? WHERE id = ?", gun_numarasi(tarih)
+        else:
+            sorgu, deger = "UPDATE islemler SET gun = gun + ? WHERE id = ?", int(gun_farki)
+        islem_idleri = list(dict.fromkeys(map(int, islem_idleri)))
+        with self.conn:
+            guncellenen = self.conn.executemany(sorgu, [(deger, islem_id) for islem_id in islem_idleri]).rowcount
+            self._parmak_izlerini_yenile(islem_idleri)
+        self._yazma_sayaclari["islemler"] += 1
+        return guncellenen
+
+    def toplu_miktar_degistir(self, islem_idleri, miktar: int | None = None, yuzde: float | None = None,
+                              fark: int | None = None) -> int:
+        """İşlemlerin tutarını miktar'a (kuruş) ayarlar, yuzde oranında değiştirir ya da fark (kuruş) ekler.
+
+        Yalnızca biri verilmelidir. Sonuçta sıfır veya negatif tutar kalacaksa hiçbir satır değişmez.
+        """
+        if sum(deger is not None for deger in (miktar, yuzde, fark)) != 1:
+            raise DepoHatasi("Yeni tutar, yüzde ya da farktan yalnızca biri verilmelidir")
+        if miktar is not None:
+            sorgu, parametreler = "UPDATE islemler SET miktar = ? WHERE id = ?", (miktar,)
+        elif yuzde is not None:
+            sorgu = "UPDATE islemler SET miktar = CAST(ROUND(miktar * ?) AS INTEGER) WHERE id = ?"
+            parametreler = (1 + yuzde / 100,)
+        else:
+            sorgu, parametreler = "UPDATE islemler SET miktar = miktar + ? WHERE id = ?", (fark,)
+        islem_idleri = list(dict.fromkeys(map(int, islem_idleri)))
+        with self.conn:
+            guncellenen = self.conn.executemany(
+                sorgu, [(*parametreler, islem_id) for islem_id in islem_idleri]).rowcount
+            for parca, yer_tutucular in self._parcalar(islem_idleri):
+                if self.conn.execute(f"SELECT 1 FROM islemler WHERE id IN ({yer_tutucular}) AND miktar <= 0 LIMIT 1",
+                                     parca).fetchone():
+                    raise DepoHatasi("Bu değişiklik bazı işlemlerin tutarını sıfır veya negatif yapar")
+            self._parmak_izlerini_yenile(islem_idleri)
+        self._yazma_sayaclari["islemler"] += 1
+        return guncellenen
+
+    # --- Rapor sorguları ---
+
+    def aylik_ozet(self, ay_sayisi: int = 6) -> list[tuple[str, str, int]]:
+        """Son ay_sayisi aya ait (ay, tip, toplam) satırlarını döndürür.
+
+        Tam aylar aylik_toplamlar özetinden okunur; yalnızca başlangıç sınırının düştüğü
+        kısmi ay islemler tablosundan (gun indeksiyle) toplanır.
+        """
+        sinir = f"-{ay_sayisi} months"
+        return self.conn.execute("""
+        SELECT ay, tip, SUM(toplam) as toplam
+        FROM (
+            SELECT ay, tip, toplam
+            FROM aylik_toplamlar
+            WHERE ay > strftime('%Y-%m', date('now', ?))
+            UNION ALL
+            SELECT ay, tip, miktar
+            FROM islemler
+            WHERE gun >= julianday(date('now', ?)) + 0.5
+              AND gun < julianday('now', ?, 'start of month', '+1 month') + 0.5
+        )
+        GROUP BY ay, tip
+        ORDER BY ay
+        """, (sinir, sinir, sinir)).fetchall()
+
+    def kategori_harcamalari(self, gun_sayisi: int = 30) -> list[tuple[str, int]]:
+        """Son gun_sayisi gündeki giderlerin kategori bazında toplamlarını döndürür.
+
+        Pencere ay sınırlarıyla örtüşmediğinden (tip, gun) indeksiyle yalnızca aralıktaki satırlar okunur.
+        """
+        return self.conn.execute("""
+        SELECT k.ad, SUM(i.miktar) as toplam
+        FROM islemler i
+        JOIN kategoriler k ON i.kategori_id = k.id
+        WHERE i.tip = 'Gider' AND i.gun >= julianday(date('now', ?)) + 0.5
+        GROUP BY k.ad
+        ORDER BY toplam DESC
+        """, (f"-{gun_sayisi} days",)).fetchall()
+
+    def tip_toplamlari(self) -> dict[str, int]:
+        """Tüm zamanların Gelir/Gider toplamlarını döndürür"""
+        return dict(self.conn.execute("SELECT tip, SUM(toplam) as toplam FROM aylik_toplamlar GROUP BY tip"))
+
+    @contextmanager
+    def _donem_kaynagi(self, baslangic: str, bitis: str):
+        """[baslangic, bitis] (dahil) için (ay, tip, kategori_id, toplam) satırları veren alt sorgu.
+
+        with self._donem_kaynagi(...) as (kaynak, parametreler): biçiminde kullanılır. Aralığa
+        tamamen giren aylar aylik_toplamlar özetinden (arşivlenmiş yıllar dahil), yalnızca kısmen
+        giren kenar aylar ham işlemlerden (gun indeksiyle) okunur. Kenar ay arşivlenmiş bir yıldaysa
+        o yılın arşivi blok süresince bağlanır ve satırları sıcak veritabanındakilerle birlikte okunur.
+        """
+        ilk, son = date.fromisoformat(baslangic), date.fromisoformat(bitis) + timedelta(days=1)
+        tam_baslangic = ilk if ilk.day == 1 else (ilk.replace(day=1) + timedelta(days=31)).replace(day=1)
+        tam_bitis = son.replace(day=1)
+        if tam_baslangic <= tam_bitis:
+            kenarlar = [(bas, bit) for bas, bit in ((ilk, tam_baslangic), (tam_bitis, son)) if bas < bit]
+        else:
+            # Aralık tek bir ayın içinde kalıyor
+            kenarlar = [(ilk, son)]
+
+        secimler = ["SELECT ay, tip, kategori_id, toplam FROM aylik_toplamlar WHERE ay >= ? AND ay < ?"]
+        parametreler = [tam_baslangic.isoformat()[:7], tam_bitis.isoformat()[:7]]
+        with arsiv.yillar_bagli(self.conn, {bas.year for bas, _ in kenarlar}) as semalar:
+            for bas, bit in kenarlar:
+                for sema in ("main", semalar.get(bas.year)):
+                    if sema is not None:
+                        secimler.append(f"SELECT ay, tip, IFNULL(kategori_id, 0), miktar FROM {sema}.islemler "
+                                        "WHERE gun >= ? AND gun < ?")
+                        parametreler += [bas.toordinal() + JULYEN_FARKI, bit.toordinal() + JULYEN_FARKI]
+            yield " UNION ALL ".join(secimler), tuple(parametreler)
+
+    def donem_aylik_ozet(self, baslangic: str, bitis: str,
+                         kategori_id: int | None = None) -> list[tuple[str, str, int]]:
+        """[baslangic, bitis] aralığındaki (ay, tip, toplam) satırları; kategori_id verilirse yalnızca o kategori"""
+        with self._donem_kaynagi(baslangic, bitis) as (kaynak, parametreler):
+            kosul = ""
+            if kategori_id is not None:
+                kosul, parametreler = "WHERE kategori_id = ?", (*parametreler, kategori_id)
+            return self.conn.execute(f"""
+            SELECT ay, tip, SUM(toplam) as toplam
+            FROM ({kaynak})
+            {kosul}
+            GROUP BY ay, tip
+            ORDER BY ay
+            """, parametreler).fetchall()
+
+    def donem_kategori_harcamalari(self, baslangic: str, bitis: str,
+                                   kategori_id: int | None = None) -> list[tuple[str, int]]:
+        """[baslangic, bitis] aralığındaki gider toplamları kategori bazında; kategori_id verilirse yalnızca o"""
+        with self._donem_kaynagi(baslangic, bitis) as (kaynak, parametreler):
+            kosul = ""
+            if kategori_id is not None:
+                kosul, parametreler = "AND d.kategori_id = ?", (*parametreler, kategori_id)
+            return self.conn.execute(f"""
+            SELECT k.ad, SUM(d.toplam) as toplam
+            FROM ({kaynak}) d
+            JOIN kategoriler k ON d.kategori_id = k.id
+            WHERE d.tip = 'Gider' {kosul}
+            GROUP BY k.ad
+            ORDER BY toplam DESC
+            """, parametreler).fetchall()
+
+    def donem_tip_toplamlari(self, baslangic: str, bitis: str, kategori_id: int | None = None) -> dict[str, int]:
+        """[baslangic, bitis] aralığının Gelir/Gider toplamları; kategori_id verilirse yalnızca o kategori"""
+        with self._donem_kaynagi(baslangic, bitis) as (kaynak, parametreler):
+            kosul = ""
+            if kategori_id is not None:
+                kosul, parametreler = "WHERE kategori_id = ?", (*parametreler, kategori_id)
+            return dict(self.conn.execute(f"SELECT tip, SUM(toplam) FROM ({kaynak}) {kosul} GROUP BY tip",
+                                          parametreler))
+
+    def gun_araligi(self) -> tuple[int, int] | None:
+        """Günlük özetteki ilk ve son günün numaraları (arşivlenmiş yıllar dahil); kayıt yoksa None"""
+        ilk, son = self.conn.execute("SELECT MIN(gun), MAX(gun) FROM gunluk_toplamlar").fetchone()
+        return None if ilk is None else (ilk, son)
+
+    def gunluk_seri(self, ilk_gun: int, son_gun: int) -> tuple[int, list[tuple[int, int, int]]]:
+        """[ilk_gun, son_gun] (gün numarası, dahil) için (açılış bakiyesi, [(gun, gelir, gider), ...]).
+
+        Açılış bakiyesi ilk_gun'den önceki tüm günlerin gelir - gider farkıdır. İkisi de
+        gunluk_toplamlar özetinden okunur; işlem olmayan günler listede yer almaz.
+        """
+        (acilis,) = self.conn.execute("""
+        SELECT IFNULL(SUM(CASE tip WHEN 'Gelir' THEN toplam ELSE -toplam END), 0)
+        FROM gunluk_toplamlar
+        WHERE gun < ?
+        """, (ilk_gun,)).fetchone()
+        satirlar = self.conn.execute("""
+        SELECT gun,
+               SUM(CASE tip WHEN 'Gelir' THEN toplam ELSE 0 END),
+               SUM(CASE tip WHEN 'Gider' THEN toplam ELSE 0 END)
+        FROM gunluk_toplamlar
+        WHERE gun BETWEEN ? AND ?
+        GROUP BY gun
+        ORDER BY gun
+        """, (ilk_gun, son_gun)).fetchall()
+        return acilis, satirlar
@@ -0,0 +1,177 @@
+"""İşlemleri CSV, JSON Lines ya da Excel (XLSX) dosyasına sabit bellekle dışa aktarma
+
+Satırlar veritabanı imlecinden parça parça okunup hemen dosyaya yazılır; XLSX için openpyxl'in
+write_only kipi kullanılır. Bellek kullanımı defterin büyüklüğüne bağlı değildir. Dosya önce
+geçici adla yazılır ve yalnızca aktarma başarıyla biterse hedef adına taşınır.
+
+CSV çıktısı ice_aktarma ile yeniden içe aktarılabilir (tarih, miktar, aciklama, kategori, tip sütunları).
+
+    python disa_aktarma.py islemler.csv --baslangic 2024-01-01 --bitis 2024-12-31 --kategori Market
+"""
+import csv
+import json
+import os
+import time
+from collections import namedtuple
+from datetime import date
+from decimal import Decimal
+
+from depo import FinansDeposu, IslemFiltresi
+from para import tl_metni
+
+# fetchmany başına satır sayısı
+PARCA_BOYUTU = 5000
+
+BICIMLER = ("csv", "jsonl", "xlsx")
+
+SUTUNLAR = ("id", "tarih", "tip", "kategori", "miktar", "aciklama")
+
+DisaAktarmaSonucu = namedtuple("DisaAktarmaSonucu", ["satir_sayisi", "sure", "saniyedeki_satir"])
+
+
+class DisaAktarmaHatasi(Exception):
+    """Dışa aktarma başlatılamadığında ya da yarıda kaldığında oluşan hata (hedef dosya yazılmaz)"""
+
+
+def bicim_bul(yol):
+    """Dosya uzantısından biçimi bulur (.json ve .ndjson da JSON Lines sayılır)"""
+    uzanti = os.path.splitext(yol)[1].lower().lstrip(".")
+    uzanti = {"json": "jsonl", "ndjson": "jsonl"}.get(uzanti, uzanti)
+    if uzanti not in BICIMLER:
+        raise DisaAktarmaHatasi(f"Desteklenmeyen dosya uzantısı: .{uzanti} ({', '.join(BICIMLER)} kullanılabilir)")
+    return uzanti
+
+
+# --- Yazıcılar: her biri açık bir dosya alır ve satır parçalarını yazan bir fonksiyon döndürür ---
+
+def _csv_yazici(dosya):
+    yazici = csv.writer(dosya)
+    yazici.writerow(SUTUNLAR)
+
+    def yaz(parca):
+        yazici.writerows((islem_id, tarih, tip, kategori, tl_metni(miktar), aciklama)
+                         for islem_id, tarih, tip, kategori, miktar, aciklama in parca)
+    return yaz
+
+
+def _jsonl_yazici(dosya):
+    def yaz(parca):
+        dosya.writelines(
+            json.dumps({"id": islem_id, "tarih": tarih, "tip": tip, "kategori": kategori,
+                        "miktar": tl_metni(miktar), "aciklama": aciklama}, ensure_ascii=False) + "\n"
+            for islem_id, tarih, tip, kategori, miktar, aciklama in parca)
+    return yaz
+
+
+def _xlsx_calisma_kitabi():
+    try:
+        from openpyxl import Workbook
+    except ImportError:
+        raise DisaAktarmaHatasi("XLSX dışa aktarma için openpyxl gerekli (pip install openpyxl)") from None
+    kitap = Workbook(write_only=True)
+    sayfa = kitap.create_sheet("İşlemler")
+    sayfa.append(SUTUNLAR)
+
+    # Tarih ve tutar Excel'de sayı olarak yazılır; tutar kuruştan kayıpsız Decimal'e çevrilir
+    def yaz(parca):
+        for islem_id, tarih, tip, kategori, miktar, aciklama in parca:
+            sayfa.append((islem_id, date.fromisoformat(tarih), tip, kategori, Decimal(miktar).scaleb(-2), aciklama))
+    return kitap, yaz
+
+
+def disa_aktar(depo, yol, bicim=None, filtre=None, parca_boyutu=PARCA_BOYUTU, ilerleme=None, iptal=None):
+    """Filtreye uyan işlemleri yol'a yazar.
+
+    ilerleme verilirse her parçadan sonra (satir_sayisi, saniyedeki_satir) ile çağrılır; iptal
+    verilirse (ör. threading.Event.is_set) her parçadan önce sorulur ve True ise aktarma bırakılır.
+    Hata ya da iptalde yarım dosya silinir, varsa eski hedef dosya korunur.
+    """
+    bicim = bicim or bicim_bul(yol)
+    if bicim not in BICIMLER:
+        raise DisaAktarmaHatasi(f"Desteklenmeyen biçim: {bicim}")
+    gecici = f"{yol}.yaziliyor"
+    satir_sayisi = 0
+    baslangic = time.perf_counter()
+
+    def parcalari_yaz(yaz):
+        nonlocal satir_sayisi
+        for parca in depo.islem_parcalari(filtre, parca_boyutu):
+            if iptal is not None and iptal():
+                raise DisaAktarmaHatasi("Dışa aktarma iptal edildi")
+            yaz(parca)
+            satir_sayisi += len(parca)
+            if ilerleme:
+                ilerleme(satir_sayisi, satir_sayisi / max(time.perf_counter() - baslangic, 1e-9))
+
+    try:
+        if bicim == "xlsx":
+            kitap, yaz = _xlsx_calisma_kitabi()
+            parcalari_yaz(yaz)
+            kitap.save(gecici)
+        else:
+            # utf-8-sig: Excel CSV'deki Türkçe karakterleri doğru açsın
+            kodlama = "utf-8-sig" if bicim == "csv" else "utf-8"
+            with open(gecici, "w", newline="", encoding=kodlama) as dosya:
+                parcalari_yaz(_csv_yazici(dosya) if bicim == "csv" else _jsonl_yazici(dosya))
+        os.replace(gecici, yol)
+    except BaseException:
+        if os.path.exists(gecici):
+            os.remove(gecici)
+        raise
+
+    sure = time.perf_counter() - baslangic
+    saniyedeki_satir = satir_sayisi / max(sure, 1e-9)
+    if ilerleme:
+        ilerleme(satir_sayisi, saniyedeki_satir)
+    return DisaAktarmaSonucu(satir_sayisi, sure, saniyedeki_satir)
+
+
+def filtre_olustur(depo, baslangic=None, bitis=None, tip=None, kategori_adlari=None):
+    """Tarih aralığı, tip ve kategori adlarından IslemFiltresi (ölçüt yoksa None).
+
+    Aynı ad hem Gelir hem Gider kategorisiyse, tip verilmedikçe ikisi de alınır.
+    """
+    kategori_idleri = None
+    if kategori_adlari:
+        kayit = depo.kategori_kaydi
+        kategori_idleri = tuple(kategori_id for (ad, kategori_tipi), kategori_id in kayit.kimlikler.items()
+                                if ad in kategori_adlari and tip in (None, kategori_tipi))
+        bilinmeyen = set(kategori_adlari) - {kayit.kategoriler[kategori_id].ad for kategori_id in kategori_idleri}
+        if bilinmeyen:
+            raise DisaAktarmaHatasi(f"Bilinmeyen kategori: {', '.join(sorted(bilinmeyen))}")
+    filtre = IslemFiltresi(baslangic=baslangic, bitis=bitis, tip=tip, kategori_idleri=kategori_idleri)
+    return None if filtre == IslemFiltresi() else filtre
+
+
+if __name__ == "__main__":
+    import argparse
+    import sqlite3
+
+    from veritabani import VERITABANI_YOLU, salt_okunur_baglan
+
+    parser = argparse.ArgumentParser(description="İşlemleri CSV, JSON Lines ya da XLSX dosyasına aktarır")
+    parser.add_argument("cikti", help="Çıktı dosyası; biçim uzantıdan anlaşılır (.csv, .jsonl, .xlsx)")
+    parser.add_argument("--veritabani", default=VERITABANI_YOLU, help="Veritabanı dosyası")
+    parser.add_argument("--bicim", choices=BICIMLER, default=None, help="Uzantı yerine bu biçimi kullan")
+    parser.add_argument("--baslangic", type=date.fromisoformat, default=None, help="İlk gün (YYYY-AA-GG, dahil)")
+    parser.add_argument("--bitis", type=date.fromisoformat, default=None, help="Son gün (YYYY-AA-GG, dahil)")
+    parser.add_argument("--tip", choices=("Gelir", "Gider"), default=None, help="Yalnızca bu tipteki işlemler")
+    parser.add_argument("--kategori", action="append", dest="kategoriler", metavar="AD",
+                        help="Yalnızca bu kategorideki işlemler (tekrarlanabilir)")
+    parser.add_argument("--parca", type=int, default=PARCA_BOYUTU, help="fetchmany başına satır sayısı")
+    args = parser.parse_args()
+
+    def ilerleme_yaz(satir_sayisi, saniyedeki_satir):
+        print(f"\r{satir_sayisi:,} satır ({saniyedeki_satir:,.0f} satır/sn)", end="", flush=True)
+
+    depo = FinansDeposu(salt_okunur_baglan(args.veritabani))
+    try:
+        filtre = filtre_olustur(depo, args.baslangic and args.baslangic.isoformat(),
+                                args.bitis and args.bitis.isoformat(), args.tip, args.kategoriler)
+        sonuc = disa_aktar(depo, args.cikti, args.bicim, filtre, args.parca, ilerleme_yaz)
+    except (DisaAktarmaHatasi, sqlite3.Error, OSError) as e:
+        print(f"\nHata: {e}")
+        raise SystemExit(1)
+    finally:
+        depo.kapat()
+    print(f"\n{sonuc.satir_sayisi:,} satır {sonuc.sure:.2f} sn içinde {args.cikti} dosyasına yazıldı")
@@ -0,0 +1,354 @@
+"""Rapor grafikleri: rapor tipi başına tek, yeniden kullanılan matplotlib Figure.
+
+pyplot kullanılmaz; figürler pyplot'un genel kaydına girmediği için kapatılmayı beklemez
+ve yalnızca sahibi (Tk tuvali ya da Agg çıktısı) tarafından tutulur. Her yeni veri geldiğinde
+mevcut sanatçılar (bar yükseklikleri, etiketler) mümkün olduğunca yerinde güncellenir.
+"""
+import os
+
+import raporlar
+from para import tl_degeri
+
+
+class RaporGrafigi:
+    """Bir rapor tipine ait kalıcı figür"""
+
+    BASLIK = ""
+
+    def __init__(self, figsize=(8, 4)):
+        from matplotlib.figure import Figure
+
+        self.figure = Figure(figsize=figsize)
+        self.ax = self.figure.add_subplot()
+
+    def guncelle(self, veri):
+        """Figürü yeni veriyle günceller; sonrasında tuval yeniden çizilmelidir"""
+        raise NotImplementedError
+
+    def _yerlesimi_duzenle(self):
+        self.ax.relim()
+        self.ax.autoscale_view()
+        self.figure.tight_layout()
+
+
+class AylikOzetGrafigi(RaporGrafigi):
+    """Ay x (Gelir, Gider) gruplanmış bar grafiği"""
+
+    BASLIK = 'Aylık Gelir-Gider Özeti'
+    RENKLER = {'Gelir': 'tab:blue', 'Gider': 'tab:orange'}
+
+    def __init__(self, figsize=(8, 4)):
+        super().__init__(figsize)
+        self._bar_gruplari = {}  # tip -> BarContainer
+        self._aylar = None
+
+    def guncelle(self, pivot_df):
+        aylar = list(pivot_df.index)
+        tipler = list(pivot_df.columns)
+
+        if aylar == self._aylar and tipler == list(self._bar_gruplari):
+            # Aynı ay/tip düzeni: yalnızca bar yüksekliklerini değiştir
+            for tip, bar_grubu in self._bar_gruplari.items():
+                for bar, deger in zip(bar_grubu, pivot_df[tip]):
+                    bar.set_height(deger)
+        else:
+            self.ax.clear()
+            genislik = 0.8 / max(len(tipler), 1)
+            self._bar_gruplari = {}
+            for sira, tip in enumerate(tipler):
+                konumlar = [x - 0.4 + genislik * (sira + 0.5) for x in range(len(aylar))]
+                self._bar_gruplari[tip] = self.ax.bar(konumlar, list(pivot_df[tip]), genislik,
+                                                      label=tip, color=self.RENKLER.get(tip))
+            self.ax.set_xticks(range(len(aylar)))
+            self.ax.set_xticklabels(aylar, rotation=90)
+            self.ax.legend(title='tip')
+            self.ax.set_title(self.BASLIK)
+            self.ax.set_xlabel('Ay')
+            self.ax.set_ylabel('Miktar (TL)')
+            self._aylar = aylar
+
+        self._yerlesimi_duzenle()
+
+
+class KategoriHarcamaGrafigi(RaporGrafigi):
+    """Kategori bazlı harcama pastası"""
+
+    BASLIK = 'Kategori Bazlı Harcamalar (Son 30 Gün)'
+
+    def guncelle(self, veri):
+        kategoriler, miktarlar = veri
+        # Pasta dilimleri yerinde yeniden boyutlandırılamaz; eski sanatçılar temizlenip yenileri çizilir
+        self.ax.clear()
+        self.ax.pie(miktarlar, labels=kategoriler, autopct='%1.1f%%', startangle=90)
+        self.ax.axis('equal')  # Dairenin daire olarak görünmesini sağlar
+        self.ax.set_title(self.BASLIK)
+        self.figure.tight_layout()
+
+
+class GelirGiderGrafigi(RaporGrafigi):
+    """Toplam gelir ve gider barları"""
+
+    BASLIK = 'Toplam Gelir-Gider Dengesi'
+
+    def __init__(self, figsize=(8, 4)):
+        super().__init__(figsize)
+        self._barlar = self.ax.bar(['Gelir', 'Gider'], [0, 0], color=['green', 'red'])
+        self.ax.set_title(self.BASLIK)
+        self.ax.set_ylabel('Miktar (TL)')
+
+    def guncelle(self, veri):
+        gelir, gider = veri
+        self._barlar[0].set_height(tl_degeri(gelir))
+        self._barlar[1].set_height(tl_degeri(gider))
+        self._yerlesimi_duzenle()
+
+
+class CizgiGrafigi(RaporGrafigi):
+    """Tarih indeksli bir DataFrame'in sütunlarını çizgi olarak gösterir.
+
+    Sütunlar aynı kaldıkça mevcut çizgilerin verisi set_data ile değiştirilir.
+    SUTUNLAR verilirse yalnızca bu sütunlar çizilir; STILLER sütun -> çizgi stili eşlemesidir.
+    """
+
+    SUTUNLAR = None
+    STILLER = {}
+    Y_ETIKETI = 'Miktar (TL)'
+
+    def __init__(self, figsize=(8, 4)):
+        super().__init__(figsize)
+        self._cizgiler = {}  # sütun -> Line2D
+
+    def _etiketler(self, veri, sutunlar):
+        """Sütun -> lejant etiketi"""
+        return {sutun: sutun for sutun in sutunlar}
+
+    def guncelle(self, veri):
+        sutunlar = self.SUTUNLAR or list(veri.columns)
+        etiketler = self._etiketler(veri, sutunlar)
+        x = veri.index.to_numpy()
+        if sutunlar == list(self._cizgiler):
+            for sutun, cizgi in self._cizgiler.items():
+                cizgi.set_data(x, veri[sutun].to_numpy())
+                cizgi.set_label(etiketler[sutun])
+        else:
+            self.ax.clear()
+            self._cizgiler = {}
+            for sutun in sutunlar:
+                self._cizgiler[sutun], = self.ax.plot(x, veri[sutun].to_numpy(), self.STILLER.get(sutun, '-'),
+                                                      label=etiketler[sutun])
+            self.ax.set_title(self.BASLIK)
+            self.ax.set_ylabel(self.Y_ETIKETI)
+            self.ax.grid(True, alpha=0.3)
+            self.figure.autofmt_xdate()
+        self.ax.legend(loc='upper left', fontsize='small')
+        self._yerlesimi_duzenle()
+
+
+class HareketliOrtalamaGrafigi(CizgiGrafigi):
+    BASLIK = 'Günlük Gider ve Hareketli Ortalamalar'
+    SUTUNLAR = ['7 Günlük Ortalama', '30 Günlük Ortalama', '90 Günlük Ortalama']
+
+
+class KumulatifBakiyeGrafigi(CizgiGrafigi):
+    BASLIK = 'Kümülatif Bakiye'
+    SUTUNLAR = ['Bakiye']
+
+
+class KategoriEgilimGrafigi(CizgiGrafigi):
+    BASLIK = 'Kategori Bazlı Aylık Gider Eğilimleri'
+
+    def _etiketler(self, veri, sutunlar):
+        import analiz
+
+        egim = analiz.egimler(veri[sutunlar])
+        return {sutun: f"{sutun} ({egim[sutun]:+,.0f} TL/ay)" for sutun in sutunlar}
+
+
+class TasarrufOraniGrafigi(CizgiGrafigi):
+    BASLIK = 'Aylık Tasarruf Oranı'
+    SUTUNLAR = ['Tasarruf Oranı (%)', '12 Aylık Oran (%)']
+    STILLER = {'Tasarruf Oranı (%)': ':'}
+    Y_ETIKETI = 'Oran (%)'
+
+
+class HarcamaTahminiGrafigi(CizgiGrafigi):
+    BASLIK = 'Aylık Gider ve Tahmin'
+    SUTUNLAR = ['Gerçekleşen', 'Tahmin']
+    STILLER = {'Tahmin': '--'}
+
+
+class ZamanSerisiGrafigi(RaporGrafigi):
+    """Günlük bakiye (üst) ve günlük harcama (alt) çizgileri; ortak, yakınlaştırılabilir tarih ekseni.
+
+    guncelle yeni bir raporu tüm aralığıyla gösterir. Araç çubuğuyla yakınlaştırma/kaydırma
+    sonrası aralik_degisti(ilk_gun, son_gun, nokta_sayisi) çağrılır (gün numaraları ve eksen
+    genişliğine göre istenen nokta sayısı); çağıran aralığı daha ince çözünürlükle yeniden
+    sorgulayıp sonucu yakinlastirmayi_guncelle'ye verir. Görünür aralık kendi güncellemelerimizle değişmez.
+    """
+
+    BASLIK = 'Bakiye ve Günlük Harcama'
+
+    def __init__(self, figsize=(8, 4)):
+        from matplotlib.dates import AutoDateLocator, ConciseDateFormatter
+
+        super().__init__(figsize)
+        self.figure.clear()
+        self.ax, self.harcama_ax = self.figure.subplots(2, 1, sharex=True, gridspec_kw={'height_ratios': (2, 1)})
+        self._bakiye, = self.ax.plot([], [], lw=1, color='tab:blue')
+        self._harcama, = self.harcama_ax.plot([], [], lw=0.8, color='tab:red')
+        self.ax.set_title(self.BASLIK)
+        self.ax.set_ylabel('Bakiye (TL)')
+        self.harcama_ax.set_ylabel('Gider (TL)')
+        for ax in (self.ax, self.harcama_ax):
+            ax.grid(True, alpha=0.3)
+        bulucu = AutoDateLocator()
+        self.harcama_ax.xaxis.set_major_locator(bulucu)
+        self.harcama_ax.xaxis.set_major_formatter(ConciseDateFormatter(bulucu))
+
+        self.aralik_degisti = None
+        self._aralik = None  # Gösterilen raporun (ilk_gun, son_gun) aralığı
+        self._sessiz = False
+        self.ax.callbacks.connect('xlim_changed', self._xlim_degisti)
+
+    def guncelle(self, veri):
+        self._aralik = (veri.ilk_gun, veri.son_gun)
+        self._verileri_koy(veri)
+        self._sessiz = True
+        try:
+            self.ax.set_xlim(veri.bakiye_x[0], veri.bakiye_x[-1] + 1)
+            for ax in (self.ax, self.harcama_ax):
+                ax.set_autoscaley_on(True)
+                ax.relim()
+                ax.autoscale_view(scalex=False)
+        finally:
+            self._sessiz = False
+        self.figure.tight_layout()
+
+    def yakinlastirmayi_guncelle(self, veri):
+        """Yakınlaştırılmış aralığın daha ayrıntılı verisini görünür aralığı değiştirmeden çizer"""
+        self._verileri_koy(veri)
+        # Kullanıcı y eksenini de seçmediyse (kaydırma, yatay yakınlaştırma) y ekseni görünen veriye uyar
+        for ax in (self.ax, self.harcama_ax):
+            if ax.get_autoscaley_on():
+                ax.relim()
+                ax.autoscale_view(scalex=False)
+
+    def _verileri_koy(self, veri):
+        self._bakiye.set_data(veri.bakiye_x, veri.bakiye_y)
+        self._harcama.set_data(veri.harcama_x, veri.harcama_y)
+
+    def _xlim_degisti(self, ax):
+        if self._sessiz or self.aralik_degisti is None or self._aralik is None:
+            return
+        sol, sag = (raporlar.tarih_sayisindan_gun(x) for x in ax.get_xlim())
+        # Kaydırmada kenarlar boş kalmasın diye görünür aralığın iki yanından yarım genişlik daha istenir;
+        # nokta sayısı görünür kısma piksel başına yaklaşık bir nokta düşecek şekilde ölçeklenir
+        pay = (sag - sol) // 2
+        ilk_gun, son_gun = max(self._aralik[0], sol - pay), min(self._aralik[1], sag + pay)
+        if ilk_gun <= son_gun:
+            piksel = max(int(ax.bbox.width), 100)
+            self.aralik_degisti(ilk_gun, son_gun, piksel * (son_gun - ilk_gun + 1) // max(sag - sol + 1, 1))
+
+
+GRAFIK_SINIFLARI = {
+    raporlar.AYLIK_OZET: AylikOzetGrafigi,
+    raporlar.KATEGORI_BAZLI_HARCAMALAR: KategoriHarcamaGrafigi,
+    raporlar.GELIR_GIDER_DENGESI: GelirGiderGrafigi,
+    raporlar.HAREKETLI_ORTALAMALAR: HareketliOrtalamaGrafigi,
+    raporlar.KUMULATIF_BAKIYE: KumulatifBakiyeGrafigi,
+    raporlar.KATEGORI_EGILIMLERI: KategoriEgilimGrafigi,
+    raporlar.TASARRUF_ORANI: TasarrufOraniGrafigi,
+    raporlar.HARCAMA_TAHMINI: HarcamaTahminiGrafigi,
+    raporlar.ZAMAN_SERISI: ZamanSerisiGrafigi,
+}
+
+
+def grafik_olustur(rapor_tipi, figsize=(8, 4)):
+    """Rapor tipine uygun kalıcı grafik nesnesini oluşturur"""
+    return GRAFIK_SINIFLARI[rapor_tipi](figsize)
+
+
+def _canli_sanatci_sayisi():
+    """Bellekte yaşayan matplotlib sanatçı (Artist) nesnelerinin sayısı"""
+    import gc
+
+    from matplotlib.artist import Artist
+
+    gc.collect()
+    return sum(1 for nesne in gc.get_objects() if isinstance(nesne, Artist))
+
+
+def _yerlesik_bellek_kb():
+    """Sürecin o anki yerleşik bellek (RSS) kullanımı (KB)"""
+    try:
+        with open("/proc/self/statm") as dosya:
+            return int(dosya.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except OSError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def bellek_kontrolu(cizim_sayisi=1000, isinma=50, esik_kb=20 * 1024, sanatci_esigi=100):
+    """Grafikler cizim_sayisi kez yeniden çizildiğinde belleğin sabit kaldığını doğrular.
+
+    Isınmadan sonra ve sonda canlı sanatçı sayısı ile RSS ölçülür. Sızan her figür yüzlerce sanatçı
+    bıraktığından sanatçı artışı sanatci_esigi'ni (eksen işaret sayısındaki oynamalar için pay),
+    RSS artışı da esik_kb'yi geçmemelidir.
+    (başlangıç_kb, bitiş_kb, sanatçı_farkı, geçerli_mi) döndürür.
+    """
+    import pandas as pd
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    grafikler = {tip: grafik_olustur(tip) for tip in GRAFIK_SINIFLARI}
+    tuvaller = {tip: FigureCanvasAgg(grafik.figure) for tip, grafik in grafikler.items()}
+
+    def ornek_veri(tip, i):
+        if tip == raporlar.AYLIK_OZET:
+            aylar = [f"2024-{ay:02d}" for ay in range(1, 7 + i % 2)]
+            return pd.DataFrame({'Gelir': [1000.0 + i] * len(aylar), 'Gider': [500.0 + i] * len(aylar)}, index=aylar)
+        if tip == raporlar.KATEGORI_BAZLI_HARCAMALAR:
+            return ["Market", "Kira", "Ulaşım"], [100.0 + i % 7, 200.0, 50.0]
+        if tip == raporlar.GELIR_GIDER_DENGESI:
+            return 100000 + i % 7, 90000
+        if tip == raporlar.ZAMAN_SERISI:
+            import numpy as np
+
+            x = np.arange(19700.0, 19790.0 + i % 2)
+            return raporlar.ZamanSerisi(x, x % 7 + i, x, x % 5, 2460000, 2460089 + i % 2, len(x))
+        sutunlar = GRAFIK_SINIFLARI[tip].SUTUNLAR or ["Market", "Kira"]
+        tarihler = pd.date_range("2024-01-01", periods=90 + i % 2, freq="D")
+        return pd.DataFrame({sutun: [float(i % 7 + n) for n in range(len(tarihler))] for sutun in sutunlar},
+                            index=tarihler)
+
+    def ciz(i):
+        for tip, grafik in grafikler.items():
+            grafik.guncelle(ornek_veri(tip, i))
+            tuvaller[tip].draw()
+
+    for i in range(isinma):
+        ciz(i)
+    baslangic_sanatci, baslangic_kb = _canli_sanatci_sayisi(), _yerlesik_bellek_kb()
+    for i in range(isinma, cizim_sayisi):
+        ciz(i)
+    bitis_sanatci, bitis_kb = _canli_sanatci_sayisi(), _yerlesik_bellek_kb()
+
+    sanatci_farki = bitis_sanatci - baslangic_sanatci
+    return baslangic_kb, bitis_kb, sanatci_farki, sanatci_farki <= sanatci_esigi and bitis_kb - baslangic_kb <= esik_kb
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    import matplotlib
+    matplotlib.use("Agg")
+
+    parser = argparse.ArgumentParser(description="Rapor grafiklerinin bellek sızıntısı kontrolü")
+    parser.add_argument("--cizim", type=int, default=1000, help="Rapor tipi başına çizim sayısı")
+    parser.add_argument("--esik-kb", type=int, default=20 * 1024, help="İzin verilen RSS artışı (KB)")
+    args = parser.parse_args()
+
+    baslangic_kb, bitis_kb, sanatci_farki, gecti = bellek_kontrolu(args.cizim, esik_kb=args.esik_kb)
+    print(f"{args.cizim} çizim: RSS {baslangic_kb:,} KB -> {bitis_kb:,} KB ({bitis_kb - baslangic_kb:+,} KB), "
+          f"canlı sanatçı farkı {sanatci_farki:+d} - {'GEÇTİ' if gecti else 'BAŞARISIZ'}")
+    sys.exit(0 if gecti else 1)
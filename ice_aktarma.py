@@ -0,0 +1,248 @@
+"""Banka ekstrelerini (CSV/OFX) toplu olarak içe aktarma"""
+import csv
+import os
+import re
+import sqlite3
+import time
+from collections import namedtuple
+from datetime import datetime
+
+from para import kurusa_cevir
+from veritabani import gun_numarasi, parmak_izi
+
+# Varsayılan parça boyutu (executemany başına satır)
+PARCA_BOYUTU = 5000
+
+# Kategorisi belirtilmemiş satırlar için kullanılan kategoriler
+VARSAYILAN_KATEGORILER = {"Gider": "Diğer Giderler", "Gelir": "Diğer Gelirler"}
+
+# CSV başlıkları için kabul edilen eş anlamlılar
+BASLIK_ESLEMELERI = {
+    "tarih": "tarih", "date": "tarih", "işlem tarihi": "tarih", "islem tarihi": "tarih",
+    "miktar": "miktar", "tutar": "miktar", "amount": "miktar",
+    "açıklama": "aciklama", "aciklama": "aciklama", "description": "aciklama",
+    "kategori": "kategori", "category": "kategori",
+    "tip": "tip", "tür": "tip", "tur": "tip", "type": "tip",
+}
+
+TARIH_BICIMLERI = ("%Y-%m-%d", "%d.%m.%Y", "%d/%m/%Y", "%Y%m%d")
+
+OFX_ETIKET = re.compile(r"<(/?)([A-Za-z0-9.]+)>([^<\r\n]*)")
+
+# İçe aktarılmaya hazır satır: miktar her zaman pozitif kuruş, yön 'tip' ile belirtilir
+EkstreSatiri = namedtuple("EkstreSatiri", ["tarih", "miktar", "aciklama", "kategori", "tip"])
+IceAktarmaSonucu = namedtuple("IceAktarmaSonucu", ["satir_sayisi", "sure", "saniyedeki_satir", "yeni_kategoriler",
+                                                   "atlanan_kopyalar"])
+
+
+class IceAktarmaHatasi(Exception):
+    """İçe aktarma sırasında oluşan ve işlemin geri alınmasına yol açan hata"""
+
+
+def tarih_coz(metin):
+    """Farklı banka biçimlerindeki tarihi YYYY-AA-GG biçimine çevirir"""
+    metin = metin.strip()
+    for bicim in TARIH_BICIMLERI:
+        try:
+            return datetime.strptime(metin, bicim).strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+    raise ValueError(f"Tarih anlaşılamadı: {metin!r}")
+
+
+def _tip_belirle(tip, miktar):
+    """Açık tip verilmemişse tutarın işaretinden Gelir/Gider tipini çıkarır"""
+    if tip:
+        tip = tip.strip().capitalize()
+        if tip not in ("Gelir", "Gider"):
+            raise ValueError(f"Geçersiz işlem tipi: {tip!r}")
+        return tip
+    return "Gider" if miktar < 0 else "Gelir"
+
+
+def csv_satirlari(yol, kodlama="utf-8-sig"):
+    """CSV dosyasını satır satır okuyup EkstreSatiri üreten generator"""
+    with open(yol, newline="", encoding=kodlama) as dosya:
+        ornek = dosya.read(4096)
+        dosya.seek(0)
+        try:
+            lehce = csv.Sniffer().sniff(ornek, delimiters=",;\t|")
+        except csv.Error:
+            lehce = csv.excel
+
+        okuyucu = csv.reader(dosya, lehce)
+        basliklar = [BASLIK_ESLEMELERI.get(b.strip().lower(), b.strip().lower()) for b in next(okuyucu, [])]
+        if "tarih" not in basliklar or "miktar" not in basliklar:
+            raise IceAktarmaHatasi("CSV dosyasında 'tarih' ve 'miktar' sütunları bulunmalıdır")
+        sutun = {ad: basliklar.index(ad) for ad in ("tarih", "miktar", "aciklama", "kategori", "tip") if ad in basliklar}
+
+        for satir_no, satir in enumerate(okuyucu, start=2):
+            if not any(alan.strip() for alan in satir):
+                continue
+            try:
+                miktar = kurusa_cevir(satir[sutun["miktar"]])
+                tip = _tip_belirle(satir[sutun["tip"]] if "tip" in sutun else None, miktar)
+                yield EkstreSatiri(
+                    tarih_coz(satir[sutun["tarih"]]),
+                    abs(miktar),
+                    satir[sutun["aciklama"]].strip() if "aciklama" in sutun else "",
+                    satir[sutun["kategori"]].strip() if "kategori" in sutun else "",
+                    tip,
+                )
+            except (ValueError, IndexError) as e:
+                raise IceAktarmaHatasi(f"{satir_no}. satır okunamadı: {e}") from e
+
+
+def ofx_satirlari(yol, kodlama="utf-8"):
+    """OFX/QFX dosyasındaki STMTTRN kayıtlarını EkstreSatiri olarak üreten generator"""
+    with open(yol, encoding=kodlama, errors="replace") as dosya:
+        islem = None
+        for satir in dosya:
+            for kapanis, etiket, deger in OFX_ETIKET.findall(satir):
+                etiket = etiket.upper()
+                if etiket == "STMTTRN":
+                    if not kapanis:
+                        islem = {}
+                        continue
+                    if islem is None:
+                        continue
+                    try:
+                        miktar = kurusa_cevir(islem["TRNAMT"])
+                        aciklama = " ".join(p for p in (islem.get("NAME"), islem.get("MEMO")) if p)
+                        yield EkstreSatiri(tarih_coz(islem["DTPOSTED"][:8]), abs(miktar), aciklama, "",
+                                           _tip_belirle(None, miktar))
+                    except (KeyError, ValueError) as e:
+                        raise IceAktarmaHatasi(f"OFX işlemi okunamadı ({islem.get('FITID', '?')}): {e}") from e
+                    islem = None
+                elif islem is not None and not kapanis:
+                    islem[etiket] = deger.strip()
+
+
+def dosya_satirlari(yol, kodlama=None):
+    """Dosya uzantısına göre uygun okuyucuyu seçer"""
+    uzanti = os.path.splitext(yol)[1].lower()
+    if uzanti in (".ofx", ".qfx"):
+        return ofx_satirlari(yol, kodlama or "utf-8")
+    return csv_satirlari(yol, kodlama or "utf-8-sig")
+
+
+def kategori_haritasi(conn):
+    """(ad, tip) -> id eşlemesini tek sorguda belleğe yükler"""
+    return {(ad, tip): kategori_id for kategori_id, ad, tip in conn.execute("SELECT id, ad, tip FROM kategoriler")}
+
+
+def ice_aktar(conn, satirlar, parca_boyutu=PARCA_BOYUTU, ilerleme=None, harita=None, kopyalari_atla=False):
+    """Satırları tek bir işlem (transaction) içinde parça parça veritabanına yazar.
+
+    ilerleme verilirse her parçadan sonra (satir_sayisi, saniyedeki_satir) ile çağrılır.
+    harita verilirse (ör. deponun kategori kaydından bir kopya) kategoriler yeniden okunmaz;
+    yeni oluşturulan kategoriler bu sözlüğe eklenir.
+    kopyalari_atla verilirse zaten kayıtlı işlemler atlanır: bir parmak izi veritabanında n kez
+    varsa dosyadaki ilk n eşi yazılmaz. Böylece çakışan ekstre dönemleri yeniden aktarılabilir,
+    yeni dönemdeki aynı gün aynı tutarlı gerçek tekrarlar ise korunur. Her satır için en fazla bir
+    indeks araması yapılır.
+    Herhangi bir hata durumunda tüm içe aktarma geri alınır.
+    """
+    if harita is None:
+        harita = kategori_haritasi(conn)
+    yeni_kategoriler = []
+    satir_sayisi = 0
+    atlanan = 0
+    # parmak izi -> veritabanında olup bu aktarmada henüz bir dosya satırıyla eşlenmemiş kayıt sayısı
+    eslenmemis = {}
+    baslangic = time.perf_counter()
+
+    def kategori_id_bul(ad, tip):
+        ad = ad or VARSAYILAN_KATEGORILER[tip]
+        kategori_id = harita.get((ad, tip))
+        if kategori_id is None:
+            kategori_id = conn.execute("INSERT INTO kategoriler (ad, tip) VALUES (?, ?)", (ad, tip)).lastrowid
+            harita[(ad, tip)] = kategori_id
+            yeni_kategoriler.append((ad, tip))
+        return kategori_id
+
+    def parcayi_yaz(parca):
+        conn.executemany("""
+        INSERT INTO islemler (gun, miktar, aciklama, kategori_id, tip, parmak_izi)
+        VALUES (?, ?, ?, ?, ?, ?)
+        """, parca)
+
+    try:
+        if not conn.in_transaction:
+            conn.execute("BEGIN")
+
+        parca = []
+        for satir in satirlar:
+            gun, kategori_id = gun_numarasi(satir.tarih), kategori_id_bul(satir.kategori, satir.tip)
+            iz = parmak_izi(gun, satir.miktar, kategori_id, satir.tip, satir.aciklama)
+            if kopyalari_atla:
+                kalan = eslenmemis.get(iz)
+                if kalan is None:
+                    (kalan,) = conn.execute("SELECT COUNT(*) FROM islemler WHERE parmak_izi = ?", (iz,)).fetchone()
+                eslenmemis[iz] = max(kalan - 1, 0)
+                if kalan:
+                    atlanan += 1
+                    continue
+            parca.append((gun, satir.miktar, satir.aciklama, kategori_id, satir.tip, iz))
+            if len(parca) >= parca_boyutu:
+                parcayi_yaz(parca)
+                satir_sayisi += len(parca)
+                parca = []
+                if ilerleme:
+                    ilerleme(satir_sayisi, satir_sayisi / max(time.perf_counter() - baslangic, 1e-9))
+
+        if parca:
+            parcayi_yaz(parca)
+            satir_sayisi += len(parca)
+
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    sure = time.perf_counter() - baslangic
+    saniyedeki_satir = satir_sayisi / max(sure, 1e-9)
+    if ilerleme:
+        ilerleme(satir_sayisi, saniyedeki_satir)
+    return IceAktarmaSonucu(satir_sayisi, sure, saniyedeki_satir, yeni_kategoriler, atlanan)
+
+
+def dosyadan_ice_aktar(conn, yol, kodlama=None, parca_boyutu=PARCA_BOYUTU, ilerleme=None, harita=None,
+                       kopyalari_atla=True):
+    """CSV veya OFX dosyasını içe aktarır; varsayılan olarak zaten kayıtlı işlemler atlanır"""
+    return ice_aktar(conn, dosya_satirlari(yol, kodlama), parca_boyutu, ilerleme, harita, kopyalari_atla)
+
+
+if __name__ == "__main__":
+    import argparse
+    from veritabani import baglan
+
+    parser = argparse.ArgumentParser(description="Banka ekstrelerini (CSV/OFX) içe aktarır")
+    parser.add_argument("dosyalar", nargs="+", help="İçe aktarılacak CSV/OFX dosyaları")
+    parser.add_argument("--veritabani", default="data/finans.db", help="Veritabanı dosyası")
+    parser.add_argument("--kodlama", default=None, help="Dosya karakter kodlaması (ör. cp1254)")
+    parser.add_argument("--parca", type=int, default=PARCA_BOYUTU, help="executemany başına satır sayısı")
+    parser.add_argument("--kopyalari-ekle", action="store_true",
+                        help="Zaten kayıtlı görünen işlemleri de ekler (varsayılan: atlanır)")
+    args = parser.parse_args()
+
+    def ilerleme_yaz(satir_sayisi, saniyedeki_satir):
+        print(f"\r{satir_sayisi:,} satır ({saniyedeki_satir:,.0f} satır/sn)", end="", flush=True)
+
+    conn = baglan(args.veritabani)
+    try:
+        for yol in args.dosyalar:
+            print(f"{yol} içe aktarılıyor...")
+            try:
+                sonuc = dosyadan_ice_aktar(conn, yol, args.kodlama, args.parca, ilerleme_yaz,
+                                           kopyalari_atla=not args.kopyalari_ekle)
+            except (IceAktarmaHatasi, sqlite3.Error, OSError) as e:
+                print(f"\nHata: {e} - değişiklikler geri alındı")
+                raise SystemExit(1)
+            print(f"\n{sonuc.satir_sayisi:,} satır {sonuc.sure:.2f} sn içinde aktarıldı")
+            if sonuc.atlanan_kopyalar:
+                print(f"  Zaten kayıtlı olduğu için atlanan: {sonuc.atlanan_kopyalar:,} satır")
+            for ad, tip in sonuc.yeni_kategoriler:
+                print(f"  Yeni kategori: {ad} ({tip})")
+    finally:
+        conn.close()
@@ -0,0 +1,115 @@
+"""Kayıtlı işlemler arasında kopyaların ve olası kopyaların taranması
+
+Kesin kopyalar aynı parmak izini (tarih, tutar, kategori, tip, sadeleştirilmiş açıklama) taşır.
+Olası kopyalar aynı tip ve tutarda, tarihleri birbirinden en fazla gun_farki gün uzak işlemlerdir;
+ör. aynı harcamanın elle girilip ekstreden farklı açıklama, kategori ya da valör tarihiyle de gelmesi.
+
+Tarama işlemleri ikişer ikişer karşılaştırmaz: satırlar (miktar, tip, gun) sırasıyla tek geçişte
+okunur ve aynı tutar/tipte, grubun ilk satırından en fazla gun_farki gün sonraki satırlar aynı gruba
+eklenir. Pencere grubun ilk satırından ölçüldüğü için her gün tekrarlanan aynı tutarlı işlemler
+zincirlenip tek dev gruba dönüşmez; bir grup yine de en fazla EN_FAZLA_GRUP işlem tutar. Bellekte
+yalnızca bir okuma parçası ve o an açık olan grup tutulur.
+
+    python kopyalar.py --gun 3
+"""
+from collections import namedtuple
+
+from depo import FinansDeposu, Islem
+from para import tl_metni
+
+# Olası kopya sayılacak en büyük tarih farkı (gün)
+GUN_FARKI = 3
+
+# Bir gruptaki en fazla işlem; dolan grup kapatılır ve sonraki satır yeni grubu başlatır
+EN_FAZLA_GRUP = 50
+
+# fetchmany başına satır sayısı
+PARCA_BOYUTU = 5000
+
+# islemler: tarih sırasıyla Islem listesi; kesin: hepsi aynı parmak izini taşıyor
+KopyaGrubu = namedtuple("KopyaGrubu", ["islemler", "kesin"])
+
+
+class TaramaIptalEdildi(Exception):
+    """Tarama, iptal geri çağrısı True döndürdüğü için yarıda bırakıldı"""
+
+
+def kopya_gruplari(depo, gun_farki=GUN_FARKI, yalnizca_kesin=False, parca_boyutu=PARCA_BOYUTU, iptal=None,
+                   en_fazla_grup=EN_FAZLA_GRUP):
+    """Kopya gruplarını (KopyaGrubu) tutar sırasıyla üretir.
+
+    yalnizca_kesin verilirse her olası kopya grubunun içinden aynı parmak izli işlemler ayrı
+    kesin gruplar olarak döner, diğerleri atlanır. iptal verilirse
+    (ör. threading.Event.is_set) her parçadan önce sorulur; True ise TaramaIptalEdildi oluşur.
+    """
+    grup, izler = [], []
+    ilk = None  # grubun ilk satırının (miktar, tip, gun) değeri
+
+    def grubu_bitir():
+        if len(grup) < 2:
+            return
+        if not yalnizca_kesin:
+            yield KopyaGrubu(sorted(grup, key=_tarih_sirasi), len(set(izler)) == 1)
+            return
+        ayni_izliler = {}
+        for islem, iz in zip(grup, izler):
+            ayni_izliler.setdefault(iz, []).append(islem)
+        for islemler in ayni_izliler.values():
+            if len(islemler) > 1:
+                yield KopyaGrubu(sorted(islemler, key=_tarih_sirasi), True)
+
+    for parca in depo.kopya_adaylari(parca_boyutu):
+        if iptal is not None and iptal():
+            raise TaramaIptalEdildi()
+        for islem_id, tarih, tip, kategori, miktar, aciklama, gun, iz in parca:
+            if (ilk is None or (miktar, tip) != ilk[:2] or gun - ilk[2] > gun_farki
+                    or len(grup) >= en_fazla_grup):
+                yield from grubu_bitir()
+                grup, izler = [], []
+                ilk = (miktar, tip, gun)
+            grup.append(Islem(islem_id, tarih, tip, kategori, miktar, aciklama))
+            izler.append(iz)
+    yield from grubu_bitir()
+
+
+def _tarih_sirasi(islem):
+    return islem.tarih, islem.id
+
+
+def fazlalik_idleri(gruplar):
+    """Kesin kopya gruplarında ilk kaydı bırakıp silinecek diğer işlemlerin id'leri"""
+    return [islem.id for grup in gruplar if grup.kesin for islem in sorted(grup.islemler)[1:]]
+
+
+if __name__ == "__main__":
+    import argparse
+    import sqlite3
+
+    from veritabani import VERITABANI_YOLU, baglan, salt_okunur_baglan
+
+    parser = argparse.ArgumentParser(description="Kayıtlı işlemler arasındaki kopyaları listeler")
+    parser.add_argument("--veritabani", default=VERITABANI_YOLU, help="Veritabanı dosyası")
+    parser.add_argument("--gun", type=int, default=GUN_FARKI, help="Olası kopyalar arasındaki en büyük tarih farkı")
+    parser.add_argument("--kesin", action="store_true", help="Yalnızca kesin (aynı parmak izli) kopyalar")
+    parser.add_argument("--kesinleri-sil", action="store_true",
+                        help="Kesin kopya gruplarında ilk kayıt dışındakileri siler")
+    args = parser.parse_args()
+
+    depo = FinansDeposu(baglan(args.veritabani) if args.kesinleri_sil else salt_okunur_baglan(args.veritabani))
+    try:
+        gruplar = []
+        for grup in kopya_gruplari(depo, args.gun, args.kesin or args.kesinleri_sil):
+            gruplar.append(grup)
+            print(f"{'Kesin kopya' if grup.kesin else 'Olası kopya'} - {tl_metni(grup.islemler[0].miktar)} TL "
+                  f"{grup.islemler[0].tip}")
+            for islem in grup.islemler:
+                print(f"  #{islem.id} {islem.tarih} {islem.kategori or '-'}: {islem.aciklama or ''}")
+        print(f"{len(gruplar):,} grup, {sum(len(grup.islemler) for grup in gruplar):,} işlem")
+        if args.kesinleri_sil:
+            silinen = depo.toplu_sil(fazlalik_idleri(gruplar))
+            print(f"{silinen:,} kopya işlem silindi")
+    except sqlite3.Error as e:
+        print(f"Hata: {e}")
+        raise SystemExit(1)
+    finally:
+        depo.kapat()
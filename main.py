@@ -1,11 +1,28 @@
-import os
+import time
+ACILIS_ZAMANI = time.perf_counter()
+
+import functools
+import queue
 import sqlite3
+import threading
 import tkinter as tk
-from tkinter import ttk, messagebox
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import pandas as pd
+from tkinter import ttk, messagebox, filedialog
 from datetime import datetime
+import kopyalar
+import raporlar
+import tanilama
+import veritabani
+from arka_plan import ArkaPlanYurutucu, IptalEdildi
+from onbellek import LRUOnbellek
+from depo import FinansDeposu, DepoHatasi
+from defter import AgacEsitleyici, DefterPenceresi, agac_degerleri
+from para import kurusa_cevir, tl_metni
+from ice_aktarma import dosyadan_ice_aktar, IceAktarmaHatasi
+from disa_aktarma import disa_aktar, filtre_olustur, DisaAktarmaHatasi
+
+
+# Zaman serisi kaydırılırken aralık değişikliklerinin birleştirildiği süre
+YAKINLASTIRMA_BEKLEMESI_MS = 150
 
 
 class FinansUygulamasi:
@@ -24,10 +41,12 @@ class FinansUygulamasi:
         self.tab_giris = ttk.Frame(self.tab_control)
         self.tab_raporlar = ttk.Frame(self.tab_control)
         self.tab_kategoriler = ttk.Frame(self.tab_control)
+        self.tab_tanilama = ttk.Frame(self.tab_control)
 
         self.tab_control.add(self.tab_giris, text="İşlem Girişi")
         self.tab_control.add(self.tab_raporlar, text="Raporlar")
         self.tab_control.add(self.tab_kategoriler, text="Kategoriler")
+        self.tab_control.add(self.tab_tanilama, text="Tanılama")
         self.tab_control.pack(expand=1, fill="both")
 
         # İşlem Girişi Sekmesi
@@ -39,62 +58,25 @@ class FinansUygulamasi:
         # Kategoriler Sekmesi
         self.kategoriler_olustur()
 
-        # Varsayılan kategorileri ekle
-        self.varsayilan_kategorileri_ekle()
+        # Tanılama Sekmesi
+        self.tanilama_olustur()
 
         # Kategori listelerini güncelle
         self.kategori_listelerini_guncelle()
 
+        self.root.protocol("WM_DELETE_WINDOW", self.kapat)
+
     def veritabani_olustur(self):
-        """Veritabanını oluşturur ve gerekli tabloları ekler"""
-        if not os.path.exists('data'):
-            os.makedirs('data')
-
-        self.conn = sqlite3.connect('data/finans.db')
-        self.cursor = self.conn.cursor()
-
-        # Kategoriler tablosu
-        self.cursor.execute('''
-        CREATE TABLE IF NOT EXISTS kategoriler (
-            id INTEGER PRIMARY KEY,
-            ad TEXT NOT NULL,
-            tip TEXT NOT NULL
-        )
-        ''')
-
-        # İşlemler tablosu
-        self.cursor.execute('''
-        CREATE TABLE IF NOT EXISTS islemler (
-            id INTEGER PRIMARY KEY,
-            tarih TEXT NOT NULL,
-            miktar REAL NOT NULL,
-            aciklama TEXT,
-            kategori_id INTEGER,
-            tip TEXT NOT NULL,
-            FOREIGN KEY (kategori_id) REFERENCES kategoriler (id)
-        )
-        ''')
-
-        self.conn.commit()
-
-    def varsayilan_kategorileri_ekle(self):
-        """Varsayılan kategorileri ekler"""
-        gider_kategorileri = ["Market", "Kira", "Faturalar", "Ulaşım", "Eğlence", "Sağlık", "Diğer Giderler"]
-        gelir_kategorileri = ["Maaş", "Ek Gelir", "Hediye", "Yatırım", "Diğer Gelirler"]
-
-        # Gider kategorileri ekle
-        for kategori in gider_kategorileri:
-            self.cursor.execute("SELECT COUNT(*) FROM kategoriler WHERE ad = ? AND tip = ?", (kategori, "Gider"))
-            if self.cursor.fetchone()[0] == 0:
-                self.cursor.execute("INSERT INTO kategoriler (ad, tip) VALUES (?, ?)", (kategori, "Gider"))
-
-        # Gelir kategorileri ekle
-        for kategori in gelir_kategorileri:
-            self.cursor.execute("SELECT COUNT(*) FROM kategoriler WHERE ad = ? AND tip = ?", (kategori, "Gelir"))
-            if self.cursor.fetchone()[0] == 0:
-                self.cursor.execute("INSERT INTO kategoriler (ad, tip) VALUES (?, ?)", (kategori, "Gelir"))
-
-        self.conn.commit()
+        """Veritabanına bağlanır ve şemayı güncel sürüme yükseltir"""
+        self.baglantilar = veritabani.BaglantiYoneticisi(veritabani.VERITABANI_YOLU)
+        self.depo = FinansDeposu(self.baglantilar.yazici)
+
+    def kapat(self):
+        """Arka plan işlerini durdurur, veritabanını kapatır ve pencereyi kapatır"""
+        self.gecikme_izleyici.durdur()
+        self.rapor_yurutucu.kapat()
+        self.baglantilar.kapat()
+        self.root.destroy()
 
     def islem_girisi_olustur(self):
         """İşlem girişi sekmesini oluşturur"""
@@ -136,6 +118,19 @@ class FinansUygulamasi:
         self.ekle_btn = ttk.Button(frame, text="İşlemi Kaydet", command=self.islem_ekle)
         self.ekle_btn.grid(column=0, row=5, columnspan=2, padx=10, pady=10)
 
+        # Ekstre içe aktarma butonu
+        self.ice_aktar_btn = ttk.Button(frame, text="Ekstre İçe Aktar (CSV/OFX)", command=self.ekstre_ice_aktar)
+        self.ice_aktar_btn.grid(column=0, row=6, columnspan=2, padx=10, pady=5)
+        self.ice_aktarma_durum = ttk.Label(frame, text="")
+        self.ice_aktarma_durum.grid(column=0, row=7, columnspan=2, padx=10, sticky=tk.W)
+
+        # Dışa aktarma butonu
+        self.disa_aktar_btn = ttk.Button(frame, text="Dışa Aktar (CSV/JSONL/XLSX)",
+                                         command=self.disa_aktarma_penceresi)
+        self.disa_aktar_btn.grid(column=0, row=8, columnspan=2, padx=10, pady=5)
+        self.disa_aktarma_durum = ttk.Label(frame, text="")
+        self.disa_aktarma_durum.grid(column=0, row=9, columnspan=2, padx=10, sticky=tk.W)
+
         # Son işlemler listesi
         ttk.Label(frame, text="Son İşlemler:").grid(column=2, row=0, padx=10, pady=10, sticky=tk.W)
 
@@ -164,18 +159,26 @@ class FinansUygulamasi:
         scrollbar = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=self.islemler_tree.yview)
         scrollbar.grid(column=3, row=1, rowspan=5, sticky=tk.NS)
         self.islemler_tree.configure(yscrollcommand=scrollbar.set)
+        self.son_islemler_esitleyici = AgacEsitleyici(
+            self.islemler_tree, lambda: [(islem.id, agac_degerleri(islem)) for islem in self.depo.son_islemler(10)])
 
         # İşlem yönetimi butonları
         islem_btn_frame = ttk.Frame(frame)
         islem_btn_frame.grid(column=2, row=6, padx=10, pady=5)
 
-        self.islem_sil_btn = ttk.Button(islem_btn_frame, text="Seçili İşlemi Sil", command=self.islem_sil)
+        self.islem_sil_btn = ttk.Button(islem_btn_frame, text="Seçilenleri Sil", command=self.islem_sil)
         self.islem_sil_btn.pack(side=tk.LEFT, padx=5)
 
         self.islem_guncelle_btn = ttk.Button(islem_btn_frame, text="Seçili İşlemi Güncelle",
                                              command=self.islem_guncelle_form)
         self.islem_guncelle_btn.pack(side=tk.LEFT, padx=5)
 
+        self.defter_btn = ttk.Button(islem_btn_frame, text="Tüm İşlemler", command=self.defteri_ac)
+        self.defter_btn.pack(side=tk.LEFT, padx=5)
+
+        self.kopya_btn = ttk.Button(islem_btn_frame, text="Kopyaları Bul", command=self.kopya_taramasi_penceresi)
+        self.kopya_btn.pack(side=tk.LEFT, padx=5)
+
         # Son işlemleri yükle
         self.son_islemleri_yukle()
 
@@ -186,18 +189,45 @@ class FinansUygulamasi:
 
         # Rapor tipi seçimi
         ttk.Label(frame, text="Rapor Tipi:").grid(column=0, row=0, padx=10, pady=10, sticky=tk.W)
-        self.rapor_tipi = ttk.Combobox(frame, values=["Aylık Özet", "Kategori Bazlı Harcamalar", "Gelir-Gider Dengesi"],
-                                       state="readonly", width=20)
+        self.rapor_tipi = ttk.Combobox(frame, values=list(raporlar.RAPOR_VERILERI), state="readonly", width=25)
         self.rapor_tipi.grid(column=1, row=0, padx=10, pady=10, sticky=tk.W)
         self.rapor_tipi.current(0)
+        self.rapor_tipi.bind("<<ComboboxSelected>>", lambda event: self.rapor_olustur())
 
         # Rapor oluştur butonu
         self.rapor_btn = ttk.Button(frame, text="Rapor Oluştur", command=self.rapor_olustur)
         self.rapor_btn.grid(column=2, row=0, padx=10, pady=10)
 
+        # İlerleme göstergesi ve iptal butonu (yalnızca rapor hazırlanırken görünür)
+        self.rapor_ilerleme_frame = ttk.Frame(frame)
+        self.rapor_ilerleme_frame.grid(column=3, row=0, padx=10, pady=10, sticky=tk.W)
+        self.rapor_ilerleme = ttk.Progressbar(self.rapor_ilerleme_frame, mode="indeterminate", length=120)
+        self.rapor_ilerleme.pack(side=tk.LEFT)
+        self.rapor_iptal_btn = ttk.Button(self.rapor_ilerleme_frame, text="İptal", command=self.rapor_iptal)
+        self.rapor_iptal_btn.pack(side=tk.LEFT, padx=5)
+        self.rapor_ilerleme_frame.grid_remove()
+
+        # Zaman serisi raporunun tarih aralığı (yalnızca o rapor seçiliyken görünür; boş uç tüm geçmiş demektir)
+        self.rapor_aralik_frame = ttk.Frame(frame)
+        self.rapor_aralik_frame.grid(column=0, row=1, columnspan=4, padx=10, sticky=tk.W)
+        ttk.Label(self.rapor_aralik_frame, text="Başlangıç (YYYY-AA-GG):").pack(side=tk.LEFT)
+        self.rapor_baslangic_var = tk.StringVar()
+        ttk.Entry(self.rapor_aralik_frame, textvariable=self.rapor_baslangic_var, width=12).pack(side=tk.LEFT, padx=5)
+        ttk.Label(self.rapor_aralik_frame, text="Bitiş:").pack(side=tk.LEFT, padx=(10, 0))
+        self.rapor_bitis_var = tk.StringVar()
+        ttk.Entry(self.rapor_aralik_frame, textvariable=self.rapor_bitis_var, width=12).pack(side=tk.LEFT, padx=5)
+        self.rapor_aralik_frame.grid_remove()
+
+        self.rapor_yurutucu = ArkaPlanYurutucu(self.root, self.baglantilar,
+                                               durum_degisti=self.rapor_durumu_degisti)
+
+        # Rapor verileri ve çizilmiş grafikler için önbellek
+        self.rapor_onbellegi = LRUOnbellek(kapasite=32)
+        self.rapor_gorunumleri = {}  # rapor tipi -> kalıcı çerçeve, grafik ve tuval
+
         # Grafik alanı
         self.grafik_frame = ttk.Frame(frame)
-        self.grafik_frame.grid(column=0, row=1, columnspan=3, padx=10, pady=10, sticky=tk.NSEW)
+        self.grafik_frame.grid(column=0, row=2, columnspan=4, padx=10, pady=10, sticky=tk.NSEW)
 
     def kategoriler_olustur(self):
         """Kategoriler sekmesini oluşturur"""
@@ -239,6 +269,8 @@ class FinansUygulamasi:
         scrollbar = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=self.kategoriler_tree.yview)
         scrollbar.grid(column=3, row=1, rowspan=3, sticky=tk.NS)
         self.kategoriler_tree.configure(yscrollcommand=scrollbar.set)
+        self.kategoriler_esitleyici = AgacEsitleyici(
+            self.kategoriler_tree, lambda: [(kategori.id, kategori) for kategori in self.depo.kategoriler()])
 
         # Kategori silme butonu
         self.kategori_sil_btn = ttk.Button(frame, text="Seçili Kategoriyi Sil", command=self.kategori_sil)
@@ -247,6 +279,122 @@ class FinansUygulamasi:
         # Mevcut kategorileri yükle
         self.kategorileri_yukle()
 
+    def tanilama_olustur(self):
+        """Tanılama sekmesini oluşturur: yavaş sorgular, sorgu istatistikleri, gecikme ve rapor süreleri"""
+        frame = ttk.Frame(self.tab_tanilama)
+        frame.pack(fill="both", expand=True, padx=20, pady=10)
+
+        ust = ttk.Frame(frame)
+        ust.pack(fill=tk.X)
+        ttk.Label(ust, text="Yavaş sorgu eşiği (ms):").pack(side=tk.LEFT)
+        self.yavas_esik_var = tk.StringVar(value=f"{tanilama.TANILAMA.yavas_esik_ms:g}")
+        esik_entry = ttk.Spinbox(ust, from_=0, to=10000, increment=10, textvariable=self.yavas_esik_var, width=8,
+                                 command=self.yavas_esik_uygula)
+        esik_entry.pack(side=tk.LEFT, padx=5)
+        esik_entry.bind("<Return>", lambda event: self.yavas_esik_uygula())
+        ttk.Button(ust, text="Temizle", command=self.tanilama_temizle).pack(side=tk.RIGHT, padx=5)
+        ttk.Button(ust, text="Dışa Aktar", command=self.tanilama_disa_aktar).pack(side=tk.RIGHT, padx=5)
+
+        self.gecikme_etiketi = ttk.Label(frame, text="Olay döngüsü gecikmesi: ölçülüyor...")
+        self.gecikme_etiketi.pack(anchor="w", pady=5)
+
+        def tablo(baslik, sutunlar, yukseklik):
+            kutu = ttk.LabelFrame(frame, text=baslik)
+            kutu.pack(fill=tk.BOTH, expand=True, pady=5)
+            agac = ttk.Treeview(kutu, columns=[ad for ad, _, _ in sutunlar], show="headings", height=yukseklik)
+            for ad, metin, genislik in sutunlar:
+                agac.heading(ad, text=metin)
+                agac.column(ad, width=genislik, stretch=ad == "sql", anchor=tk.W if ad == "sql" else tk.E)
+            kaydirma = ttk.Scrollbar(kutu, orient=tk.VERTICAL, command=agac.yview)
+            agac.configure(yscrollcommand=kaydirma.set)
+            agac.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+            kaydirma.pack(side=tk.RIGHT, fill=tk.Y)
+            return agac
+
+        self.yavas_sorgular_tree = tablo("Yavaş Sorgular", [
+            ("zaman", "Zaman", 70), ("sure", "Süre (ms)", 70), ("satir", "Satır", 60), ("sql", "Sorgu", 400)], 5)
+        self.sorgu_istatistikleri_tree = tablo("En Pahalı Sorgular", [
+            ("adet", "Adet", 50), ("toplam", "Toplam (ms)", 80), ("ortalama", "Ortalama (ms)", 80),
+            ("en_fazla", "En Fazla (ms)", 80), ("satir", "Satır", 60), ("sql", "Sorgu", 300)], 5)
+        self.rapor_olcumleri_tree = tablo("Rapor Aşamaları", [
+            ("zaman", "Zaman", 70), ("rapor", "Rapor", 160), ("sorgu", "Sorgu (ms)", 70),
+            ("pandas", "Hazırlama (ms)", 90), ("grafik", "Grafik (ms)", 70), ("cizim", "Çizim (ms)", 70)], 4)
+        self.rapor_olcumleri_tree.column("rapor", anchor=tk.W)
+
+        self.gecikme_izleyici = tanilama.OlayDonguIzleyici(self.root)
+        self.gecikme_izleyici.baslat()
+        # Sekme açıkken saniyede bir yenilenir
+        self._tanilama_zamanlayici = None
+        self.tab_control.bind("<<NotebookTabChanged>>", lambda event: self.tanilama_yenile(), add="+")
+
+    def tanilama_yenile(self):
+        """Tanılama sekmesi görünürse tabloları günceller ve bir saniye sonra yeniden çalışır"""
+        # Satır satır yinelemenin sayımı her satıra maliyet ekler; yalnızca sekme açıkken yapılır
+        tanilama.TANILAMA.satir_sayimi = self.tab_control.select() == str(self.tab_tanilama)
+        if not tanilama.TANILAMA.satir_sayimi:
+            return
+        if self._tanilama_zamanlayici:
+            self.root.after_cancel(self._tanilama_zamanlayici)
+        kayitlar = tanilama.TANILAMA
+
+        ozet = kayitlar.gecikme_ozeti()
+        if ozet:
+            son, en_fazla, p95, adet = ozet
+            self.gecikme_etiketi.config(text=f"Olay döngüsü gecikmesi: son {son:.1f} ms, p95 {p95:.1f} ms, "
+                                             f"en fazla {en_fazla:.1f} ms ({adet} örnek)")
+
+        def doldur(agac, satirlar):
+            agac.delete(*agac.get_children())
+            for satir in satirlar:
+                agac.insert("", tk.END, values=satir)
+
+        def saat(zaman):
+            return datetime.fromtimestamp(zaman).strftime("%H:%M:%S")
+
+        def ms(deger):
+            return "" if deger is None else f"{deger:.2f}"
+
+        doldur(self.yavas_sorgular_tree, [(saat(kayit.zaman), ms(kayit.sure_ms), kayit.satir, kayit.sql)
+                                          for kayit in reversed(list(kayitlar.yavas_sorgular))])
+        doldur(self.sorgu_istatistikleri_tree, [(adet, ms(toplam), ms(ortalama), ms(en_fazla), satir, sql)
+                                                for sql, adet, toplam, ortalama, en_fazla, satir
+                                                in kayitlar.en_pahali_sorgular()])
+        doldur(self.rapor_olcumleri_tree, [
+            (saat(olcum.zaman), olcum.rapor + (" (önbellek)" if olcum.onbellekten else ""), ms(olcum.sorgu_ms),
+             ms(olcum.pandas_ms), ms(olcum.grafik_ms), ms(olcum.cizim_ms))
+            for olcum in reversed(list(kayitlar.rapor_olcumleri))])
+        self._tanilama_zamanlayici = self.root.after(1000, self.tanilama_yenile)
+
+    def yavas_esik_uygula(self):
+        """Yavaş sorgu eşiğini girilen değere ayarlar (sonraki sorgulardan itibaren geçerli)"""
+        try:
+            esik = float(self.yavas_esik_var.get().replace(",", "."))
+            if esik < 0:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Hata", "Eşik sıfır veya pozitif bir sayı olmalıdır.")
+            return
+        tanilama.TANILAMA.yavas_esik_ms = esik
+
+    def tanilama_temizle(self):
+        tanilama.TANILAMA.temizle()
+        self.tanilama_yenile()
+
+    def tanilama_disa_aktar(self):
+        """Tüm tanılama kayıtlarını JSON dosyasına yazar"""
+        yol = filedialog.asksaveasfilename(
+            title="Tanılama Kayıtlarını Dışa Aktar", defaultextension=".json",
+            initialfile=f"tanilama_{datetime.now():%Y%m%d_%H%M%S}.json",
+            filetypes=[("JSON dosyaları", "*.json"), ("Tüm dosyalar", "*.*")])
+        if not yol:
+            return
+        try:
+            tanilama.TANILAMA.disa_aktar(yol)
+        except OSError as e:
+            messagebox.showerror("Hata", f"Dosya yazılamadı: {e}")
+            return
+        messagebox.showinfo("Başarılı", f"Tanılama kayıtları {yol} dosyasına yazıldı.")
+
     def kategori_listelerini_guncelle(self):
         """Kategori listelerini günceller"""
         self.kategori_listesini_guncelle(None)
@@ -257,43 +405,19 @@ class FinansUygulamasi:
         selected_tip = self.islem_tipi.get()
 
         # Seçilen tipe göre kategorileri getir
-        self.cursor.execute("SELECT ad FROM kategoriler WHERE tip = ?", (selected_tip,))
-        kategoriler = [row[0] for row in self.cursor.fetchall()]
+        kategoriler = self.depo.kategori_adlari(selected_tip)
 
         self.kategori_combo['values'] = kategoriler
         if kategoriler:
             self.kategori_combo.current(0)
 
     def kategorileri_yukle(self):
-        """Kategoriler listesini veritabanından yükler"""
-        # Önceki verileri temizle
-        for i in self.kategoriler_tree.get_children():
-            self.kategoriler_tree.delete(i)
-
-        # Kategorileri veritabanından al
-        self.cursor.execute("SELECT id, ad, tip FROM kategoriler ORDER BY tip, ad")
-
-        # Kategorileri listeye ekle
-        for row in self.cursor.fetchall():
-            self.kategoriler_tree.insert("", tk.END, values=row)
+        """Kategoriler listesini bir sonraki boşta yalnızca değişen satırlarıyla günceller"""
+        self.kategoriler_esitleyici.yenile()
 
     def son_islemleri_yukle(self):
-        """Son işlemleri veritabanından yükler"""
-        # Önceki verileri temizle
-        for i in self.islemler_tree.get_children():
-            self.islemler_tree.delete(i)
-
-        # Son 10 işlemi veritabanından al
-        self.cursor.execute("""
-        SELECT islemler.id, islemler.tarih, islemler.tip, kategoriler.ad, islemler.miktar, islemler.aciklama
-        FROM islemler 
-        JOIN kategoriler ON islemler.kategori_id = kategoriler.id 
-        ORDER BY islemler.tarih DESC LIMIT 10
-        """)
-
-        # İşlemleri listeye ekle
-        for row in self.cursor.fetchall():
-            self.islemler_tree.insert("", tk.END, values=row)
+        """Son işlemler listesini bir sonraki boşta yalnızca değişen satırlarıyla günceller"""
+        self.son_islemler_esitleyici.yenile()
 
     def islem_ekle(self):
         """Yeni işlem ekler"""
@@ -303,7 +427,7 @@ class FinansUygulamasi:
                 messagebox.showerror("Hata", "Lütfen tüm zorunlu alanları doldurun")
                 return
 
-            miktar = float(self.miktar_var.get())
+            miktar = kurusa_cevir(self.miktar_var.get())
             if miktar <= 0:
                 messagebox.showerror("Hata", "Miktar pozitif bir sayı olmalıdır")
                 return
@@ -320,17 +444,15 @@ class FinansUygulamasi:
             kategori_adi = self.kategori_var.get()
             aciklama = self.aciklama_var.get()
 
-            # Kategori ID'sini bul
-            self.cursor.execute("SELECT id FROM kategoriler WHERE ad = ? AND tip = ?", (kategori_adi, islem_tipi))
-            kategori_id = self.cursor.fetchone()[0]
+            # Aynı işlem zaten kayıtlıysa (ör. butona iki kez basıldıysa) kaydetmeden önce sor
+            ayni_islemler = self.depo.ayni_islemler(tarih, miktar, aciklama, kategori_adi, islem_tipi)
+            if ayni_islemler and not messagebox.askyesno(
+                    "Olası Kopya", f"Aynı tarih, tutar, kategori ve açıklamayla {len(ayni_islemler)} işlem zaten "
+                                   f"kayıtlı (#{ayni_islemler[0].id}). Yine de kaydedilsin mi?", default=messagebox.NO):
+                return
 
             # İşlemi veritabanına ekle
-            self.cursor.execute("""
-            INSERT INTO islemler (tarih, miktar, aciklama, kategori_id, tip) 
-            VALUES (?, ?, ?, ?, ?)
-            """, (tarih, miktar, aciklama, kategori_id, islem_tipi))
-
-            self.conn.commit()
+            self.depo.islem_ekle(tarih, miktar, aciklama, kategori_adi, islem_tipi)
 
             # Form alanlarını temizle
             self.miktar_var.set("")
@@ -347,6 +469,143 @@ class FinansUygulamasi:
         except Exception as e:
             messagebox.showerror("Hata", f"İşlem kaydedilirken bir hata oluştu: {str(e)}")
 
+    def ekstre_ice_aktar(self):
+        """Banka ekstresini (CSV/OFX) toplu olarak içe aktarır"""
+        yol = filedialog.askopenfilename(
+            parent=self.root, title="Ekstre Dosyası Seç",
+            filetypes=[("Banka ekstresi", "*.csv *.ofx *.qfx"), ("Tüm dosyalar", "*.*")])
+        if not yol:
+            return
+
+        def ilerleme(satir_sayisi, saniyedeki_satir):
+            self.ice_aktarma_durum.config(text=f"{satir_sayisi:,} satır ({saniyedeki_satir:,.0f} satır/sn)")
+            self.root.update_idletasks()
+
+        self.ice_aktar_btn.config(state="disabled")
+        try:
+            sonuc = dosyadan_ice_aktar(self.depo.conn, yol, ilerleme=ilerleme,
+                                       harita=dict(self.depo.kategori_kaydi.kimlikler))
+            self.depo.yazildi("islemler", "kategoriler")
+        except (IceAktarmaHatasi, sqlite3.Error, OSError, UnicodeDecodeError) as e:
+            self.ice_aktarma_durum.config(text="")
+            messagebox.showerror("Hata", f"İçe aktarma başarısız oldu, hiçbir kayıt eklenmedi: {str(e)}")
+            return
+        finally:
+            self.ice_aktar_btn.config(state="normal")
+
+        # Listeleri güncelle
+        self.son_islemleri_yukle()
+        if sonuc.yeni_kategoriler:
+            self.kategori_listelerini_guncelle()
+
+        mesaj = (f"{sonuc.satir_sayisi} işlem {sonuc.sure:.1f} saniyede içe aktarıldı "
+                 f"({sonuc.saniyedeki_satir:,.0f} satır/sn)")
+        if sonuc.atlanan_kopyalar:
+            mesaj += f"\nZaten kayıtlı olduğu için atlanan: {sonuc.atlanan_kopyalar} işlem"
+        messagebox.showinfo("Başarılı", mesaj)
+
+    def disa_aktarma_penceresi(self):
+        """Tarih, tip ve kategori filtrelerini sorup işlemleri dosyaya aktarır"""
+        pencere = tk.Toplevel(self.root)
+        pencere.title("Dışa Aktar")
+        pencere.transient(self.root)
+        pencere.grab_set()
+
+        frame = ttk.Frame(pencere, padding="10")
+        frame.pack(fill="both", expand=True)
+
+        ttk.Label(frame, text="Başlangıç (YYYY-AA-GG):").grid(column=0, row=0, padx=10, pady=5, sticky=tk.W)
+        baslangic_var = tk.StringVar()
+        ttk.Entry(frame, textvariable=baslangic_var, width=15).grid(column=1, row=0, padx=10, pady=5, sticky=tk.W)
+
+        ttk.Label(frame, text="Bitiş (YYYY-AA-GG):").grid(column=0, row=1, padx=10, pady=5, sticky=tk.W)
+        bitis_var = tk.StringVar()
+        ttk.Entry(frame, textvariable=bitis_var, width=15).grid(column=1, row=1, padx=10, pady=5, sticky=tk.W)
+
+        ttk.Label(frame, text="İşlem Tipi:").grid(column=0, row=2, padx=10, pady=5, sticky=tk.W)
+        tip_combo = ttk.Combobox(frame, values=["Tümü", "Gelir", "Gider"], state="readonly", width=15)
+        tip_combo.current(0)
+        tip_combo.grid(column=1, row=2, padx=10, pady=5, sticky=tk.W)
+
+        ttk.Label(frame, text="Kategori:").grid(column=0, row=3, padx=10, pady=5, sticky=tk.W)
+        adlar = sorted({kategori.ad for kategori in self.depo.kategoriler()})
+        kategori_combo = ttk.Combobox(frame, values=["Tümü", *adlar], state="readonly", width=15)
+        kategori_combo.current(0)
+        kategori_combo.grid(column=1, row=3, padx=10, pady=5, sticky=tk.W)
+
+        def aktar():
+            tarihler = []
+            for deger in (baslangic_var.get().strip(), bitis_var.get().strip()):
+                if deger:
+                    try:
+                        datetime.strptime(deger, "%Y-%m-%d")
+                    except ValueError:
+                        messagebox.showerror("Hata", "Tarih formatı YYYY-AA-GG şeklinde olmalıdır", parent=pencere)
+                        return
+                tarihler.append(deger or None)
+            tip = None if tip_combo.get() == "Tümü" else tip_combo.get()
+            kategoriler = None if kategori_combo.get() == "Tümü" else [kategori_combo.get()]
+            try:
+                filtre = filtre_olustur(self.depo, *tarihler, tip, kategoriler)
+            except DisaAktarmaHatasi as e:
+                messagebox.showerror("Hata", str(e), parent=pencere)
+                return
+
+            yol = filedialog.asksaveasfilename(
+                parent=pencere, title="Dışa Aktarılacak Dosya", defaultextension=".csv",
+                filetypes=[("CSV", "*.csv"), ("JSON Lines", "*.jsonl"), ("Excel", "*.xlsx")])
+            if not yol:
+                return
+            pencere.destroy()
+            self.disa_aktarmayi_baslat(yol, filtre)
+
+        buton_frame = ttk.Frame(frame)
+        buton_frame.grid(column=0, row=4, columnspan=2, pady=10)
+        ttk.Button(buton_frame, text="Dışa Aktar", command=aktar).pack(side=tk.LEFT, padx=5)
+        ttk.Button(buton_frame, text="İptal", command=pencere.destroy).pack(side=tk.LEFT, padx=5)
+
+    def disa_aktarmayi_baslat(self, yol, filtre):
+        """Aktarmayı havuzdan ödünç alınan okuma bağlantısıyla ayrı bir iş parçacığında yürütür.
+
+        İlerleme bir kuyruk üzerinden ana iş parçacığına iletilir; arayüz aktarma boyunca kullanılabilir.
+        """
+        olaylar = queue.Queue()
+
+        def calis():
+            try:
+                with self.baglantilar.okuyucu() as conn:
+                    sonuc = disa_aktar(FinansDeposu(conn), yol, filtre=filtre,
+                                       ilerleme=lambda satir, hiz: olaylar.put(("ilerleme", (satir, hiz))))
+                olaylar.put(("bitti", sonuc))
+            except Exception as e:
+                olaylar.put(("hata", e))
+
+        def yokla():
+            if not self.root.winfo_exists():
+                return
+            try:
+                while True:
+                    tur, deger = olaylar.get_nowait()
+                    if tur == "ilerleme":
+                        self.disa_aktarma_durum.config(text=f"{deger[0]:,} satır ({deger[1]:,.0f} satır/sn)")
+                        continue
+                    self.disa_aktar_btn.config(state="normal")
+                    self.disa_aktarma_durum.config(text="")
+                    if tur == "bitti":
+                        messagebox.showinfo("Başarılı", f"{deger.satir_sayisi:,} işlem {deger.sure:.1f} saniyede "
+                                                        f"dışa aktarıldı ({deger.saniyedeki_satir:,.0f} satır/sn)")
+                    else:
+                        messagebox.showerror("Hata", f"Dışa aktarma başarısız oldu: {deger}")
+                    return
+            except queue.Empty:
+                pass
+            self.root.after(100, yokla)
+
+        self.disa_aktar_btn.config(state="disabled")
+        self.disa_aktarma_durum.config(text="Dışa aktarılıyor...")
+        threading.Thread(target=calis, name="disa-aktarma", daemon=True).start()
+        self.root.after(100, yokla)
+
     def kategori_ekle(self):
         """Yeni kategori ekler"""
         try:
@@ -358,16 +617,8 @@ class FinansUygulamasi:
 
             kategori_tipi = self.yeni_kategori_tipi.get()
 
-            # Kategorinin zaten var olup olmadığını kontrol et
-            self.cursor.execute("SELECT COUNT(*) FROM kategoriler WHERE ad = ? AND tip = ?",
-                                (kategori_adi, kategori_tipi))
-            if self.cursor.fetchone()[0] > 0:
-                messagebox.showerror("Hata", "Bu kategori zaten mevcut")
-                return
-
             # Kategoriyi veritabanına ekle
-            self.cursor.execute("INSERT INTO kategoriler (ad, tip) VALUES (?, ?)", (kategori_adi, kategori_tipi))
-            self.conn.commit()
+            self.depo.kategori_ekle(kategori_adi, kategori_tipi)
 
             # Form alanını temizle
             self.yeni_kategori_var.set("")
@@ -377,6 +628,8 @@ class FinansUygulamasi:
 
             messagebox.showinfo("Başarılı", "Kategori başarıyla eklendi")
 
+        except DepoHatasi as e:
+            messagebox.showerror("Hata", str(e))
         except Exception as e:
             messagebox.showerror("Hata", f"Kategori eklenirken bir hata oluştu: {str(e)}")
 
@@ -391,16 +644,14 @@ class FinansUygulamasi:
         kategori_id = self.kategoriler_tree.item(selected_item[0], "values")[0]
 
         # Bu kategoriye bağlı işlem var mı kontrol et
-        self.cursor.execute("SELECT COUNT(*) FROM islemler WHERE kategori_id = ?", (kategori_id,))
-        if self.cursor.fetchone()[0] > 0:
+        if self.depo.kategori_kullanim_sayisi(kategori_id) > 0:
             messagebox.showerror("Hata", "Bu kategoriye bağlı işlemler var. Önce bu işlemleri silmeniz gerekiyor.")
             return
 
         # Kullanıcıya onay sor
         if messagebox.askyesno("Onay", "Bu kategoriyi silmek istediğinizden emin misiniz?"):
             try:
-                self.cursor.execute("DELETE FROM kategoriler WHERE id = ?", (kategori_id,))
-                self.conn.commit()
+                self.depo.kategori_sil(kategori_id)
 
                 # Kategori listelerini güncelle
                 self.kategori_listelerini_guncelle()
@@ -411,25 +662,26 @@ class FinansUygulamasi:
                 messagebox.showerror("Hata", f"Kategori silinirken bir hata oluştu: {str(e)}")
 
     def islem_sil(self):
-        """Seçili işlemi siler"""
-        # Seçili işlemi al
-        selected_item = self.islemler_tree.selection()
-        if not selected_item:
+        """Seçili işlemleri tek işlemde (transaction) siler"""
+        # Seçili işlemleri al
+        selected_items = self.islemler_tree.selection()
+        if not selected_items:
             messagebox.showerror("Hata", "Lütfen silmek için bir işlem seçin")
             return
 
-        islem_id = self.islemler_tree.item(selected_item[0], "values")[0]
+        islem_idleri = [self.islemler_tree.item(item, "values")[0] for item in selected_items]
 
         # Kullanıcıya onay sor
-        if messagebox.askyesno("Onay", "Bu işlemi silmek istediğinizden emin misiniz?"):
+        soru = ("Bu işlemi silmek istediğinizden emin misiniz?" if len(islem_idleri) == 1
+                else f"Seçili {len(islem_idleri)} işlemi silmek istediğinizden emin misiniz?")
+        if messagebox.askyesno("Onay", soru):
             try:
-                self.cursor.execute("DELETE FROM islemler WHERE id = ?", (islem_id,))
-                self.conn.commit()
+                silinen = self.depo.toplu_sil(islem_idleri)
 
                 # İşlemler listesini güncelle
                 self.son_islemleri_yukle()
 
-                messagebox.showinfo("Başarılı", "İşlem başarıyla silindi")
+                messagebox.showinfo("Başarılı", "İşlem başarıyla silindi" if silinen == 1 else f"{silinen} işlem silindi")
 
             except Exception as e:
                 messagebox.showerror("Hata", f"İşlem silinirken bir hata oluştu: {str(e)}")
@@ -443,17 +695,126 @@ class FinansUygulamasi:
             return
 
         islem_values = self.islemler_tree.item(selected_item[0], "values")
-        islem_id = islem_values[0]
+        self.islem_guncelle_penceresi(islem_values[0])
+
+    def defteri_ac(self):
+        """Tüm işlem geçmişini gösteren defter penceresini açar"""
+        DefterPenceresi(self.root, self.depo, duzenle=self.islem_guncelle_penceresi,
+                        degisti=self.son_islemleri_yukle)
 
+    def kopya_taramasi_penceresi(self):
+        """Kopya ve olası kopya işlemleri gruplar halinde listeler; seçilenler silinebilir.
+
+        Tarama arka planda, havuzdan ödünç alınan okuma bağlantısıyla yapılır.
+        """
+        pencere = tk.Toplevel(self.root)
+        pencere.title("Kopya İşlemler")
+        pencere.geometry("760x460")
+
+        frame = ttk.Frame(pencere, padding="10")
+        frame.pack(fill="both", expand=True)
+
+        ust = ttk.Frame(frame)
+        ust.pack(fill=tk.X)
+        ttk.Label(ust, text="En fazla gün farkı:").pack(side=tk.LEFT)
+        gun_var = tk.IntVar(value=kopyalar.GUN_FARKI)
+        ttk.Spinbox(ust, from_=0, to=31, textvariable=gun_var, width=4).pack(side=tk.LEFT, padx=5)
+        kesin_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(ust, text="Yalnızca kesin kopyalar", variable=kesin_var).pack(side=tk.LEFT, padx=10)
+        tara_btn = ttk.Button(ust, text="Tara")
+        tara_btn.pack(side=tk.LEFT, padx=5)
+        durum = ttk.Label(ust, text="")
+        durum.pack(side=tk.LEFT, padx=10)
+
+        # Gruplar üst düğüm, grubun işlemleri alt düğüm olarak gösterilir
+        sutunlar = ("id", "tarih", "tip", "kategori", "miktar", "aciklama")
+        agac = ttk.Treeview(frame, columns=sutunlar, show="tree headings", selectmode="extended")
+        agac.column("#0", width=130)
+        for sutun, baslik, genislik in zip(sutunlar, ("ID", "Tarih", "Tip", "Kategori", "Miktar (TL)", "Açıklama"),
+                                           (50, 80, 60, 110, 90, 200)):
+            agac.heading(sutun, text=baslik)
+            agac.column(sutun, width=genislik)
+        kaydirma = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=agac.yview)
+        agac.configure(yscrollcommand=kaydirma.set)
+
+        alt = ttk.Frame(frame)
+        alt.pack(side=tk.BOTTOM, fill=tk.X, pady=(10, 0))
+        kaydirma.pack(side=tk.RIGHT, fill=tk.Y, pady=(10, 0))
+        agac.pack(fill=tk.BOTH, expand=True, pady=(10, 0))
+
+        yurutucu = ArkaPlanYurutucu(pencere, self.baglantilar)
+
+        def tara():
+            try:
+                gun_farki = max(gun_var.get(), 0)
+            except tk.TclError:
+                messagebox.showerror("Hata", "Gün farkı bir tam sayı olmalıdır", parent=pencere)
+                return
+            yalnizca_kesin = kesin_var.get()
+
+            def hazirla(depo, iptal):
+                try:
+                    return list(kopyalar.kopya_gruplari(depo, gun_farki, yalnizca_kesin, iptal=iptal.is_set))
+                except kopyalar.TaramaIptalEdildi:
+                    raise IptalEdildi() from None
+
+            def tamamlandi(gruplar):
+                agac.delete(*agac.get_children())
+                # Kesin kopyalar önce, her tür kendi içinde yeniden eskiye
+                gruplar.sort(key=lambda grup: grup.islemler[-1].tarih, reverse=True)
+                gruplar.sort(key=lambda grup: not grup.kesin)
+                for sira, grup in enumerate(gruplar):
+                    ust_dugum = agac.insert("", tk.END, iid=f"grup-{sira}", open=True,
+                                            text=f"{'Kesin' if grup.kesin else 'Olası'} ({len(grup.islemler)})")
+                    for islem in grup.islemler:
+                        agac.insert(ust_dugum, tk.END, iid=f"{sira}-{islem.id}", values=agac_degerleri(islem))
+                durum.config(text=f"{len(gruplar)} grup, {sum(len(grup.islemler) for grup in gruplar)} işlem")
+
+            def hata(e):
+                durum.config(text="")
+                messagebox.showerror("Hata", f"Kopya taraması başarısız oldu: {e}", parent=pencere)
+
+            durum.config(text="Taranıyor...")
+            yurutucu.calistir(("kopya", gun_farki, yalnizca_kesin, self.depo.veri_surumu(("islemler",))),
+                              hazirla, tamamlandi, hata)
+
+        def sil():
+            islem_idleri = [agac.item(dugum, "values")[0] for dugum in agac.selection() if agac.parent(dugum)]
+            if not islem_idleri:
+                messagebox.showerror("Hata", "Lütfen silmek için grupların içinden işlem seçin", parent=pencere)
+                return
+            if not messagebox.askyesno("Onay", f"Seçili {len(islem_idleri)} işlem silinsin mi?", parent=pencere):
+                return
+            try:
+                silinen = self.depo.toplu_sil(islem_idleri)
+            except Exception as e:
+                messagebox.showerror("Hata", f"İşlemler silinirken bir hata oluştu: {str(e)}", parent=pencere)
+                return
+            self.son_islemleri_yukle()
+            durum.config(text=f"{silinen} işlem silindi")
+            tara()
+
+        def kesinlerin_fazlasini_sec():
+            # Her kesin grubun ilk (en eski) kaydı kalır, diğerleri seçilir
+            secim = [cocuk for dugum in agac.get_children() if agac.item(dugum, "text").startswith("Kesin")
+                     for cocuk in agac.get_children(dugum)[1:]]
+            agac.selection_set(secim)
+
+        def kapat():
+            yurutucu.kapat()
+            pencere.destroy()
+
+        tara_btn.config(command=tara)
+        ttk.Button(alt, text="Kesin Kopyaların Fazlasını Seç", command=kesinlerin_fazlasini_sec).pack(side=tk.LEFT)
+        ttk.Button(alt, text="Seçilenleri Sil", command=sil).pack(side=tk.LEFT, padx=5)
+        ttk.Button(alt, text="Kapat", command=kapat).pack(side=tk.RIGHT)
+        pencere.protocol("WM_DELETE_WINDOW", kapat)
+        tara()
+
+    def islem_guncelle_penceresi(self, islem_id, guncellendi=None):
+        """Verilen işlemi güncellemek için form açar; kayıttan sonra guncellendi çağrılır"""
         # İşlem detaylarını veritabanından al
-        self.cursor.execute("""
-        SELECT islemler.tarih, islemler.miktar, islemler.aciklama, islemler.tip, kategoriler.ad
-        FROM islemler 
-        JOIN kategoriler ON islemler.kategori_id = kategoriler.id 
-        WHERE islemler.id = ?
-        """, (islem_id,))
-
-        islem = self.cursor.fetchone()
+        islem = self.depo.islem_getir(islem_id)
         if not islem:
             messagebox.showerror("Hata", "İşlem bulunamadı")
             return
@@ -476,29 +837,28 @@ class FinansUygulamasi:
 
         # İşlem tipi
         ttk.Label(frame, text="İşlem Tipi:").grid(column=0, row=1, padx=10, pady=5, sticky=tk.W)
-        tip_var = tk.StringVar(value=islem[3])
+        tip_var = tk.StringVar(value=islem.tip)
         tip_combo = ttk.Combobox(frame, textvariable=tip_var, values=["Gelir", "Gider"], state="readonly", width=15)
         tip_combo.grid(column=1, row=1, padx=10, pady=5, sticky=tk.W)
 
         # Miktar
         ttk.Label(frame, text="Miktar (TL):").grid(column=0, row=2, padx=10, pady=5, sticky=tk.W)
-        miktar_var = tk.StringVar(value=islem[1])
+        miktar_var = tk.StringVar(value=tl_metni(islem.miktar))
         miktar_entry = ttk.Entry(frame, textvariable=miktar_var, width=15)
         miktar_entry.grid(column=1, row=2, padx=10, pady=5, sticky=tk.W)
 
         # Tarih
         ttk.Label(frame, text="Tarih:").grid(column=0, row=3, padx=10, pady=5, sticky=tk.W)
-        tarih_var = tk.StringVar(value=islem[0])
+        tarih_var = tk.StringVar(value=islem.tarih)
         tarih_entry = ttk.Entry(frame, textvariable=tarih_var, width=15)
         tarih_entry.grid(column=1, row=3, padx=10, pady=5, sticky=tk.W)
 
         # Kategori
         ttk.Label(frame, text="Kategori:").grid(column=0, row=4, padx=10, pady=5, sticky=tk.W)
-        kategori_var = tk.StringVar(value=islem[4])
+        kategori_var = tk.StringVar(value=islem.kategori)
 
         # İşlem tipine göre kategorileri getir
-        self.cursor.execute("SELECT ad FROM kategoriler WHERE tip = ?", (islem[3],))
-        kategoriler = [row[0] for row in self.cursor.fetchall()]
+        kategoriler = self.depo.kategori_adlari(islem.tip)
 
         kategori_combo = ttk.Combobox(frame, textvariable=kategori_var, values=kategoriler, state="readonly", width=15)
         kategori_combo.grid(column=1, row=4, padx=10, pady=5, sticky=tk.W)
@@ -507,8 +867,7 @@ class FinansUygulamasi:
         def tip_degistiginde(event=None):
             kategori_combo['values'] = []
             selected_tip = tip_var.get()
-            self.cursor.execute("SELECT ad FROM kategoriler WHERE tip = ?", (selected_tip,))
-            kategoriler = [row[0] for row in self.cursor.fetchall()]
+            kategoriler = self.depo.kategori_adlari(selected_tip)
             kategori_combo['values'] = kategoriler
             if kategoriler:
                 kategori_combo.current(0)
@@ -517,14 +876,14 @@ class FinansUygulamasi:
 
         # Açıklama
         ttk.Label(frame, text="Açıklama:").grid(column=0, row=5, padx=10, pady=5, sticky=tk.W)
-        aciklama_var = tk.StringVar(value=islem[2] if islem[2] else "")
+        aciklama_var = tk.StringVar(value=islem.aciklama if islem.aciklama else "")
         aciklama_entry = ttk.Entry(frame, textvariable=aciklama_var, width=30)
         aciklama_entry.grid(column=1, row=5, padx=10, pady=5, sticky=tk.W)
 
         # Güncelleme fonksiyonu
         def guncelle_kaydet():
             try:
-                miktar = float(miktar_var.get())
+                miktar = kurusa_cevir(miktar_var.get())
                 if miktar <= 0:
                     messagebox.showerror("Hata", "Miktar pozitif bir sayı olmalıdır")
                     return
@@ -540,21 +899,13 @@ class FinansUygulamasi:
                 yeni_kategori = kategori_var.get()
                 yeni_aciklama = aciklama_var.get()
 
-                # Kategori ID'sini bul
-                self.cursor.execute("SELECT id FROM kategoriler WHERE ad = ? AND tip = ?", (yeni_kategori, yeni_tip))
-                kategori_id = self.cursor.fetchone()[0]
-
                 # İşlemi güncelle
-                self.cursor.execute("""
-                UPDATE islemler 
-                SET tarih = ?, miktar = ?, aciklama = ?, kategori_id = ?, tip = ?
-                WHERE id = ?
-                """, (tarih, miktar, yeni_aciklama, kategori_id, yeni_tip, islem_id))
-
-                self.conn.commit()
+                self.depo.islem_guncelle(islem_id, tarih, miktar, yeni_aciklama, yeni_kategori, yeni_tip)
 
                 # İşlemler listesini güncelle
                 self.son_islemleri_yukle()
+                if guncellendi:
+                    guncellendi()
 
                 messagebox.showinfo("Başarılı", "İşlem başarıyla güncellendi")
                 guncelleme_penceresi.destroy()
@@ -575,130 +926,219 @@ class FinansUygulamasi:
         iptal_btn.pack(side=tk.LEFT, padx=5)
 
     def rapor_olustur(self):
-        """Seçilen rapor tipine göre grafik oluşturur"""
-        # Grafik alanını temizle
-        for widget in self.grafik_frame.winfo_children():
-            widget.destroy()
+        """Seçilen raporun verisini arka planda hazırlar; hazır olunca grafiği çizer.
 
+        Veri değişmediyse sonuç önbellekten gelir ve sorgu hiç çalıştırılmaz.
+        """
         rapor_tipi = self.rapor_tipi.get()
-
-        if rapor_tipi == "Aylık Özet":
-            self.aylik_ozet_raporu()
-        elif rapor_tipi == "Kategori Bazlı Harcamalar":
-            self.kategori_bazli_harcamalar_raporu()
-        elif rapor_tipi == "Gelir-Gider Dengesi":
-            self.gelir_gider_dengesi_raporu()
-
-    def aylik_ozet_raporu(self):
-        """Aylık özet raporu oluşturur"""
-        # Verileri al (son 6 ay)
-        self.cursor.execute("""
-        SELECT strftime('%Y-%m', tarih) as ay, tip, SUM(miktar) as toplam
-        FROM islemler
-        WHERE tarih >= date('now', '-6 months')
-        GROUP BY ay, tip
-        ORDER BY ay
-        """)
-
-        sonuclar = self.cursor.fetchall()
-
-        if not sonuclar:
-            messagebox.showinfo("Bilgi", "Rapor için yeterli veri bulunamadı.")
+        veri_hazirla = raporlar.RAPOR_VERILERI[rapor_tipi]
+
+        # Göreli tarih aralıklı raporlar gün değişince de yeniden hesaplanmalı
+        parametreler = (datetime.now().strftime("%Y-%m-%d"),)
+        if rapor_tipi == raporlar.ZAMAN_SERISI:
+            self.rapor_aralik_frame.grid()
+            parametreler = []
+            for deger in (self.rapor_baslangic_var.get().strip(), self.rapor_bitis_var.get().strip()):
+                if deger:
+                    try:
+                        datetime.strptime(deger, "%Y-%m-%d")
+                    except ValueError:
+                        messagebox.showerror("Hata", "Tarih formatı YYYY-AA-GG şeklinde olmalıdır")
+                        return
+                parametreler.append(deger or None)
+            parametreler = tuple(parametreler)
+            veri_hazirla = functools.partial(raporlar.zaman_serisi_verisi, baslangic=parametreler[0],
+                                             bitis=parametreler[1])
+        else:
+            self.rapor_aralik_frame.grid_remove()
+
+        anahtar = (rapor_tipi, parametreler, self.depo.veri_surumu(raporlar.RAPOR_TABLOLARI[rapor_tipi]))
+
+        bulundu, veri = self.rapor_onbellegi.al(anahtar)
+        if bulundu:
+            self.rapor_yurutucu.iptal()
+            self.raporu_ciz(rapor_tipi, anahtar, veri, tanilama.TANILAMA.rapor_olcumu(rapor_tipi, onbellekten=True))
             return
 
-        # Verileri pandas dataframe'e çevir
-        df = pd.DataFrame(sonuclar, columns=['ay', 'tip', 'toplam'])
-        pivot_df = df.pivot(index='ay', columns='tip', values='toplam').fillna(0)
-
-        # Grafik oluştur
-        fig, ax = plt.subplots(figsize=(8, 4))
-        pivot_df.plot(kind='bar', ax=ax)
-        ax.set_title('Aylık Gelir-Gider Özeti')
-        ax.set_xlabel('Ay')
-        ax.set_ylabel('Miktar (TL)')
-        plt.tight_layout()
-
-        # Grafik widget'ını oluştur
-        canvas = FigureCanvasTkAgg(fig, master=self.grafik_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-
-    def kategori_bazli_harcamalar_raporu(self):
-        """Kategori bazlı harcamalar raporu oluşturur"""
-        # Verileri al
-        self.cursor.execute("""
-        SELECT k.ad, SUM(i.miktar) as toplam
-        FROM islemler i
-        JOIN kategoriler k ON i.kategori_id = k.id
-        WHERE i.tip = 'Gider' AND i.tarih >= date('now', '-30 days')
-        GROUP BY k.ad
-        ORDER BY toplam DESC
-        """)
-
-        sonuclar = self.cursor.fetchall()
-
-        if not sonuclar:
+        def hazirla(depo, iptal):
+            # SQL'de geçen süre kancadan alınır; kalanı pandas/Python hazırlığıdır
+            baslangic = time.perf_counter()
+            with tanilama.TANILAMA.sql_suresi() as sql:
+                veri = veri_hazirla(depo)
+            return veri, sql.ms, (time.perf_counter() - baslangic) * 1000 - sql.ms
+
+        def tamamlandi(sonuc):
+            veri, sorgu_ms, pandas_ms = sonuc
+            olcum = tanilama.TANILAMA.rapor_olcumu(rapor_tipi)
+            olcum.sorgu_ms, olcum.pandas_ms = round(sorgu_ms, 2), round(pandas_ms, 2)
+            # Aynı raporun eski sürümlü girdilerini at
+            self.rapor_onbellegi.gecersiz_kil(lambda k: k[0] == rapor_tipi and k != anahtar)
+            self.rapor_onbellegi.koy(anahtar, veri)
+            self.raporu_ciz(rapor_tipi, anahtar, veri, olcum)
+
+        # Aynı rapor zaten hazırlanıyorsa tekrar tıklamalar yok sayılır
+        self.rapor_yurutucu.calistir(anahtar, hazirla, tamamlandi, self.rapor_hatasi)
+
+    def rapor_iptal(self):
+        """Hazırlanmakta olan raporu iptal eder"""
+        self.rapor_yurutucu.iptal()
+
+    def rapor_durumu_degisti(self, calisiyor):
+        """Arka plan işi başlayınca/bitince ilerleme göstergesini açar/kapatır"""
+        if calisiyor:
+            self.rapor_ilerleme_frame.grid()
+            self.rapor_ilerleme.start(10)
+        else:
+            self.rapor_ilerleme.stop()
+            self.rapor_ilerleme_frame.grid_remove()
+
+    def rapor_hatasi(self, hata):
+        messagebox.showerror("Hata", f"Rapor oluşturulurken bir hata oluştu: {str(hata)}")
+
+    def raporu_ciz(self, rapor_tipi, anahtar, veri, olcum=None):
+        """Hazırlanan rapor verisini o rapor tipinin kalıcı grafiğine çizer.
+
+        Her rapor tipinin tek bir Figure/tuvali vardır; yeni veri geldiğinde sanatçılar yerinde
+        güncellenir ve tuval draw_idle ile yeniden çizilir. Aynı anahtarla çizilmişse yalnızca gösterilir.
+        olcum (tanilama.RaporOlcumu) verilirse grafik güncelleme ve çizim süreleri ona yazılır.
+        """
+        if veri is None:
             messagebox.showinfo("Bilgi", "Rapor için yeterli veri bulunamadı.")
             return
 
-        # Verileri ayır
-        kategoriler = [row[0] for row in sonuclar]
-        miktarlar = [row[1] for row in sonuclar]
-
-        # Grafik oluştur
-        fig, ax = plt.subplots(figsize=(8, 4))
-        ax.pie(miktarlar, labels=kategoriler, autopct='%1.1f%%', startangle=90)
-        ax.axis('equal')  # Dairenin daire olarak görünmesini sağlar
-        ax.set_title('Kategori Bazlı Harcamalar (Son 30 Gün)')
-        plt.tight_layout()
+        gorunum = self.rapor_gorunumleri.get(rapor_tipi)
+        if gorunum is None:
+            gorunum = self.rapor_gorunumu_olustur(rapor_tipi)
+
+        if gorunum["anahtar"] != anahtar:
+            baslangic = time.perf_counter()
+            gorunum["grafik"].guncelle(veri)
+            if rapor_tipi == raporlar.GELIR_GIDER_DENGESI:
+                self.gelir_gider_etiketlerini_guncelle(*veri)
+            if olcum is not None:
+                olcum.grafik_ms = round((time.perf_counter() - baslangic) * 1000, 2)
+                gorunum["olcum"] = olcum
+            gorunum["tuval"].draw_idle()
+            gorunum["anahtar"] = anahtar
+
+        # Diğer raporların grafiklerini gizle
+        for tip, diger in self.rapor_gorunumleri.items():
+            if tip != rapor_tipi:
+                diger["cerceve"].pack_forget()
+        gorunum["cerceve"].pack(fill=tk.BOTH, expand=True)
+
+    def rapor_gorunumu_olustur(self, rapor_tipi):
+        """Rapor tipi için ilk kullanımda çerçeve, figür ve Tk tuvalini oluşturur"""
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from grafikler import grafik_olustur
+
+        cerceve = ttk.Frame(self.grafik_frame)
+
+        if rapor_tipi == raporlar.GELIR_GIDER_DENGESI:
+            # Bilgi etiketi
+            bilgi_frame = ttk.Frame(cerceve)
+            bilgi_frame.pack(pady=10)
+
+            self.gelir_etiketi = ttk.Label(bilgi_frame, font=("Arial", 12, "bold"))
+            self.gelir_etiketi.pack(anchor="w")
+            self.gider_etiketi = ttk.Label(bilgi_frame, font=("Arial", 12, "bold"))
+            self.gider_etiketi.pack(anchor="w")
+            self.denge_etiketi = ttk.Label(bilgi_frame, font=("Arial", 14, "bold"))
+            self.denge_etiketi.pack(anchor="w", pady=5)
 
         # Grafik widget'ını oluştur
-        canvas = FigureCanvasTkAgg(fig, master=self.grafik_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-
-    def gelir_gider_dengesi_raporu(self):
-        """Gelir-gider dengesi raporu oluşturur"""
-        # Verileri al (toplam gelir ve gider)
-        self.cursor.execute("""
-        SELECT tip, SUM(miktar) as toplam
-        FROM islemler
-        GROUP BY tip
-        """)
-
-        sonuclar = dict(self.cursor.fetchall())
-
-        if not sonuclar or 'Gelir' not in sonuclar or 'Gider' not in sonuclar:
-            messagebox.showinfo("Bilgi", "Rapor için yeterli veri bulunamadı.")
-            return
+        grafik = grafik_olustur(rapor_tipi)
+        tuval = FigureCanvasTkAgg(grafik.figure, master=cerceve)
+        if rapor_tipi == raporlar.ZAMAN_SERISI:
+            # Yakınlaştırma/kaydırma araç çubuğu; görünür aralık değişince daha ayrıntılı veri sorgulanır
+            from matplotlib.backends.backend_tkagg import NavigationToolbar2Tk
+
+            arac_cubugu = NavigationToolbar2Tk(tuval, cerceve, pack_toolbar=False)
+            arac_cubugu.update()
+            arac_cubugu.pack(side=tk.BOTTOM, fill=tk.X)
+            grafik.aralik_degisti = self.zaman_serisi_araligi_degisti
+        tuval.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+
+        gorunum = {"cerceve": cerceve, "grafik": grafik, "tuval": tuval, "anahtar": None, "olcum": None,
+                   "yakinlastirma": None}
+
+        # draw_idle'ın boşta çalıştırdığı asıl çizimin süresi bekleyen rapor ölçümüne yazılır
+        ciz = tuval.draw
+
+        def zamanli_ciz():
+            baslangic = time.perf_counter()
+            ciz()
+            if gorunum["olcum"] is not None:
+                gorunum["olcum"].cizim_ms = round((time.perf_counter() - baslangic) * 1000, 2)
+                gorunum["olcum"] = None
+        tuval.draw = zamanli_ciz
+
+        self.rapor_gorunumleri[rapor_tipi] = gorunum
+        return gorunum
+
+    def zaman_serisi_araligi_degisti(self, ilk_gun, son_gun, nokta_sayisi):
+        """Zaman serisi yakınlaştırılıp kaydırıldığında görünür aralığı yeniden sorgulamayı zamanlar.
+
+        Kaydırma her fare hareketinde aralığı değiştirir; sorgu son değişiklikten
+        YAKINLASTIRMA_BEKLEMESI_MS sonra, yalnızca bir kez gönderilir.
+        """
+        gorunum = self.rapor_gorunumleri[raporlar.ZAMAN_SERISI]
+        if gorunum["yakinlastirma"] is not None:
+            self.root.after_cancel(gorunum["yakinlastirma"])
+        gorunum["yakinlastirma"] = self.root.after(YAKINLASTIRMA_BEKLEMESI_MS, self.zaman_serisini_yakinlastir,
+                                                   ilk_gun, son_gun, nokta_sayisi)
+
+    def zaman_serisini_yakinlastir(self, ilk_gun, son_gun, nokta_sayisi):
+        """Görünür aralığın daha ayrıntılı serisini arka planda hazırlayıp mevcut grafiğe çizer"""
+        gorunum = self.rapor_gorunumleri[raporlar.ZAMAN_SERISI]
+        gorunum["yakinlastirma"] = None
+        rapor_anahtari = gorunum["anahtar"]
+        anahtar = (raporlar.ZAMAN_SERISI, "yakinlastirma", ilk_gun, son_gun, nokta_sayisi, rapor_anahtari)
+
+        def hazirla(depo, iptal):
+            return raporlar.zaman_serisi_verisi(depo, ilk_gun, son_gun, nokta_sayisi=nokta_sayisi)
+
+        def tamamlandi(veri):
+            # Bu arada başka bir rapor çizildiyse sonuç eskidir
+            if veri is None or gorunum["anahtar"] != rapor_anahtari:
+                return
+            gorunum["grafik"].yakinlastirmayi_guncelle(veri)
+            gorunum["tuval"].draw_idle()
 
-        gelir = sonuclar.get('Gelir', 0)
-        gider = sonuclar.get('Gider', 0)
-        denge = gelir - gider
+        self.rapor_yurutucu.calistir(anahtar, hazirla, tamamlandi, self.rapor_hatasi)
 
-        # Bilgi etiketi
-        bilgi_frame = ttk.Frame(self.grafik_frame)
-        bilgi_frame.pack(pady=10)
+    def gelir_gider_etiketlerini_guncelle(self, gelir, gider):
+        """Gelir-gider dengesi raporunun özet etiketlerini günceller"""
+        denge = gelir - gider
+        self.gelir_etiketi.config(text=f"Toplam Gelir: {tl_metni(gelir)} TL")
+        self.gider_etiketi.config(text=f"Toplam Gider: {tl_metni(gider)} TL")
+        self.denge_etiketi.config(text=f"Denge: {tl_metni(denge)} TL", foreground="green" if denge >= 0 else "red")
 
-        ttk.Label(bilgi_frame, text=f"Toplam Gelir: {gelir:.2f} TL", font=("Arial", 12, "bold")).pack(anchor="w")
-        ttk.Label(bilgi_frame, text=f"Toplam Gider: {gider:.2f} TL", font=("Arial", 12, "bold")).pack(anchor="w")
-        ttk.Label(bilgi_frame, text=f"Denge: {denge:.2f} TL", font=("Arial", 14, "bold"),
-                  foreground="green" if denge >= 0 else "red").pack(anchor="w", pady=5)
 
-        # Grafik oluştur
-        fig, ax = plt.subplots(figsize=(8, 4))
-        ax.bar(['Gelir', 'Gider'], [gelir, gider], color=['green', 'red'])
-        ax.set_title('Toplam Gelir-Gider Dengesi')
-        ax.set_ylabel('Miktar (TL)')
+def acilis_suresini_olc(root):
+    """İlk pencere çizilene kadar geçen süreyi aşamalarıyla yazdırır"""
+    arayuz_hazir = time.perf_counter()
+    root.update()  # İlk pencerenin eşlenip çizilmesini bekle
+    pencere_hazir = time.perf_counter()
 
-        # Grafik widget'ını oluştur
-        canvas = FigureCanvasTkAgg(fig, master=self.grafik_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+    print(f"Modül yükleme + arayüz kurulumu: {(arayuz_hazir - ACILIS_ZAMANI) * 1000:.1f} ms")
+    print(f"İlk pencere çizimi: {(pencere_hazir - arayuz_hazir) * 1000:.1f} ms")
+    print(f"İlk pencereye kadar toplam: {(pencere_hazir - ACILIS_ZAMANI) * 1000:.1f} ms")
 
 
 # Ana uygulama başlatma
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Kişisel Finans Takipçisi")
+    parser.add_argument("--acilis-olc", action="store_true",
+                        help="İlk pencereye kadar geçen süreyi ölçüp yazdırır ve çıkar")
+    args = parser.parse_args()
+
     root = tk.Tk()
     app = FinansUygulamasi(root)
-    root.mainloop()
\ No newline at end of file
+    if args.acilis_olc:
+        acilis_suresini_olc(root)
+        app.kapat()
+    else:
+        root.mainloop()
\ No newline at end of file
@@ -0,0 +1,46 @@
+"""Rapor sonuçları için sınırlı boyutlu LRU önbellek"""
+from collections import OrderedDict
+
+
+class LRUOnbellek:
+    """En son kullanılan kapasite kadar girdiyi tutar; dolunca en eski kullanılanı atar.
+
+    Anahtarlar, sonucu etkileyen her şeyi (rapor tipi, parametreler, veri sürümü) içermelidir;
+    böylece veri değiştiğinde eski girdiler bir daha eşleşmez ve zamanla dışarı itilir.
+    """
+
+    def __init__(self, kapasite=32):
+        self.kapasite = kapasite
+        self._girdiler = OrderedDict()
+        self.isabet = 0
+        self.iska = 0
+
+    def __len__(self):
+        return len(self._girdiler)
+
+    def al(self, anahtar):
+        """(bulundu, değer) döndürür; bulunan girdiyi en yeni konuma taşır"""
+        try:
+            deger = self._girdiler[anahtar]
+        except KeyError:
+            self.iska += 1
+            return False, None
+        self._girdiler.move_to_end(anahtar)
+        self.isabet += 1
+        return True, deger
+
+    def koy(self, anahtar, deger):
+        self._girdiler[anahtar] = deger
+        self._girdiler.move_to_end(anahtar)
+        while len(self._girdiler) > self.kapasite:
+            self._girdiler.popitem(last=False)
+
+    def gecersiz_kil(self, kosul):
+        """kosul(anahtar) doğru olan girdileri siler ve silinen sayısını döndürür"""
+        silinecekler = [anahtar for anahtar in self._girdiler if kosul(anahtar)]
+        for anahtar in silinecekler:
+            del self._girdiler[anahtar]
+        return len(silinecekler)
+
+    def temizle(self):
+        self._girdiler.clear()
@@ -0,0 +1,43 @@
+"""Para birimi dönüşümleri: tutarlar veritabanında tam sayı kuruş olarak saklanır"""
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+
+KURUS = 100
+
+
+def kurusa_cevir(deger):
+    """'1.234,56', '1,234.56', '12,5', '-12.50' gibi bir TL tutarını tam sayı kuruşa çevirir.
+
+    Sayı ayırıcılarından en sağdaki ondalık ayracı kabul edilir; tek ayırıcı virgülse o da
+    ondalık sayılır. Kuruştan küçük kısım yarım yukarı yuvarlanır. Geçersiz girdide ValueError.
+    """
+    if isinstance(deger, (int, float, Decimal)):
+        metin = str(deger)
+    else:
+        metin = str(deger).strip().replace(" ", "").replace("TL", "").replace("₺", "")
+        if "," in metin and "." in metin:
+            if metin.rfind(",") > metin.rfind("."):
+                metin = metin.replace(".", "").replace(",", ".")
+            else:
+                metin = metin.replace(",", "")
+        elif "," in metin:
+            metin = metin.replace(",", ".")
+
+    try:
+        tutar = Decimal(metin)
+    except InvalidOperation:
+        raise ValueError(f"Geçersiz tutar: {deger!r}") from None
+    if not tutar.is_finite():
+        raise ValueError(f"Geçersiz tutar: {deger!r}")
+    return int((tutar * KURUS).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def tl_metni(kurus):
+    """Kuruş tutarını '1234.56' biçiminde, yuvarlama hatası olmadan metne çevirir"""
+    isaret = "-" if kurus < 0 else ""
+    lira, kalan = divmod(abs(int(kurus)), KURUS)
+    return f"{isaret}{lira}.{kalan:02d}"
+
+
+def tl_degeri(kurus):
+    """Kuruş tutarını grafikler için TL cinsinden float'a çevirir (yalnızca gösterim amaçlı)"""
+    return kurus / KURUS
@@ -0,0 +1,206 @@
+"""Sıcak yolların performans ölçüm takımı
+
+Sentetik veriyle doldurulmuş bir veritabanı (tohum ve işlem sayısına göre geçici klasörde
+önbelleklenir) her çalıştırmada kopyalanır; yazan ölçümler kopyayı değiştirir, kaynağı değil.
+Her ölçüm ısınmadan sonra birkaç kez tekrarlanır ve milisaniye cinsinden en küçük, medyan ve
+ortalama süreleri JSON olarak kaydedilir. --karsilastir ile önceki bir sonuç dosyasına göre
+medyanı esik oranından fazla yavaşlayan ölçümler raporlanır ve çıkış kodu 1 olur.
+"""
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import date, datetime
+
+import veritabani
+from depo import FinansDeposu
+from ice_aktarma import ice_aktar
+from sentetik import sentetik_satirlar, sentetik_veri_uret
+
+VARSAYILAN_ISLEM_SAYISI = 100_000
+VARSAYILAN_TEKRAR = 5
+VARSAYILAN_ESIK = 0.20  # medyanda %20'den fazla yavaşlama gerileme sayılır
+
+# Tek ölçümde kaç kez çalıştırılacağı (çok kısa süren işlemlerin ortalaması alınır)
+ISLEM_EKLE_ADEDI = 100
+TOPLU_EKLEME_ADEDI = 10_000
+
+
+def _git_surumu():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def kaynak_veritabani(islem_sayisi, tohum, bitis, klasor=None):
+    """Verilen parametrelerle üretilmiş veritabanının yolunu döndürür; yoksa üretir"""
+    klasor = klasor or tempfile.gettempdir()
+    yol = os.path.join(klasor, f"finans_sentetik_{islem_sayisi}_{tohum}_{bitis.isoformat()}.db")
+    if not os.path.exists(yol):
+        gecici = yol + ".yeni"
+        if os.path.exists(gecici):
+            os.remove(gecici)
+        conn = veritabani.baglan(gecici)
+        try:
+            sentetik_veri_uret(conn, islem_sayisi, tohum, bitis=bitis)
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        finally:
+            conn.close()
+        os.replace(gecici, yol)
+    return yol
+
+
+class Olcum:
+    """Bir ölçümün tekrar süreleri (ms)"""
+
+    def __init__(self, ad, sureler, adet=1):
+        self.ad = ad
+        self.sureler = sureler
+        self.adet = adet
+
+    def sozluk(self):
+        return {
+            "tekrar": len(self.sureler),
+            "adet": self.adet,
+            "min_ms": round(min(self.sureler), 4),
+            "medyan_ms": round(statistics.median(self.sureler), 4),
+            "ortalama_ms": round(statistics.fmean(self.sureler), 4),
+        }
+
+
+def _olc(ad, fonksiyon, tekrar, adet=1, hazirla=None):
+    """fonksiyon'u bir kez ısınma için, sonra tekrar kez çalıştırır; adet > 1 ise işlem başına süre"""
+    if hazirla:
+        hazirla()
+    fonksiyon()
+    sureler = []
+    for _ in range(tekrar):
+        if hazirla:
+            hazirla()
+        baslangic = time.perf_counter()
+        fonksiyon()
+        sureler.append((time.perf_counter() - baslangic) * 1000 / adet)
+    return Olcum(ad, sureler, adet)
+
+
+def olcumleri_calistir(yol, tekrar=VARSAYILAN_TEKRAR, ilerleme=print):
+    """Tüm ölçümleri yol'daki veritabanının üzerinde çalıştırır (veritabanı değişir)"""
+    olcumler = []
+
+    def ekle(olcum):
+        olcumler.append(olcum)
+        if ilerleme:
+            ozet = olcum.sozluk()
+            ilerleme(f"{olcum.ad:<32} medyan {ozet['medyan_ms']:>10.3f} ms   en az {ozet['min_ms']:>10.3f} ms")
+
+    with tempfile.TemporaryDirectory() as klasor:
+        sayac = iter(range(10 ** 9))
+        ekle(_olc("sema_olusturma", lambda: veritabani.baglan(
+            os.path.join(klasor, f"bos_{next(sayac)}.db")).close(), tekrar))
+
+    def acilis():
+        conn = veritabani.baglan(yol)
+        depo = FinansDeposu(conn)
+        depo.kategoriler()
+        depo.son_islemler(10)
+        conn.close()
+    ekle(_olc("acilis", acilis, tekrar))
+
+    conn = veritabani.baglan(yol)
+    depo = FinansDeposu(conn)
+    try:
+        ekle(_olc("son_islemler", lambda: depo.son_islemler(10), tekrar))
+        ekle(_olc("rapor_aylik_ozet", lambda: depo.aylik_ozet(6), tekrar))
+        ekle(_olc("rapor_kategori_harcamalari", lambda: depo.kategori_harcamalari(30), tekrar))
+        ekle(_olc("rapor_gelir_gider", depo.tip_toplamlari, tekrar))
+
+        bugun = date.today().isoformat()
+        ekle(_olc("islem_ekle", lambda: [depo.islem_ekle(bugun, 12345, "Ölçüm", "Market", "Gider")
+                                         for _ in range(ISLEM_EKLE_ADEDI)], tekrar, ISLEM_EKLE_ADEDI))
+
+        ekle(_olc("toplu_ekleme", lambda: ice_aktar(conn, sentetik_satirlar(TOPLU_EKLEME_ADEDI, tohum=7)),
+                  tekrar, TOPLU_EKLEME_ADEDI))
+
+        ekle(_olc("kategori_adlari", lambda: depo.kategori_adlari("Gider"), tekrar))
+        ekle(_olc("kategori_kullanim_sayisi", lambda: depo.kategori_kullanim_sayisi(
+            depo.kategori_id("Market", "Gider")), tekrar))
+
+        def kategori_ekle_sil():
+            depo.kategori_sil(depo.kategori_ekle("Ölçüm Kategorisi", "Gider"))
+        ekle(_olc("kategori_ekle_sil", kategori_ekle_sil, tekrar))
+    finally:
+        conn.close()
+    return olcumler
+
+
+def karsilastir(onceki, simdiki, esik=VARSAYILAN_ESIK):
+    """(ad, önceki_ms, şimdiki_ms, oran, gerileme_mi) listesi; yalnızca iki tarafta da olan ölçümler"""
+    satirlar = []
+    for ad, olcum in simdiki["olcumler"].items():
+        eski = onceki["olcumler"].get(ad)
+        if eski is None:
+            continue
+        oran = olcum["medyan_ms"] / eski["medyan_ms"] if eski["medyan_ms"] else float("inf")
+        satirlar.append((ad, eski["medyan_ms"], olcum["medyan_ms"], oran, oran > 1 + esik))
+    return satirlar
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Sıcak yolların performansını ölçer ve JSON olarak kaydeder")
+    parser.add_argument("--islem", type=int, default=VARSAYILAN_ISLEM_SAYISI, help="Sentetik işlem sayısı")
+    parser.add_argument("--tohum", type=int, default=42, help="Sentetik veri tohumu")
+    parser.add_argument("--bitis", type=date.fromisoformat, default=None,
+                        help="Sentetik verinin son tarihi (varsayılan bugün)")
+    parser.add_argument("--tekrar", type=int, default=VARSAYILAN_TEKRAR, help="Ölçüm başına tekrar")
+    parser.add_argument("--veri-klasoru", default=None, help="Sentetik veritabanlarının saklandığı klasör")
+    parser.add_argument("--cikti", default=None, help="Sonuç JSON dosyası (varsayılan performans_<zaman>.json)")
+    parser.add_argument("--karsilastir", default=None, help="Karşılaştırılacak önceki sonuç JSON dosyası")
+    parser.add_argument("--esik", type=float, default=VARSAYILAN_ESIK, help="Gerileme eşiği (0.2 = %%20)")
+    args = parser.parse_args()
+
+    bitis = args.bitis or date.today()
+    print(f"Sentetik veri hazırlanıyor ({args.islem:,} işlem, tohum {args.tohum})...")
+    kaynak = kaynak_veritabani(args.islem, args.tohum, bitis, args.veri_klasoru)
+
+    with tempfile.TemporaryDirectory() as calisma:
+        kopya = os.path.join(calisma, "finans.db")
+        shutil.copyfile(kaynak, kopya)
+        olcumler = olcumleri_calistir(kopya, args.tekrar)
+
+    sonuc = {
+        "zaman": datetime.now().isoformat(timespec="seconds"),
+        "git": _git_surumu(),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "islem_sayisi": args.islem,
+        "tohum": args.tohum,
+        "bitis": bitis.isoformat(),
+        "olcumler": {olcum.ad: olcum.sozluk() for olcum in olcumler},
+    }
+    cikti = args.cikti or f"performans_{datetime.now():%Y%m%d_%H%M%S}.json"
+    with open(cikti, "w", encoding="utf-8") as dosya:
+        json.dump(sonuc, dosya, ensure_ascii=False, indent=2)
+    print(f"Sonuçlar {cikti} dosyasına yazıldı")
+
+    if args.karsilastir:
+        with open(args.karsilastir, encoding="utf-8") as dosya:
+            onceki = json.load(dosya)
+        if onceki.get("islem_sayisi") != args.islem:
+            print(f"Uyarı: önceki ölçüm {onceki.get('islem_sayisi'):,} işlemle yapılmış")
+        gerilemeler = 0
+        print(f"\n{'Ölçüm':<32} {'Önceki':>12} {'Şimdi':>12} {'Oran':>8}")
+        for ad, eski, yeni, oran, gerileme in karsilastir(onceki, sonuc, args.esik):
+            gerilemeler += gerileme
+            print(f"{ad:<32} {eski:>10.3f}ms {yeni:>10.3f}ms {oran:>7.2f}x{'  GERİLEME' if gerileme else ''}")
+        sys.exit(1 if gerilemeler else 0)
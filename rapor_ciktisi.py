@@ -0,0 +1,181 @@
+"""Raporların ekransız (Agg) olarak PNG/PDF/SVG dosyalarına toplu çizimi
+
+Her grafik bir İş'tir (rapor tipi, tarih aralığı, isteğe bağlı kategori). İşler birbirinden
+bağımsız olduğundan ProcessPoolExecutor ile tüm çekirdeklere dağıtılır; her işçi süreci kendi
+salt okunur bağlantısını açar ve rapor tipi başına tek figürü yeniden kullanır. Tk gerekmez.
+
+    python rapor_ciktisi.py --baslangic 2024-01-01 --bitis 2024-12-31 --aylik --kategori --bicim png pdf
+"""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date, timedelta
+from typing import NamedTuple
+
+import raporlar
+import veritabani
+from depo import FinansDeposu
+
+BICIMLER = ("png", "pdf", "svg")
+
+# Aylık pakette her ay için ayrıca çizilen raporlar
+AYLIK_RAPORLAR = (raporlar.KATEGORI_BAZLI_HARCAMALAR, raporlar.GELIR_GIDER_DENGESI)
+
+# Kategori paketinde her kategori için ayrıca çizilen raporlar (raporlar.KATEGORI_SUZULEBILEN içinden;
+# tek kategorinin pastası ya da gelir-gider dengesi anlamsız olduğundan yalnızca aylık seyri)
+KATEGORI_RAPORLARI = (raporlar.AYLIK_OZET,)
+
+_TURKCE_ASCII = str.maketrans("çğıöşüÇĞİÖŞÜ", "cgiosuCGIOSU")
+
+
+class Is(NamedTuple):
+    rapor_tipi: str
+    baslangic: str  # YYYY-MM-DD, dahil
+    bitis: str  # YYYY-MM-DD, dahil
+    kategori_id: int | None = None
+    kategori_adi: str | None = None
+
+    def dosya_adi(self):
+        parcalar = [self.rapor_tipi, self.baslangic, self.bitis]
+        if self.kategori_adi:
+            parcalar.append(self.kategori_adi)
+        ad = "_".join(parcalar).translate(_TURKCE_ASCII).lower()
+        return "".join(harf if harf.isalnum() or harf in "-_" else "_" for harf in ad)
+
+    def baslik(self):
+        baslik = f"{self.rapor_tipi} - {self.kategori_adi}" if self.kategori_adi else self.rapor_tipi
+        return f"{baslik}\n{self.baslangic} / {self.bitis}"
+
+
+class IsSonucu(NamedTuple):
+    is_: Is
+    dosyalar: list[str]  # veri yoksa boş
+    sure: float  # saniye
+
+
+def aylar(baslangic, bitis):
+    """[baslangic, bitis] aralığını ay sınırlarından (ilk, son) gün çiftlerine böler"""
+    ilk = date.fromisoformat(baslangic)
+    son = date.fromisoformat(bitis)
+    while ilk <= son:
+        sonraki = (ilk.replace(day=1) + timedelta(days=31)).replace(day=1)
+        yield ilk.isoformat(), min(sonraki - timedelta(days=1), son).isoformat()
+        ilk = sonraki
+
+
+def isleri_olustur(conn, baslangic, bitis, rapor_tipleri=None, aylik=False, kategori=False):
+    """Tüm aralık için seçili raporlar, istenirse her ay ve her kategori için ayrı işler"""
+    rapor_tipleri = list(rapor_tipleri or raporlar.DONEM_VERILERI)
+    isler = [Is(tip, baslangic, bitis) for tip in rapor_tipleri]
+    if aylik:
+        isler += [Is(tip, ilk, son) for ilk, son in aylar(baslangic, bitis)
+                  for tip in AYLIK_RAPORLAR if tip in rapor_tipleri]
+    if kategori:
+        isler += [Is(tip, baslangic, bitis, kayit.id, kayit.ad) for kayit in FinansDeposu(conn).kategoriler()
+                  for tip in KATEGORI_RAPORLARI if tip in rapor_tipleri]
+    return isler
+
+
+# --- İşçi süreci ---
+
+_depo = None
+_grafikler = {}
+
+
+def _isci_baslat(yol):
+    """Her işçi süreci için bir kez: Agg arka ucu ve salt okunur bağlantı"""
+    global _depo
+    import matplotlib
+    matplotlib.use("Agg")
+    _depo = FinansDeposu(veritabani.salt_okunur_baglan(yol))
+
+
+def _ciz(is_, klasor, bicimler, dpi):
+    """Tek işi çizip dosyalara kaydeder; veri yoksa dosya yazılmaz"""
+    from grafikler import grafik_olustur
+
+    baslangic = time.perf_counter()
+    veri = raporlar.DONEM_VERILERI[is_.rapor_tipi](_depo, is_.baslangic, is_.bitis, is_.kategori_id)
+    if veri is None:
+        return IsSonucu(is_, [], time.perf_counter() - baslangic)
+
+    grafik = _grafikler.get(is_.rapor_tipi)
+    if grafik is None:
+        grafik = _grafikler[is_.rapor_tipi] = grafik_olustur(is_.rapor_tipi)
+    grafik.guncelle(veri)
+    grafik.ax.set_title(is_.baslik())
+    grafik.figure.tight_layout()
+
+    dosyalar = []
+    for bicim in bicimler:
+        yol = os.path.join(klasor, f"{is_.dosya_adi()}.{bicim}")
+        grafik.figure.savefig(yol, format=bicim, dpi=dpi)
+        dosyalar.append(yol)
+    return IsSonucu(is_, dosyalar, time.perf_counter() - baslangic)
+
+
+def raporlari_ciz(yol, isler, klasor, bicimler=("png",), dpi=100, isci_sayisi=None):
+    """İşleri isci_sayisi süreçte çizer ve tamamlandıkça IsSonucu üretir.
+
+    isci_sayisi 1 ise süreç havuzu kurulmadan bu süreçte çalışılır; varsayılan çekirdek sayısıdır.
+    """
+    os.makedirs(klasor, exist_ok=True)
+    isci_sayisi = isci_sayisi or os.cpu_count() or 1
+    if isci_sayisi == 1 or len(isler) == 1:
+        _isci_baslat(yol)
+        for is_ in isler:
+            yield _ciz(is_, klasor, bicimler, dpi)
+        return
+
+    with ProcessPoolExecutor(max_workers=min(isci_sayisi, len(isler)), initializer=_isci_baslat,
+                             initargs=(yol,)) as havuz:
+        gelecekler = [havuz.submit(_ciz, is_, klasor, bicimler, dpi) for is_ in isler]
+        for gelecek in as_completed(gelecekler):
+            yield gelecek.result()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    bugun = date.today()
+    parser = argparse.ArgumentParser(description="Raporları ekransız olarak PNG/PDF/SVG dosyalarına çizer")
+    parser.add_argument("--veritabani", default=veritabani.VERITABANI_YOLU, help="Veritabanı dosyası")
+    parser.add_argument("--baslangic", type=date.fromisoformat, default=bugun.replace(month=1, day=1),
+                        help="Aralığın ilk günü (varsayılan bu yılın başı)")
+    parser.add_argument("--bitis", type=date.fromisoformat, default=bugun,
+                        help="Aralığın son günü (varsayılan bugün)")
+    parser.add_argument("--rapor", action="append", dest="raporlar", metavar="RAPOR",
+                        help=f"Çizilecek rapor (tekrarlanabilir; boşsa tümü): {', '.join(raporlar.DONEM_VERILERI)}")
+    parser.add_argument("--aylik", action="store_true", help="Her ay için ayrı kategori ve gelir-gider grafikleri")
+    parser.add_argument("--kategori", action="store_true", help="Her kategori için ayrı aylık grafik")
+    parser.add_argument("--bicim", nargs="+", choices=BICIMLER, default=["png"], help="Çıktı biçimleri")
+    parser.add_argument("--dpi", type=int, default=100, help="PNG çözünürlüğü")
+    parser.add_argument("--cikti", default="rapor_ciktilari", help="Çıktı klasörü")
+    parser.add_argument("--isci", type=int, default=None, help="Süreç sayısı (varsayılan çekirdek sayısı)")
+    args = parser.parse_args()
+    for rapor in args.raporlar or []:
+        if rapor not in raporlar.DONEM_VERILERI:
+            parser.error(f"bilinmeyen rapor: {rapor}")
+    if args.baslangic > args.bitis:
+        parser.error("başlangıç bitişten sonra olamaz")
+
+    conn = veritabani.salt_okunur_baglan(args.veritabani)
+    try:
+        isler = isleri_olustur(conn, args.baslangic.isoformat(), args.bitis.isoformat(), args.raporlar,
+                               args.aylik, args.kategori)
+    finally:
+        conn.close()
+
+    baslangic = time.perf_counter()
+    yazilan = bos = 0
+    for sira, sonuc in enumerate(raporlari_ciz(args.veritabani, isler, args.cikti, args.bicim, args.dpi,
+                                               args.isci), 1):
+        if sonuc.dosyalar:
+            yazilan += 1
+            durum = os.path.basename(sonuc.dosyalar[0]).rsplit(".", 1)[0]
+        else:
+            bos += 1
+            durum = f"{sonuc.is_.dosya_adi()}: veri yok"
+        print(f"[{sira}/{len(isler)}] {durum} ({sonuc.sure:.2f} sn)")
+    print(f"{yazilan} grafik {args.cikti} klasörüne yazıldı, {bos} boş rapor atlandı "
+          f"({time.perf_counter() - baslangic:.1f} sn)")
@@ -0,0 +1,200 @@
+"""Rapor verilerinin arayüzden bağımsız hazırlanması (sorgu + pandas aşaması)
+
+Depodan gelen kuruş toplamları grafik için burada TL'ye çevrilir; gelir-gider dengesi
+etiketlerde kesin gösterilebilmesi için kuruş olarak bırakılır.
+"""
+from collections import namedtuple
+
+from para import KURUS, tl_degeri
+from veritabani import gun_numarasi
+
+AYLIK_OZET = "Aylık Özet"
+KATEGORI_BAZLI_HARCAMALAR = "Kategori Bazlı Harcamalar"
+GELIR_GIDER_DENGESI = "Gelir-Gider Dengesi"
+HAREKETLI_ORTALAMALAR = "Hareketli Ortalamalar"
+KUMULATIF_BAKIYE = "Kümülatif Bakiye"
+KATEGORI_EGILIMLERI = "Kategori Eğilimleri"
+TASARRUF_ORANI = "Tasarruf Oranı"
+HARCAMA_TAHMINI = "Harcama Tahmini"
+ZAMAN_SERISI = "Bakiye ve Harcama Zaman Serisi"
+
+# Zaman serisinde bakiye için çizilecek nokta sayısı (günlük harcama bunun yarısı kadar kovaya bölünür)
+NOKTA_SAYISI = 1500
+# 1970-01-01'in gün numarası; matplotlib tarih sayıları bu günden itibaren gün sayar
+_UNIX_GUNU = 2440588
+
+# x değerleri matplotlib tarih sayısıdır; ilk_gun/son_gun sorgulanan aralığın gün numaraları,
+# gun_sayisi seyreltmeden önceki (ham) gün sayısıdır
+ZamanSerisi = namedtuple("ZamanSerisi", ["bakiye_x", "bakiye_y", "harcama_x", "harcama_y",
+                                         "ilk_gun", "son_gun", "gun_sayisi"])
+
+
+def aylik_ozet_verisi(depo, ay_sayisi=6):
+    """Son ay_sayisi ayın ay x tip pivot tablosunu döndürür; veri yoksa None"""
+    return _aylik_pivot(depo.aylik_ozet(ay_sayisi))
+
+
+def _aylik_pivot(sonuclar):
+    """(ay, tip, toplam) satırlarını ay x tip TL tablosuna çevirir; satır yoksa None"""
+    if not sonuclar:
+        return None
+
+    import pandas as pd
+
+    # Verileri pandas dataframe'e çevir
+    df = pd.DataFrame(sonuclar, columns=['ay', 'tip', 'toplam'])
+    return (df.pivot(index='ay', columns='tip', values='toplam').fillna(0) / KURUS).astype(float)
+
+
+def kategori_harcama_verisi(depo, gun_sayisi=30):
+    """Son gun_sayisi günün (kategoriler, miktarlar) listelerini döndürür; veri yoksa None"""
+    return _kategori_listeleri(depo.kategori_harcamalari(gun_sayisi))
+
+
+def _kategori_listeleri(sonuclar):
+    if not sonuclar:
+        return None
+    return [row[0] for row in sonuclar], [tl_degeri(row[1]) for row in sonuclar]
+
+
+def gelir_gider_verisi(depo):
+    """Tüm zamanların (gelir, gider) kuruş toplamlarını döndürür; ikisinden biri yoksa None"""
+    return _gelir_gider(depo.tip_toplamlari())
+
+
+def _gelir_gider(sonuclar):
+    if not sonuclar or 'Gelir' not in sonuclar or 'Gider' not in sonuclar:
+        return None
+    return sonuclar.get('Gelir', 0), sonuclar.get('Gider', 0)
+
+
+def _analiz_verisi(fonksiyon_adi):
+    """analiz modülündeki tüm geçmiş analizini rapor verisi hazırlayıcısına çevirir (boş sonuç -> None)"""
+    def hazirla(depo):
+        import analiz
+
+        df = getattr(analiz, fonksiyon_adi)(depo.conn)
+        return None if df.empty else df
+    return hazirla
+
+
+def zaman_serisi_verisi(depo, baslangic=None, bitis=None, kategori_id=None, nokta_sayisi=NOKTA_SAYISI):
+    """[baslangic, bitis] aralığının günlük bakiye ve harcama serisi, ekrana sığacak kadar seyreltilmiş.
+
+    Tarihler YYYY-MM-DD ya da gün numarası olabilir; verilmeyen uç tüm geçmişin ucudur.
+    Günlük toplamlar gunluk_toplamlar özetinden okunur (on yıl için ~3.650 gün), boş günler
+    sıfırla doldurulur ve bakiye kümülatif toplamla hesaplanır. Bakiye LTTB ile, harcama
+    sıçramaları kaybolmasın diye min/maks ile seyreltilir. Veri yoksa None. Bakiye tüm
+    kategorilerin toplamı olduğundan kategori_id ile süzülemez (verilirse ValueError).
+    """
+    import numpy as np
+
+    import seyreltme
+
+    _kategori_suzulemez(ZAMAN_SERISI, kategori_id)
+    aralik = depo.gun_araligi()
+    if aralik is None:
+        return None
+    ilk_gun = aralik[0] if baslangic is None else max(aralik[0], _gun(baslangic))
+    son_gun = aralik[1] if bitis is None else min(aralik[1], _gun(bitis))
+    if ilk_gun > son_gun:
+        return None
+
+    acilis, satirlar = depo.gunluk_seri(ilk_gun, son_gun)
+    gun_sayisi = son_gun - ilk_gun + 1
+    gelir = np.zeros(gun_sayisi, dtype=np.int64)
+    gider = np.zeros(gun_sayisi, dtype=np.int64)
+    if satirlar:
+        dizi = np.array(satirlar, dtype=np.int64)
+        gelir[dizi[:, 0] - ilk_gun] = dizi[:, 1]
+        gider[dizi[:, 0] - ilk_gun] = dizi[:, 2]
+
+    x = np.arange(ilk_gun - _UNIX_GUNU, son_gun - _UNIX_GUNU + 1, dtype=float)
+    bakiye = (acilis + np.cumsum(gelir - gider)) / KURUS
+    bakiye_x, bakiye_y = seyreltme.lttb(x, bakiye, nokta_sayisi)
+    harcama_x, harcama_y = seyreltme.min_maks(x, gider / KURUS, nokta_sayisi // 2)
+    return ZamanSerisi(bakiye_x, bakiye_y, harcama_x, harcama_y, ilk_gun, son_gun, gun_sayisi)
+
+
+def _kategori_suzulemez(rapor, kategori_id):
+    if kategori_id is not None:
+        raise ValueError(f"{rapor} kategoriye göre süzülemez")
+
+
+def _gun(tarih):
+    return tarih if isinstance(tarih, int) else gun_numarasi(tarih)
+
+
+def tarih_sayisindan_gun(x):
+    """matplotlib tarih sayısını (ör. eksen sınırı) gün numarasına çevirir"""
+    return int(x) + _UNIX_GUNU
+
+
+def donem_aylik_ozet_verisi(depo, baslangic, bitis, kategori_id=None):
+    """[baslangic, bitis] aralığının ay x tip tablosu; kategori_id verilirse yalnızca o kategori"""
+    return _aylik_pivot(depo.donem_aylik_ozet(baslangic, bitis, kategori_id))
+
+
+def donem_kategori_harcama_verisi(depo, baslangic, bitis, kategori_id=None):
+    """[baslangic, bitis] aralığının (kategoriler, miktarlar) listeleri; kategori_id ile tek kategori"""
+    return _kategori_listeleri(depo.donem_kategori_harcamalari(baslangic, bitis, kategori_id))
+
+
+def donem_gelir_gider_verisi(depo, baslangic, bitis, kategori_id=None):
+    """[baslangic, bitis] aralığının (gelir, gider) kuruş toplamları; kategori_id ile tek kategori"""
+    return _gelir_gider(depo.donem_tip_toplamlari(baslangic, bitis, kategori_id))
+
+
+def _analiz_donem_verisi(fonksiyon_adi):
+    """Tüm geçmiş analizinin [baslangic, bitis] aralığına düşen satırları (boş sonuç -> None)"""
+    def hazirla(depo, baslangic, bitis, kategori_id=None):
+        _kategori_suzulemez(fonksiyon_adi, kategori_id)
+        df = _analiz_verisi(fonksiyon_adi)(depo)
+        if df is None:
+            return None
+        df = df.loc[baslangic:bitis]
+        return None if df.empty else df
+    return hazirla
+
+
+# Rapor tipi -> sonucu etkileyen tablolar (önbellek yalnızca bunlara yazılınca geçersizleşir)
+RAPOR_TABLOLARI = {
+    AYLIK_OZET: ("islemler",),
+    KATEGORI_BAZLI_HARCAMALAR: ("islemler", "kategoriler"),
+    GELIR_GIDER_DENGESI: ("islemler",),
+    HAREKETLI_ORTALAMALAR: ("islemler",),
+    KUMULATIF_BAKIYE: ("islemler",),
+    KATEGORI_EGILIMLERI: ("islemler", "kategoriler"),
+    TASARRUF_ORANI: ("islemler",),
+    HARCAMA_TAHMINI: ("islemler",),
+    ZAMAN_SERISI: ("islemler",),
+}
+
+# Rapor tipi -> veri hazırlama fonksiyonu (combobox sırasıyla)
+RAPOR_VERILERI = {
+    AYLIK_OZET: aylik_ozet_verisi,
+    KATEGORI_BAZLI_HARCAMALAR: kategori_harcama_verisi,
+    GELIR_GIDER_DENGESI: gelir_gider_verisi,
+    HAREKETLI_ORTALAMALAR: _analiz_verisi("hareketli_ortalamalar"),
+    KUMULATIF_BAKIYE: _analiz_verisi("kumulatif_bakiye"),
+    KATEGORI_EGILIMLERI: _analiz_verisi("kategori_egilimleri"),
+    TASARRUF_ORANI: _analiz_verisi("tasarruf_orani"),
+    HARCAMA_TAHMINI: _analiz_verisi("harcama_tahmini"),
+    ZAMAN_SERISI: zaman_serisi_verisi,
+}
+
+# kategori_id ile tek kategoriye süzülebilen dönem raporları (diğerleri kategori_id verilince ValueError)
+KATEGORI_SUZULEBILEN = (AYLIK_OZET, KATEGORI_BAZLI_HARCAMALAR, GELIR_GIDER_DENGESI)
+
+# Rapor tipi -> tarih aralığı (YYYY-MM-DD, dahil) için veri hazırlama fonksiyonu
+DONEM_VERILERI = {
+    AYLIK_OZET: donem_aylik_ozet_verisi,
+    KATEGORI_BAZLI_HARCAMALAR: donem_kategori_harcama_verisi,
+    GELIR_GIDER_DENGESI: donem_gelir_gider_verisi,
+    HAREKETLI_ORTALAMALAR: _analiz_donem_verisi("hareketli_ortalamalar"),
+    KUMULATIF_BAKIYE: _analiz_donem_verisi("kumulatif_bakiye"),
+    KATEGORI_EGILIMLERI: _analiz_donem_verisi("kategori_egilimleri"),
+    TASARRUF_ORANI: _analiz_donem_verisi("tasarruf_orani"),
+    HARCAMA_TAHMINI: _analiz_donem_verisi("harcama_tahmini"),
+    ZAMAN_SERISI: zaman_serisi_verisi,
+}
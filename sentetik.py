@@ -0,0 +1,103 @@
+"""Ölçümler için tekrarlanabilir sentetik işlem verisi üretici
+
+Aynı tohum, parametreler ve bitiş tarihiyle her seferinde aynı veri üretilir; raporlar bugüne
+göreli pencereler kullandığından bitiş tarihi varsayılan olarak bugündür. Maaş, kira ve faturalar
+her ay düzenli olarak, diğer harcamalar günlere rastgele dağılarak ve kategoriye özgü log-normal
+tutarlarla oluşur; satırlar tarih sırasıyla ice_aktarma'nın toplu yazma yolundan geçer.
+"""
+import math
+import random
+from datetime import date, timedelta
+
+from ice_aktarma import EkstreSatiri, ice_aktar
+
+# Kategori -> (ağırlık, medyan tutar TL, log-normal sigma, açıklama örnekleri)
+GIDER_DAGILIMI = {
+    "Market": (40, 250, 0.7, ["Migros", "BİM", "A101", "Şok Market", "CarrefourSA", "Manav", "Fırın"]),
+    "Ulaşım": (20, 60, 0.6, ["İstanbulkart dolum", "Taksi", "Akaryakıt", "Otopark", "Martı"]),
+    "Eğlence": (12, 300, 0.8, ["Sinema", "Restoran", "Kafe", "Konser bileti", "Kitapçı"]),
+    "Sağlık": (5, 400, 0.9, ["Eczane", "Diş hekimi", "Muayene", "Optik"]),
+    "Diğer Giderler": (13, 350, 1.0, ["Giyim", "Elektronik", "Hediye alışverişi", "Kırtasiye", "Kuaför"]),
+    "Faturalar": (4, 300, 0.5, ["Turkcell", "Netflix", "Spotify", "Spor salonu"]),
+}
+GELIR_DAGILIMI = {
+    "Ek Gelir": (3, 2500, 0.7, ["Serbest iş ödemesi", "Danışmanlık", "İkinci el satış"]),
+    "Yatırım": (2, 1200, 1.0, ["Temettü", "Faiz getirisi", "Fon satışı"]),
+    "Hediye": (1, 1000, 0.8, ["Bayram harçlığı", "Doğum günü hediyesi"]),
+}
+
+# Her ay belirli günlerde oluşan düzenli kalemler: (gün, kategori, tip, tutar TL, açıklama)
+AYLIK_KALEMLER = [
+    (1, "Maaş", "Gelir", 45000, "Maaş ödemesi"),
+    (3, "Kira", "Gider", 15000, "Ev kirası"),
+    (10, "Faturalar", "Gider", 900, "Elektrik faturası"),
+    (12, "Faturalar", "Gider", 450, "Doğalgaz faturası"),
+    (15, "Faturalar", "Gider", 250, "Su faturası"),
+    (20, "Faturalar", "Gider", 400, "İnternet faturası"),
+]
+
+
+def _kurus(rastgele, medyan, sigma):
+    return max(100, round(rastgele.lognormvariate(math.log(medyan * 100), sigma)))
+
+
+def sentetik_satirlar(islem_sayisi, tohum=42, yil_sayisi=10, bitis=None):
+    """Bitiş tarihine kadar yil_sayisi yıla yayılmış, tarih sırasıyla islem_sayisi EkstreSatiri üretir"""
+    rastgele = random.Random(tohum)
+    bitis = bitis or date.today()
+    baslangic = bitis - timedelta(days=round(yil_sayisi * 365.25) - 1)
+    gun_sayisi = (bitis - baslangic).days + 1
+
+    duzenli_sayisi = min(islem_sayisi, round(gun_sayisi / 30.44 * len(AYLIK_KALEMLER)))
+    gunluk_oran = (islem_sayisi - duzenli_sayisi) / gun_sayisi
+
+    dagilim = [(ad, "Gider", *deger) for ad, deger in GIDER_DAGILIMI.items()]
+    dagilim += [(ad, "Gelir", *deger) for ad, deger in GELIR_DAGILIMI.items()]
+    agirliklar = [kalem[2] for kalem in dagilim]
+
+    uretilen = 0
+    gun = baslangic
+    while uretilen < islem_sayisi:
+        tarih = gun.isoformat()
+        for ay_gunu, kategori, tip, tutar, aciklama in AYLIK_KALEMLER:
+            if gun.day == ay_gunu and uretilen < islem_sayisi:
+                yield EkstreSatiri(tarih, tutar * 100, aciklama, kategori, tip)
+                uretilen += 1
+
+        # Son güne gelindiyse kalan satırlar da bu güne yazılır
+        adet = islem_sayisi - uretilen if gun >= bitis else int(gunluk_oran + rastgele.random())
+        for kategori, tip, _, medyan, sigma, aciklamalar in rastgele.choices(dagilim, agirliklar, k=adet):
+            if uretilen >= islem_sayisi:
+                break
+            yield EkstreSatiri(tarih, _kurus(rastgele, medyan, sigma), rastgele.choice(aciklamalar), kategori, tip)
+            uretilen += 1
+        gun += timedelta(days=1)
+
+
+def sentetik_veri_uret(conn, islem_sayisi, tohum=42, yil_sayisi=10, bitis=None, parca_boyutu=50_000, ilerleme=None):
+    """Veritabanına islem_sayisi sentetik işlem yazar (tek işlem içinde); IceAktarmaSonucu döndürür"""
+    return ice_aktar(conn, sentetik_satirlar(islem_sayisi, tohum, yil_sayisi, bitis), parca_boyutu, ilerleme)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from veritabani import baglan
+
+    parser = argparse.ArgumentParser(description="Veritabanını sentetik işlemlerle doldurur")
+    parser.add_argument("--veritabani", required=True, help="Doldurulacak veritabanı dosyası")
+    parser.add_argument("--islem", type=int, default=100_000, help="Üretilecek işlem sayısı (ör. 10000-10000000)")
+    parser.add_argument("--tohum", type=int, default=42, help="Rastgele sayı üreteci tohumu")
+    parser.add_argument("--yil", type=int, default=10, help="Verinin yayılacağı yıl sayısı")
+    parser.add_argument("--bitis", type=date.fromisoformat, default=None, help="Son işlem tarihi (varsayılan bugün)")
+    args = parser.parse_args()
+
+    def ilerleme_yaz(satir_sayisi, saniyedeki_satir):
+        print(f"\r{satir_sayisi:,} / {args.islem:,} satır ({saniyedeki_satir:,.0f} satır/sn)", end="", flush=True)
+
+    conn = baglan(args.veritabani)
+    try:
+        sonuc = sentetik_veri_uret(conn, args.islem, args.tohum, args.yil, args.bitis, ilerleme=ilerleme_yaz)
+    finally:
+        conn.close()
+    print(f"\n{sonuc.satir_sayisi:,} işlem {sonuc.sure:.1f} sn içinde üretildi")
@@ -0,0 +1,54 @@
+"""Uzun zaman serilerini ekrana sığacak nokta sayısına seyreltme
+
+Ekranda piksel başına birden fazla nokta çizmek görüntüyü değiştirmez, yalnızca çizimi yavaşlatır.
+Buradaki fonksiyonlar sıralı (x, y) dizilerinden görsel şekli koruyan bir alt küme seçer:
+
+- lttb: Largest-Triangle-Three-Buckets; bakiye gibi sürekli eğrilerin şeklini korur.
+- min_maks: her kovadan en küçük ve en büyük nokta; tek günlük harcama sıçramaları kaybolmaz.
+
+Nokta sayısı hedefin altındaysa diziler olduğu gibi döndürülür.
+"""
+import numpy as np
+
+
+def lttb(x, y, esik):
+    """x'e göre sıralı seriden esik nokta seçer (ilk ve son nokta her zaman korunur)"""
+    n = len(x)
+    if esik >= n or esik < 3:
+        return x, y
+
+    # İlk ve son nokta dışındaki noktalar esik - 2 kovaya bölünür; her kovadan, bir önceki seçilen
+    # nokta ve sonraki kovanın ortalamasıyla en büyük üçgeni oluşturan nokta alınır
+    sinirlar = np.linspace(1, n - 1, esik - 1).astype(np.int64)
+    secilen = np.empty(esik, dtype=np.int64)
+    secilen[0], secilen[-1] = 0, n - 1
+    onceki = 0
+    for i in range(esik - 2):
+        bas, son = sinirlar[i], sinirlar[i + 1]
+        sonraki_son = sinirlar[i + 2] if i + 2 < len(sinirlar) else n
+        ort_x, ort_y = x[son:sonraki_son].mean(), y[son:sonraki_son].mean()
+        alan = np.abs((x[onceki] - ort_x) * (y[bas:son] - y[onceki])
+                      - (x[onceki] - x[bas:son]) * (ort_y - y[onceki]))
+        onceki = bas + int(alan.argmax())
+        secilen[i + 1] = onceki
+    return x[secilen], y[secilen]
+
+
+def min_maks(x, y, kova_sayisi):
+    """Seriyi kova_sayisi eşit kovaya bölüp her kovanın en küçük ve en büyük noktasını zaman sırasıyla döndürür"""
+    n = len(x)
+    if kova_sayisi < 1 or n <= 2 * kova_sayisi:
+        return x, y
+
+    boyut = -(-n // kova_sayisi)
+    kova_sayisi = -(-n // boyut)
+    # Son kova eksikse NaN ile doldurulur; nanargmin/nanargmax bu hücreleri atlar
+    dolgulu = np.full(kova_sayisi * boyut, np.nan)
+    dolgulu[:n] = y
+    kovalar = dolgulu.reshape(kova_sayisi, boyut)
+    baslar = np.arange(kova_sayisi) * boyut
+    indisler = np.sort(np.stack([baslar + np.nanargmin(kovalar, axis=1),
+                                 baslar + np.nanargmax(kovalar, axis=1)], axis=1), axis=1).ravel()
+    # Kovada tek değer varsa en küçük ve en büyük aynı noktadır
+    indisler = indisler[np.r_[True, indisler[1:] != indisler[:-1]]]
+    return x[indisler], y[indisler]
@@ -0,0 +1,485 @@
+"""Defter için yerel JSON API sunucusu (asyncio, yalnızca 127.0.0.1)
+
+İstekler tek bir olay döngüsünde karşılanır; SQLite işleri döngüyü bloklamasın diye iş parçacıklarına
+verilir. Okumalar, bağlantı havuzundan ödünç alınan salt okunur bağlantılarla paralel yürütülür.
+Yazmalar tek yazma iş parçacığına sıralanır: o iş parçacığı meşgulken biriken istekler bir sonraki
+turda birlikte alınır ve ardışık işlem eklemeleri tek bir işleme (transaction) birleştirilir.
+Böylece yüzlerce eşzamanlı ekleme, yüzlerce ayrı COMMIT yerine birkaç toplu yazmaya dönüşür.
+
+    python sunucu.py --veritabani data/finans.db --port 8765
+
+Uç noktalar (tutarlar yanıtlarda "1234.56" metni, girdide para.kurusa_cevir'in kabul ettiği her biçim):
+    GET    /islemler?metin=&baslangic=&bitis=&tip=&kategori_id=&en_az=&en_cok=&limit=&sonra_tarih=&sonra_id=
+    POST   /islemler                 {"tarih", "miktar", "aciklama", "kategori", "tip"}
+    POST   /islemler/toplu           [işlem, ...]
+    POST   /islemler/toplu-sil       {"idler": [...]}
+    GET    /islemler/{id}
+    PUT    /islemler/{id}
+    DELETE /islemler/{id}
+    GET    /kategoriler
+    GET    /raporlar/aylik-ozet?ay_sayisi=        (ya da ?baslangic=&bitis=)
+    GET    /raporlar/kategori-harcamalari?gun_sayisi=
+    GET    /raporlar/gelir-gider
+"""
+import asyncio
+import json
+import re
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from http import HTTPStatus
+from typing import Callable, NamedTuple
+from urllib.parse import parse_qs, urlsplit
+
+import veritabani
+from depo import DepoHatasi, FinansDeposu, Islem, IslemFiltresi
+from para import kurusa_cevir, tl_metni
+
+ADRES = "127.0.0.1"
+VARSAYILAN_PORT = 8765
+OKUYUCU_SAYISI = 8
+BEKLEYEN_BAGLANTI = 512  # listen() kuyruğu
+EN_BUYUK_GOVDE = 4 * 1024 * 1024
+TOPLU_YAZMA_SINIRI = 1000  # tek turda yazma iş parçacığına verilen en fazla istek
+VARSAYILAN_SAYFA = 50
+EN_BUYUK_SAYFA = 500
+
+
+class IstekHatasi(Exception):
+    """İstemciye durum koduyla dönülecek hata"""
+
+    def __init__(self, durum, mesaj):
+        super().__init__(mesaj)
+        self.durum = durum
+
+
+class _Yazma(NamedTuple):
+    islem: Callable[[FinansDeposu], object]  # yazma iş parçacığında depo ile çalıştırılır
+    satir: tuple | None  # tek işlem eklemesinde (tarih, miktar, aciklama, kategori, tip); ardışıkları birleşir
+    gelecek: asyncio.Future
+
+
+# --- Dönüşümler ---
+
+def islem_sozlugu(islem: Islem):
+    return {"id": islem.id, "tarih": islem.tarih, "tip": islem.tip, "kategori": islem.kategori,
+            "miktar": tl_metni(islem.miktar), "aciklama": islem.aciklama}
+
+
+def _tarih(deger, alan):
+    try:
+        return date.fromisoformat(str(deger)).isoformat()
+    except ValueError:
+        raise IstekHatasi(400, f"{alan}: tarih YYYY-AA-GG biçiminde olmalıdır") from None
+
+
+def _tutar(deger, alan):
+    try:
+        return kurusa_cevir(deger)
+    except ValueError as hata:
+        raise IstekHatasi(400, f"{alan}: {hata}") from None
+
+
+def _tam_sayi(deger, alan, en_az=None):
+    try:
+        sayi = int(deger)
+    except (TypeError, ValueError):
+        raise IstekHatasi(400, f"{alan}: tam sayı olmalıdır") from None
+    if en_az is not None and sayi < en_az:
+        raise IstekHatasi(400, f"{alan}: en az {en_az} olmalıdır")
+    return sayi
+
+
+def islem_girdisi(veri):
+    """JSON nesnesini depo.islem_ekle argümanlarına (tarih, miktar, aciklama, kategori, tip) çevirir"""
+    if not isinstance(veri, dict):
+        raise IstekHatasi(400, "İşlem bir JSON nesnesi olmalıdır")
+    eksik = [alan for alan in ("tarih", "miktar", "kategori", "tip") if veri.get(alan) in (None, "")]
+    if eksik:
+        raise IstekHatasi(400, f"Eksik alanlar: {', '.join(eksik)}")
+    miktar = _tutar(veri["miktar"], "miktar")
+    if miktar <= 0:
+        raise IstekHatasi(400, "miktar: pozitif olmalıdır")
+    if veri["tip"] not in ("Gelir", "Gider"):
+        raise IstekHatasi(400, "tip: Gelir ya da Gider olmalıdır")
+    return (_tarih(veri["tarih"], "tarih"), miktar, str(veri.get("aciklama") or ""), str(veri["kategori"]),
+            veri["tip"])
+
+
+def _filtre(sorgu):
+    """Sorgu dizesi parametrelerinden IslemFiltresi (hiç ölçüt yoksa None)"""
+    def tek(ad):
+        return sorgu[ad][-1] if ad in sorgu and sorgu[ad][-1] != "" else None
+
+    filtre = IslemFiltresi(
+        metin=tek("metin"),
+        baslangic=None if tek("baslangic") is None else _tarih(tek("baslangic"), "baslangic"),
+        bitis=None if tek("bitis") is None else _tarih(tek("bitis"), "bitis"),
+        tip=tek("tip"),
+        kategori_idleri=tuple(_tam_sayi(deger, "kategori_id") for deger in sorgu["kategori_id"])
+        if "kategori_id" in sorgu else None,
+        en_az=None if tek("en_az") is None else _tutar(tek("en_az"), "en_az"),
+        en_cok=None if tek("en_cok") is None else _tutar(tek("en_cok"), "en_cok"),
+    )
+    return None if filtre == IslemFiltresi() else filtre
+
+
+def _sorgudan_sayi(sorgu, ad, varsayilan, en_az=1):
+    return _tam_sayi(sorgu[ad][-1], ad, en_az) if ad in sorgu else varsayilan
+
+
+# --- Uç noktalar ---
+# Okuma işleyicileri (depo, sorgu) alıp okuma havuzunda; yazma işleyicileri gövdeyi doğrulayıp bir
+# _Yazma döndürür ve yazma iş parçacığında çalışır. İkisi de (durum, JSON verisi) üretir.
+
+def islemleri_listele(depo, sorgu):
+    limit = min(_sorgudan_sayi(sorgu, "limit", VARSAYILAN_SAYFA), EN_BUYUK_SAYFA)
+    sonra = None
+    if "sonra_tarih" in sorgu or "sonra_id" in sorgu:
+        if "sonra_tarih" not in sorgu or "sonra_id" not in sorgu:
+            raise IstekHatasi(400, "sonra_tarih ve sonra_id birlikte verilmelidir")
+        sonra = (_tarih(sorgu["sonra_tarih"][-1], "sonra_tarih"), _tam_sayi(sorgu["sonra_id"][-1], "sonra_id"))
+    islemler = depo.islem_sayfasi(limit, sonra=sonra, filtre=_filtre(sorgu))
+    sonraki = None
+    if len(islemler) == limit:
+        sonraki = {"sonra_tarih": islemler[-1].tarih, "sonra_id": islemler[-1].id}
+    return 200, {"islemler": [islem_sozlugu(islem) for islem in islemler], "sonraki": sonraki}
+
+
+def islem_goster(depo, sorgu, islem_id):
+    islem = depo.islem_getir(islem_id)
+    if islem is None:
+        raise IstekHatasi(404, f"{islem_id} numaralı işlem bulunamadı")
+    return 200, islem_sozlugu(islem)
+
+
+def kategorileri_listele(depo, sorgu):
+    return 200, [kategori._asdict() for kategori in depo.kategoriler()]
+
+
+def aylik_ozet_raporu(depo, sorgu):
+    if "baslangic" in sorgu or "bitis" in sorgu:
+        baslangic = _tarih(sorgu.get("baslangic", [""])[-1], "baslangic")
+        bitis = _tarih(sorgu.get("bitis", [""])[-1], "bitis")
+        if baslangic > bitis:
+            raise IstekHatasi(400, "baslangic bitişten sonra olamaz")
+        kategori_id = _sorgudan_sayi(sorgu, "kategori_id", None, en_az=None)
+        satirlar = depo.donem_aylik_ozet(baslangic, bitis, kategori_id)
+    else:
+        satirlar = depo.aylik_ozet(_sorgudan_sayi(sorgu, "ay_sayisi", 6))
+    return 200, [{"ay": ay, "tip": tip, "toplam": tl_metni(toplam)} for ay, tip, toplam in satirlar]
+
+
+def kategori_harcamalari_raporu(depo, sorgu):
+    satirlar = depo.kategori_harcamalari(_sorgudan_sayi(sorgu, "gun_sayisi", 30))
+    return 200, [{"kategori": kategori, "toplam": tl_metni(toplam)} for kategori, toplam in satirlar]
+
+
+def gelir_gider_raporu(depo, sorgu):
+    toplamlar = depo.tip_toplamlari()
+    return 200, {tip: tl_metni(toplamlar.get(tip) or 0) for tip in ("Gelir", "Gider")}
+
+
+def islem_ekle(veri, gelecek):
+    satir = islem_girdisi(veri)
+    return _Yazma(lambda depo: depo.islem_ekle(*satir), satir, gelecek)
+
+
+def islemleri_toplu_ekle(veri, gelecek):
+    if not isinstance(veri, list) or not veri:
+        raise IstekHatasi(400, "Gövde boş olmayan bir işlem listesi olmalıdır")
+    satirlar = []
+    for sira, islem in enumerate(veri):
+        try:
+            satirlar.append(islem_girdisi(islem))
+        except IstekHatasi as hata:
+            raise IstekHatasi(400, f"{sira}. işlem: {hata}") from None
+    return _Yazma(lambda depo: depo.islemler_ekle(satirlar), None, gelecek)
+
+
+def islemleri_toplu_sil(veri, gelecek):
+    if not isinstance(veri, dict) or not isinstance(veri.get("idler"), list):
+        raise IstekHatasi(400, "Gövde {\"idler\": [...]} biçiminde olmalıdır")
+    idler = [_tam_sayi(islem_id, "idler") for islem_id in veri["idler"]]
+    return _Yazma(lambda depo: depo.toplu_sil(idler), None, gelecek)
+
+
+def islem_guncelle(veri, gelecek, islem_id):
+    satir = islem_girdisi(veri)
+
+    def guncelle(depo):
+        if depo.islem_getir(islem_id) is None:
+            raise IstekHatasi(404, f"{islem_id} numaralı işlem bulunamadı")
+        depo.islem_guncelle(islem_id, *satir)
+        return depo.islem_getir(islem_id)
+    return _Yazma(guncelle, None, gelecek)
+
+
+def islem_sil(veri, gelecek, islem_id):
+    def sil(depo):
+        if not depo.toplu_sil([islem_id]):
+            raise IstekHatasi(404, f"{islem_id} numaralı işlem bulunamadı")
+    return _Yazma(sil, None, gelecek)
+
+
+# Yazma sonuçlarının yanıta çevrilmesi
+def _eklendi(islem_id):
+    return 201, {"id": islem_id}
+
+
+def _toplu_eklendi(idler):
+    return 201, {"idler": idler}
+
+
+def _silindi(adet):
+    return 200, {"silinen": adet}
+
+
+def _guncellendi(islem):
+    return 200, islem_sozlugu(islem)
+
+
+def _bos(_):
+    return 204, None
+
+
+OKUMA_YOLLARI = [
+    (re.compile(r"/islemler"), islemleri_listele),
+    (re.compile(r"/islemler/(\d+)"), islem_goster),
+    (re.compile(r"/kategoriler"), kategorileri_listele),
+    (re.compile(r"/raporlar/aylik-ozet"), aylik_ozet_raporu),
+    (re.compile(r"/raporlar/kategori-harcamalari"), kategori_harcamalari_raporu),
+    (re.compile(r"/raporlar/gelir-gider"), gelir_gider_raporu),
+]
+
+YAZMA_YOLLARI = [
+    ("POST", re.compile(r"/islemler"), islem_ekle, _eklendi),
+    ("POST", re.compile(r"/islemler/toplu"), islemleri_toplu_ekle, _toplu_eklendi),
+    ("POST", re.compile(r"/islemler/toplu-sil"), islemleri_toplu_sil, _silindi),
+    ("PUT", re.compile(r"/islemler/(\d+)"), islem_guncelle, _guncellendi),
+    ("DELETE", re.compile(r"/islemler/(\d+)"), islem_sil, _bos),
+]
+
+
+# --- Sunucu ---
+
+class ApiSunucusu:
+    """Okuma havuzu, tek yazma iş parçacığı ve toplu yazma kuyruğuyla HTTP/1.1 JSON sunucusu.
+
+    Yazma bağlantısı (BaglantiYoneticisi.yazici) yazma iş parçacığında açılır ve yalnızca orada
+    kullanılır; okuma havuzundaki her iş parçacığı havuzdan bir salt okunur bağlantı ödünç alır.
+    """
+
+    def __init__(self, yol=veritabani.VERITABANI_YOLU, port=VARSAYILAN_PORT, okuyucu_sayisi=OKUYUCU_SAYISI):
+        self.yol = yol
+        self.port = port
+        self.okuyucu_sayisi = okuyucu_sayisi
+        self._okuma_havuzu = ThreadPoolExecutor(okuyucu_sayisi, thread_name_prefix="api-okuma")
+        self._yazma_havuzu = ThreadPoolExecutor(1, thread_name_prefix="api-yazma")
+        self._baglantilar = None
+        self._depo = None
+        self._yazma_kuyrugu = None
+        self._yazici_gorevi = None
+        self._sunucu = None
+        self.istatistik = {"istek": 0, "yazma": 0, "yazma_turu": 0}
+
+    # Yazma iş parçacığında çalışır
+    def _baglan(self):
+        self._baglantilar = veritabani.BaglantiYoneticisi(self.yol, self.okuyucu_sayisi)
+        self._depo = FinansDeposu(self._baglantilar.yazici)
+
+    def _kapat(self):
+        self._baglantilar.kapat()
+
+    async def baslat(self):
+        dongu = asyncio.get_running_loop()
+        await dongu.run_in_executor(self._yazma_havuzu, self._baglan)
+        self._yazma_kuyrugu = asyncio.Queue()
+        self._yazici_gorevi = asyncio.create_task(self._yazici())
+        self._sunucu = await asyncio.start_server(self._baglanti, ADRES, self.port, backlog=BEKLEYEN_BAGLANTI)
+        self.port = self._sunucu.sockets[0].getsockname()[1]
+
+    async def durdur(self):
+        self._sunucu.close()
+        await self._sunucu.wait_closed()
+        self._yazici_gorevi.cancel()
+        dongu = asyncio.get_running_loop()
+        await dongu.run_in_executor(self._yazma_havuzu, self._kapat)
+        self._okuma_havuzu.shutdown()
+        self._yazma_havuzu.shutdown()
+
+    async def hizmet_et(self):
+        """baslat()'tan sonra iptal edilene kadar istekleri karşılar, ardından kapatır"""
+        try:
+            await self._sunucu.serve_forever()
+        finally:
+            await self.durdur()
+
+    # --- Yazma kuyruğu ---
+
+    async def _yazici(self):
+        """Kuyrukta biriken yazmaları turlar halinde yazma iş parçacığına verir"""
+        dongu = asyncio.get_running_loop()
+        while True:
+            parti = [await self._yazma_kuyrugu.get()]
+            while len(parti) < TOPLU_YAZMA_SINIRI and not self._yazma_kuyrugu.empty():
+                parti.append(self._yazma_kuyrugu.get_nowait())
+            sonuclar = await dongu.run_in_executor(self._yazma_havuzu, self._partiyi_yaz, parti)
+            self.istatistik["yazma"] += len(parti)
+            self.istatistik["yazma_turu"] += 1
+            for yazma, (sonuc, hata) in zip(parti, sonuclar):
+                if yazma.gelecek.cancelled():
+                    continue
+                if hata is None:
+                    yazma.gelecek.set_result(sonuc)
+                else:
+                    yazma.gelecek.set_exception(hata)
+
+    def _partiyi_yaz(self, parti):
+        """Her yazma için (sonuç, hata); ardışık tek işlem eklemeleri tek işlemde yazılır.
+
+        Birleştirilmiş ekleme başarısız olursa (ör. bilinmeyen kategori) o grup tek tek yeniden
+        denenir; böylece hatalı istek yalnızca kendisini etkiler.
+        """
+        sonuclar = []
+        i = 0
+        while i < len(parti):
+            j = i
+            while j < len(parti) and parti[j].satir is not None:
+                j += 1
+            if j - i > 1:
+                try:
+                    sonuclar += [(islem_id, None) for islem_id in self._depo.islemler_ekle(
+                        [yazma.satir for yazma in parti[i:j]])]
+                except (DepoHatasi, sqlite3.Error):
+                    sonuclar += [self._tek_yaz(yazma) for yazma in parti[i:j]]
+                i = j
+            else:
+                sonuclar.append(self._tek_yaz(parti[i]))
+                i += 1
+        return sonuclar
+
+    def _tek_yaz(self, yazma):
+        try:
+            return yazma.islem(self._depo), None
+        except Exception as hata:
+            return None, hata
+
+    # --- Okumalar ---
+
+    def _oku(self, isleyici, sorgu, argumanlar):
+        with self._baglantilar.okuyucu() as conn:
+            return isleyici(FinansDeposu(conn), sorgu, *argumanlar)
+
+    # --- HTTP ---
+
+    async def _yonlendir(self, yontem, hedef, govde):
+        adres = urlsplit(hedef)
+        yol = adres.path.rstrip("/") or "/"
+        izinli = set()
+        if yontem in ("GET", "HEAD"):
+            for desen, isleyici in OKUMA_YOLLARI:
+                eslesme = desen.fullmatch(yol)
+                if eslesme:
+                    argumanlar = tuple(int(grup) for grup in eslesme.groups())
+                    return await asyncio.get_running_loop().run_in_executor(
+                        self._okuma_havuzu, self._oku, isleyici, parse_qs(adres.query), argumanlar)
+        else:
+            for yazma_yontemi, desen, isleyici, yanit in YAZMA_YOLLARI:
+                eslesme = desen.fullmatch(yol)
+                if not eslesme:
+                    continue
+                if yazma_yontemi != yontem:
+                    izinli.add(yazma_yontemi)
+                    continue
+                try:
+                    veri = json.loads(govde) if govde else None
+                except (UnicodeDecodeError, json.JSONDecodeError):
+                    raise IstekHatasi(400, "Gövde geçerli bir JSON değil") from None
+                gelecek = asyncio.get_running_loop().create_future()
+                argumanlar = tuple(int(grup) for grup in eslesme.groups())
+                await self._yazma_kuyrugu.put(isleyici(veri, gelecek, *argumanlar))
+                return yanit(await gelecek)
+        if izinli or any(desen.fullmatch(yol) for desen, _ in OKUMA_YOLLARI):
+            raise IstekHatasi(405, f"{yontem} bu adreste desteklenmiyor")
+        raise IstekHatasi(404, f"{yol} bulunamadı")
+
+    async def _baglanti(self, okuyucu, yazici):
+        """Bir istemci bağlantısı; HTTP/1.1 keep-alive ile sırayla birden çok istek"""
+        try:
+            while True:
+                try:
+                    istek_satiri = await okuyucu.readline()
+                    if not istek_satiri.strip():
+                        break
+                    yontem, hedef, surum = istek_satiri.decode("latin-1").split()
+                    basliklar = {}
+                    while True:
+                        satir = await okuyucu.readline()
+                        if satir in (b"\r\n", b"\n", b""):
+                            break
+                        ad, _, deger = satir.decode("latin-1").partition(":")
+                        basliklar[ad.strip().lower()] = deger.strip()
+                    uzunluk = int(basliklar.get("content-length") or 0)
+                    if uzunluk < 0:
+                        raise ValueError(uzunluk)
+                except (ValueError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+                    await self._yanitla(yazici, 400, {"hata": "Geçersiz HTTP isteği"}, kapat=True)
+                    break
+
+                baglanti = basliklar.get("connection", "").lower()
+                kapat = baglanti == "close" or (surum == "HTTP/1.0" and baglanti != "keep-alive")
+                if uzunluk > EN_BUYUK_GOVDE:
+                    await self._yanitla(yazici, 413, {"hata": "Gövde çok büyük"}, kapat=True)
+                    break
+                govde = await okuyucu.readexactly(uzunluk) if uzunluk else b""
+
+                self.istatistik["istek"] += 1
+                try:
+                    durum, veri = await self._yonlendir(yontem.upper(), hedef, govde)
+                except IstekHatasi as hata:
+                    durum, veri = hata.durum, {"hata": str(hata)}
+                except (DepoHatasi, ValueError) as hata:
+                    durum, veri = 400, {"hata": str(hata)}
+                except Exception as hata:
+                    durum, veri = 500, {"hata": f"{type(hata).__name__}: {hata}"}
+                await self._yanitla(yazici, durum, veri, kapat, govdesiz=yontem.upper() == "HEAD")
+                if kapat:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            yazici.close()
+
+    @staticmethod
+    async def _yanitla(yazici, durum, veri, kapat=False, govdesiz=False):
+        govde = b"" if veri is None else json.dumps(veri, ensure_ascii=False).encode("utf-8")
+        basliklar = [f"HTTP/1.1 {durum} {HTTPStatus(durum).phrase}",
+                     f"Content-Length: {len(govde)}"]
+        if veri is not None:
+            basliklar.append("Content-Type: application/json; charset=utf-8")
+        if kapat:
+            basliklar.append("Connection: close")
+        yazici.write(("\r\n".join(basliklar) + "\r\n\r\n").encode("latin-1") + (b"" if govdesiz else govde))
+        await yazici.drain()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Defter için yerel JSON API sunucusu")
+    parser.add_argument("--veritabani", default=veritabani.VERITABANI_YOLU, help="Veritabanı dosyası")
+    parser.add_argument("--port", type=int, default=VARSAYILAN_PORT, help=f"Dinlenecek port ({ADRES} üzerinde)")
+    parser.add_argument("--okuyucu", type=int, default=OKUYUCU_SAYISI, help="Paralel okuma bağlantısı sayısı")
+    args = parser.parse_args()
+
+    async def ana():
+        sunucu = ApiSunucusu(args.veritabani, args.port, args.okuyucu)
+        await sunucu.baslat()
+        print(f"http://{ADRES}:{sunucu.port} dinleniyor (Ctrl+C ile çıkış)")
+        await sunucu.hizmet_et()
+
+    try:
+        asyncio.run(ana())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,316 @@
+"""Tanılama: SQL zamanlama kancası, yavaş sorgu günlüğü, olay döngüsü gecikmesi ve rapor aşama süreleri
+
+Tüm bağlantılar veritabani modülünde ZamanliBaglanti sınıfıyla açılır; her execute/executemany
+ifadesi, süresi ve satır sayısıyla kaydedilir. SELECT'lerde satırlar sonradan okunduğu için
+okuma süresi ve satır sayısı imleçte biriktirilip imleç tükenince aynı kayda eklenir; satır
+satır yineleme yalnızca satır sayımı açıkken (Tanılama sekmesi görünürken) ölçülür. Kayıtlar iş parçacığı güvenli
+tek bir Tanilama nesnesinde (TANILAMA) tutulur; Tk'ye bağımlı değildir.
+"""
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+VARSAYILAN_YAVAS_ESIK_MS = 50.0
+SON_SORGU_SAYISI = 500
+YAVAS_SORGU_SAYISI = 200
+GECIKME_ORNEK_SAYISI = 600
+RAPOR_OLCUM_SAYISI = 100
+
+_BOSLUK = re.compile(r"\s+")
+
+
+def _sorgu_metni(sql):
+    return _BOSLUK.sub(" ", sql).strip()
+
+
+class SorguKaydi:
+    """Tek bir SQL ifadesinin zamanlaması; SELECT satırları okundukça sure_ms ve satir artar"""
+
+    __slots__ = ("zaman", "sql", "sure_ms", "satir", "yavas")
+
+    def __init__(self, sql):
+        self.zaman = time.time()
+        self.sql = sql
+        self.sure_ms = 0.0
+        self.satir = 0
+        self.yavas = False
+
+    def sozluk(self):
+        return {"zaman": datetime.fromtimestamp(self.zaman).isoformat(timespec="milliseconds"),
+                "sql": self.sql, "sure_ms": round(self.sure_ms, 3), "satir": self.satir}
+
+
+class RaporOlcumu:
+    """Bir rapor gösteriminin aşama süreleri (ms); önbellekten gelen raporda sorgu/pandas boştur"""
+
+    __slots__ = ("zaman", "rapor", "sorgu_ms", "pandas_ms", "grafik_ms", "cizim_ms", "onbellekten")
+
+    def __init__(self, rapor, onbellekten=False):
+        self.zaman = time.time()
+        self.rapor = rapor
+        self.sorgu_ms = self.pandas_ms = self.grafik_ms = self.cizim_ms = None
+        self.onbellekten = onbellekten
+
+    def sozluk(self):
+        return {"zaman": datetime.fromtimestamp(self.zaman).isoformat(timespec="seconds"), "rapor": self.rapor,
+                "sorgu_ms": self.sorgu_ms, "pandas_ms": self.pandas_ms, "grafik_ms": self.grafik_ms,
+                "cizim_ms": self.cizim_ms, "onbellekten": self.onbellekten}
+
+
+class _SqlSuresi:
+    """sql_suresi() bloğunda bu iş parçacığının SQL'de geçirdiği toplam süre"""
+
+    def __init__(self):
+        self.ms = 0.0
+
+    def __enter__(self):
+        _yerel.olcum = self
+        return self
+
+    def __exit__(self, *hata):
+        _yerel.olcum = None
+
+
+_yerel = threading.local()
+
+
+class Tanilama:
+    def __init__(self, yavas_esik_ms=VARSAYILAN_YAVAS_ESIK_MS):
+        self.yavas_esik_ms = yavas_esik_ms
+        # Açıkken imleçler satır satır yinelemeyi de zamanlar (satır başına ek maliyet);
+        # arayüz yalnızca Tanılama sekmesi görünürken açar
+        self.satir_sayimi = False
+        self._kilit = threading.Lock()
+        self.son_sorgular = deque(maxlen=SON_SORGU_SAYISI)
+        self.yavas_sorgular = deque(maxlen=YAVAS_SORGU_SAYISI)
+        self.istatistikler = {}  # sorgu metni -> [adet, toplam_ms, en_fazla_ms, satir]
+        self.gecikmeler = deque(maxlen=GECIKME_ORNEK_SAYISI)  # (zaman, ms)
+        self.rapor_olcumleri = deque(maxlen=RAPOR_OLCUM_SAYISI)
+
+    # --- SQL ---
+
+    def sorgu(self, sql, sure_ms, satir):
+        """Yeni bir ifade kaydı oluşturur; satir, SELECT'lerde -1 olan imleç rowcount değeridir"""
+        kayit = SorguKaydi(_sorgu_metni(sql))
+        with self._kilit:
+            self.son_sorgular.append(kayit)
+            istatistik = self.istatistikler.setdefault(kayit.sql, [0, 0.0, 0.0, 0])
+            istatistik[0] += 1
+            self._sure_ekle(kayit, istatistik, sure_ms, max(satir, 0))
+        return kayit
+
+    def okuma(self, kayit, sure_ms, satir):
+        """SELECT sonuçları okunurken geçen süreyi ve satırları kayda ekler"""
+        with self._kilit:
+            self._sure_ekle(kayit, self.istatistikler.setdefault(kayit.sql, [1, 0.0, 0.0, 0]), sure_ms, satir)
+
+    def _sure_ekle(self, kayit, istatistik, sure_ms, satir):
+        kayit.sure_ms += sure_ms
+        kayit.satir += satir
+        istatistik[1] += sure_ms
+        istatistik[2] = max(istatistik[2], kayit.sure_ms)
+        istatistik[3] += satir
+        olcum = getattr(_yerel, "olcum", None)
+        if olcum is not None:
+            olcum.ms += sure_ms
+        if not kayit.yavas and kayit.sure_ms >= self.yavas_esik_ms:
+            kayit.yavas = True
+            self.yavas_sorgular.append(kayit)
+
+    def sql_suresi(self):
+        """with TANILAMA.sql_suresi() as olcum: ... -> olcum.ms, bu iş parçacığının SQL süresi"""
+        return _SqlSuresi()
+
+    def en_pahali_sorgular(self, adet=50):
+        """(sorgu, adet, toplam_ms, ortalama_ms, en_fazla_ms, satır) listesi, toplam süreye göre"""
+        with self._kilit:
+            satirlar = [(sql, a, toplam, toplam / a, en_fazla, satir)
+                        for sql, (a, toplam, en_fazla, satir) in self.istatistikler.items()]
+        satirlar.sort(key=lambda satir: satir[2], reverse=True)
+        return satirlar[:adet]
+
+    # --- Olay döngüsü ve raporlar ---
+
+    def gecikme(self, ms):
+        self.gecikmeler.append((time.time(), ms))
+
+    def gecikme_ozeti(self):
+        """(son, en_fazla, p95, örnek sayısı) ms; örnek yoksa None"""
+        degerler = [ms for _, ms in list(self.gecikmeler)]
+        if not degerler:
+            return None
+        sirali = sorted(degerler)
+        return degerler[-1], sirali[-1], sirali[min(len(sirali) - 1, int(len(sirali) * 0.95))], len(sirali)
+
+    def rapor_olcumu(self, rapor, onbellekten=False):
+        olcum = RaporOlcumu(rapor, onbellekten)
+        self.rapor_olcumleri.append(olcum)
+        return olcum
+
+    # --- Genel ---
+
+    def temizle(self):
+        with self._kilit:
+            self.son_sorgular.clear()
+            self.yavas_sorgular.clear()
+            self.istatistikler.clear()
+        self.gecikmeler.clear()
+        self.rapor_olcumleri.clear()
+
+    def disa_aktar(self, yol):
+        """Tüm kayıtları JSON dosyasına yazar"""
+        ozet = self.gecikme_ozeti()
+        with self._kilit:
+            veri = {
+                "zaman": datetime.now().isoformat(timespec="seconds"),
+                "yavas_esik_ms": self.yavas_esik_ms,
+                "yavas_sorgular": [kayit.sozluk() for kayit in self.yavas_sorgular],
+                "son_sorgular": [kayit.sozluk() for kayit in self.son_sorgular],
+            }
+        veri["sorgu_istatistikleri"] = [
+            {"sql": sql, "adet": adet, "toplam_ms": round(toplam, 3), "ortalama_ms": round(ortalama, 3),
+             "en_fazla_ms": round(en_fazla, 3), "satir": satir}
+            for sql, adet, toplam, ortalama, en_fazla, satir in self.en_pahali_sorgular(len(self.istatistikler))]
+        veri["olay_dongusu"] = None if ozet is None else dict(zip(("son_ms", "en_fazla_ms", "p95_ms", "ornek"), ozet))
+        veri["rapor_olcumleri"] = [olcum.sozluk() for olcum in list(self.rapor_olcumleri)]
+        with open(yol, "w", encoding="utf-8") as dosya:
+            json.dump(veri, dosya, ensure_ascii=False, indent=2)
+
+
+TANILAMA = Tanilama()
+
+
+class ZamanliImlec(sqlite3.Cursor):
+    """Her ifadeyi TANILAMA'ya kaydeden imleç.
+
+    execute süresi ifade başına bir kez kaydedilir. fetch* çağrılarının süresi ve satır sayısı
+    imlecin üzerinde kilitsiz biriktirilir ve kayda tek seferde eklenir: imleç tükenince,
+    kapatılınca, yeniden execute edilince ya da bırakılınca. Satır satır yineleme (for satir in
+    imlec) burada zamanlanmaz; böylece yineleme SQLite'ın C yolundan ek maliyetsiz geçer
+    (bkz. SatirSayanImlec).
+    """
+
+    _kayit = None
+    _okuma_ms = 0.0
+    _okunan = 0
+
+    def _zamanla(self, yontem, sql, *argumanlar):
+        self._okumayi_yaz()
+        baslangic = time.perf_counter()
+        try:
+            return yontem(sql, *argumanlar)
+        finally:
+            self._kayit = TANILAMA.sorgu(sql, (time.perf_counter() - baslangic) * 1000, self.rowcount)
+
+    def execute(self, sql, parametreler=()):
+        return self._zamanla(super().execute, sql, parametreler)
+
+    def executemany(self, sql, parametreler):
+        return self._zamanla(super().executemany, sql, parametreler)
+
+    def executescript(self, betik):
+        return self._zamanla(super().executescript, betik)
+
+    def _okumayi_yaz(self):
+        """Biriken okuma süresini ve satırlarını ifadenin kaydına ekler"""
+        if self._kayit is not None and (self._okunan or self._okuma_ms):
+            TANILAMA.okuma(self._kayit, self._okuma_ms, self._okunan)
+        self._okuma_ms, self._okunan = 0.0, 0
+
+    def _okundu(self, baslangic, satir, tukendi):
+        self._okuma_ms += (time.perf_counter() - baslangic) * 1000
+        self._okunan += satir
+        if tukendi:
+            self._okumayi_yaz()
+
+    def fetchone(self):
+        baslangic = time.perf_counter()
+        satir = super().fetchone()
+        self._okundu(baslangic, satir is not None, satir is None)
+        return satir
+
+    def fetchmany(self, size=None):
+        size = self.arraysize if size is None else size
+        baslangic = time.perf_counter()
+        satirlar = super().fetchmany(size)
+        self._okundu(baslangic, len(satirlar), len(satirlar) < size)
+        return satirlar
+
+    def fetchall(self):
+        baslangic = time.perf_counter()
+        satirlar = super().fetchall()
+        self._okundu(baslangic, len(satirlar), True)
+        return satirlar
+
+    def close(self):
+        self._okumayi_yaz()
+        super().close()
+
+    def __del__(self):
+        self._okumayi_yaz()
+
+
+class SatirSayanImlec(ZamanliImlec):
+    """Yinelenen satırları da zamanlayıp sayan imleç; yalnızca TANILAMA.satir_sayimi açıkken kullanılır"""
+
+    def __next__(self):
+        baslangic = time.perf_counter()
+        try:
+            satir = super().__next__()
+        except StopIteration:
+            self._okundu(baslangic, 0, True)
+            raise
+        self._okundu(baslangic, 1, False)
+        return satir
+
+
+class ZamanliBaglanti(sqlite3.Connection):
+    """sqlite3.connect(..., factory=ZamanliBaglanti): execute kısayolları ve imleçler zamanlanır"""
+
+    def cursor(self, factory=None):
+        if factory is None:
+            factory = SatirSayanImlec if TANILAMA.satir_sayimi else ZamanliImlec
+        return super().cursor(factory)
+
+    def execute(self, sql, parametreler=()):
+        return self.cursor().execute(sql, parametreler)
+
+    def executemany(self, sql, parametreler):
+        return self.cursor().executemany(sql, parametreler)
+
+    def executescript(self, betik):
+        return self.cursor().executescript(betik)
+
+
+class OlayDonguIzleyici:
+    """root.after zamanlayıcısının sapmasıyla Tk olay döngüsü gecikmesini ölçer.
+
+    Her aralik_ms'de bir uyanmak üzere kurulur; beklenenden geç uyanma süresi, ana iş
+    parçacığını o süre boyunca meşgul eden işin (ve kullanıcının hissettiği donmanın) ölçüsüdür.
+    """
+
+    def __init__(self, root, aralik_ms=100, tanilama=TANILAMA):
+        self.root = root
+        self.aralik_ms = aralik_ms
+        self.tanilama = tanilama
+        self._beklenen = None
+        self._zamanlayici = None
+
+    def baslat(self):
+        self._beklenen = time.perf_counter() + self.aralik_ms / 1000
+        self._zamanlayici = self.root.after(self.aralik_ms, self._uyan)
+
+    def durdur(self):
+        if self._zamanlayici is not None:
+            self.root.after_cancel(self._zamanlayici)
+            self._zamanlayici = None
+
+    def _uyan(self):
+        simdi = time.perf_counter()
+        self.tanilama.gecikme(max(0.0, (simdi - self._beklenen) * 1000))
+        self._beklenen = simdi + self.aralik_ms / 1000
+        self._zamanlayici = self.root.after(self.aralik_ms, self._uyan)
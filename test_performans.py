@@ -0,0 +1,56 @@
+"""Performans araçlarının temel doğrulukları: sentetik veri, içe aktarmanın geri alınması, grafik belleği
+
+    python -m pytest -q test_performans.py
+"""
+from datetime import date
+
+import pytest
+
+import veritabani
+from ice_aktarma import EkstreSatiri, ice_aktar
+from sentetik import sentetik_satirlar
+
+BITIS = date(2024, 12, 31)
+
+
+def test_sentetik_satirlar_ayni_tohumla_ayni():
+    ilk = list(sentetik_satirlar(2000, tohum=7, yil_sayisi=2, bitis=BITIS))
+    assert ilk == list(sentetik_satirlar(2000, tohum=7, yil_sayisi=2, bitis=BITIS))
+    assert ilk != list(sentetik_satirlar(2000, tohum=8, yil_sayisi=2, bitis=BITIS))
+    assert len(ilk) == 2000
+    assert [satir.tarih for satir in ilk] == sorted(satir.tarih for satir in ilk)
+    assert ilk[-1].tarih <= BITIS.isoformat()
+
+
+def test_ice_aktar_hatada_hepsini_geri_alir(tmp_path):
+    conn = veritabani.baglan(tmp_path / "finans.db")
+    try:
+        def tablolar():
+            return [conn.execute(f"SELECT * FROM {tablo} ORDER BY 1, 2").fetchall()
+                    for tablo in ("islemler", "kategoriler", "aylik_toplamlar", "gunluk_toplamlar")]
+
+        ice_aktar(conn, sentetik_satirlar(50, bitis=BITIS))
+        once = tablolar()
+
+        def satirlar():
+            # İlk parçalar (ve yeni bir kategori) yazıldıktan sonra hata
+            yield from sentetik_satirlar(250, tohum=1, bitis=BITIS)
+            yield EkstreSatiri("2024-06-01", 1000, "yeni", "Geçici Kategori", "Gider")
+            yield EkstreSatiri("2024-13-45", 1000, "bozuk tarih", None, "Gider")
+
+        with pytest.raises(ValueError):
+            ice_aktar(conn, satirlar(), parca_boyutu=100)
+        assert not conn.in_transaction
+        assert tablolar() == once
+    finally:
+        conn.close()
+
+
+def test_grafik_bellegi_sabit():
+    matplotlib = pytest.importorskip("matplotlib")
+    pytest.importorskip("pandas")
+    matplotlib.use("Agg")
+    from grafikler import bellek_kontrolu
+
+    baslangic_kb, bitis_kb, sanatci_farki, gecerli = bellek_kontrolu(cizim_sayisi=12, isinma=4)
+    assert gecerli, (baslangic_kb, bitis_kb, sanatci_farki)
@@ -0,0 +1,605 @@
+"""Veritabanı bağlantısı ve sürümlü şema göçleri (PRAGMA user_version)"""
+import hashlib
+import os
+import pathlib
+import queue
+import sqlite3
+import unicodedata
+from contextlib import contextmanager
+from datetime import date
+from functools import lru_cache
+
+from tanilama import ZamanliBaglanti
+
+VERITABANI_YOLU = os.path.join("data", "finans.db")
+
+# Her bağlantıya uygulanan ayarlar. WAL'da synchronous=NORMAL her commit'te değil yalnızca
+# checkpoint'te fsync yapar; bir çökme en fazla son commit'leri kaybettirir, dosyayı bozmaz.
+BAGLANTI_AYARLARI = {
+    "busy_timeout": 5000,  # ms; kilitli veritabanında hemen hata vermek yerine bekle
+    "cache_size": -16000,  # negatif değer KiB: bağlantı başına ~16 MB sayfa önbelleği
+    "temp_store": "MEMORY",
+}
+YAZICI_AYARLARI = {
+    "journal_mode": "WAL",  # Okuyucular yazıcıyı, yazıcı okuyucuları beklemez
+    "synchronous": "NORMAL",
+}
+
+VARSAYILAN_KATEGORILER = [
+    ("Market", "Gider"), ("Kira", "Gider"), ("Faturalar", "Gider"), ("Ulaşım", "Gider"),
+    ("Eğlence", "Gider"), ("Sağlık", "Gider"), ("Diğer Giderler", "Gider"),
+    ("Maaş", "Gelir"), ("Ek Gelir", "Gelir"), ("Hediye", "Gelir"), ("Yatırım", "Gelir"), ("Diğer Gelirler", "Gelir"),
+]
+
+
+# date.toordinal() ile Jülyen gün numarası arasındaki fark; SQLite date(gun) bu sayıyı doğrudan tarihe çevirir
+JULYEN_FARKI = 1721425
+
+
+class VeritabaniHatasi(Exception):
+    """Veritabanı şeması uygulamanın beklediği sürümle uyuşmadığında oluşur"""
+
+
+def gun_numarasi(tarih):
+    """'YYYY-AA-GG' tarihini islemler.gun sütununun Jülyen gün numarasına çevirir; geçersiz tarihte ValueError"""
+    return date.fromisoformat(tarih).toordinal() + JULYEN_FARKI
+
+
+# Türkçe harfler tabloyla sadeleştirilir; geriye ASCII dışı harf kalırsa Unicode ayrıştırmasına düşülür
+_TURKCE_SADE = str.maketrans("çğıöşüâîûÇĞİÖŞÜÂÎÛ", "cgiosuaiuCGIOSUAIU")
+
+
+@lru_cache(maxsize=8192)
+def aciklama_normalize(aciklama):
+    """Açıklamayı karşılaştırma için sadeleştirir: büyük/küçük harf, Türkçe aksanlar ve boşluk farkları yok sayılır.
+
+    Ekstrelerde aynı açıklamalar (satıcı adları) sık tekrarlandığından sonuçlar önbelleğe alınır.
+    """
+    metin = (aciklama or "").translate(_TURKCE_SADE)
+    if not metin.isascii():
+        metin = "".join(harf for harf in unicodedata.normalize("NFKD", metin) if not unicodedata.combining(harf))
+    return " ".join(metin.casefold().split())
+
+
+def parmak_izi(gun, miktar, kategori_id, tip, aciklama):
+    """İşlemin (gun, miktar, kategori, tip, sadeleştirilmiş açıklama) alanlarından islemler.parmak_izi değeri.
+
+    blake2b'nin 8 baytlık özeti işaretli tam sayı olarak SQLite INTEGER'a sığar; aynı alanlı
+    işlemler aynı değeri alır, farklı işlemlerin çakışma olasılığı ihmal edilebilir düzeydedir.
+    """
+    metin = f"{gun}\x1f{miktar}\x1f{kategori_id or 0}\x1f{tip}\x1f{aciklama_normalize(aciklama)}"
+    return int.from_bytes(hashlib.blake2b(metin.encode(), digest_size=8).digest(), "big", signed=True)
+
+
+def _goc_1_tablolar(conn):
+    """Temel tablolar (uygulamanın ilk sürümündeki şema)"""
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS kategoriler (
+        id INTEGER PRIMARY KEY,
+        ad TEXT NOT NULL,
+        tip TEXT NOT NULL
+    )
+    ''')
+
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS islemler (
+        id INTEGER PRIMARY KEY,
+        tarih TEXT NOT NULL,
+        miktar REAL NOT NULL,
+        aciklama TEXT,
+        kategori_id INTEGER,
+        tip TEXT NOT NULL,
+        FOREIGN KEY (kategori_id) REFERENCES kategoriler (id)
+    )
+    ''')
+
+
+def _goc_2_indeksler(conn):
+    """Sık sorgulanan sütunlara indeks ve kategoriler(ad, tip) için tekillik kısıtı"""
+    # Tekillik kısıtından önce yinelenen kategorileri en küçük id'li kayıtta birleştir
+    conn.execute('''
+    UPDATE islemler
+    SET kategori_id = (
+        SELECT MIN(k2.id) FROM kategoriler k1
+        JOIN kategoriler k2 ON k2.ad = k1.ad AND k2.tip = k1.tip
+        WHERE k1.id = islemler.kategori_id
+    )
+    WHERE kategori_id IN (
+        SELECT k.id FROM kategoriler k
+        WHERE k.id > (SELECT MIN(id) FROM kategoriler WHERE ad = k.ad AND tip = k.tip)
+    )
+    ''')
+    conn.execute('''
+    DELETE FROM kategoriler
+    WHERE id > (SELECT MIN(k2.id) FROM kategoriler k2 WHERE k2.ad = kategoriler.ad AND k2.tip = kategoriler.tip)
+    ''')
+
+    conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS ux_kategoriler_ad_tip ON kategoriler (ad, tip)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_islemler_tarih ON islemler (tarih)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_islemler_tip_tarih ON islemler (tip, tarih)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_islemler_kategori ON islemler (kategori_id)")
+
+
+def _goc_3_varsayilan_kategoriler(conn):
+    """Varsayılan kategorileri tek bir ifadeyle ekler (mevcut olanlar tekillik kısıtı sayesinde atlanır)"""
+    degerler = ", ".join("(?, ?)" for _ in VARSAYILAN_KATEGORILER)
+    conn.execute(f"INSERT OR IGNORE INTO kategoriler (ad, tip) VALUES {degerler}",
+                 [alan for kategori in VARSAYILAN_KATEGORILER for alan in kategori])
+
+
+def _goc_4_aylik_toplamlar(conn):
+    """(ay, tip, kategori_id) bazında tetikleyicilerle güncel tutulan özet tablosu"""
+    conn.execute('''
+    CREATE TABLE aylik_toplamlar (
+        ay TEXT NOT NULL,
+        tip TEXT NOT NULL,
+        kategori_id INTEGER NOT NULL,
+        toplam REAL NOT NULL,
+        adet INTEGER NOT NULL,
+        PRIMARY KEY (ay, tip, kategori_id)
+    ) WITHOUT ROWID
+    ''')
+
+    # Kategorisiz işlemler özet tablosunda kategori_id = 0 altında toplanır
+    conn.execute('''
+    CREATE TRIGGER trg_islemler_toplam_ekle AFTER INSERT ON islemler
+    BEGIN
+        INSERT INTO aylik_toplamlar (ay, tip, kategori_id, toplam, adet)
+        VALUES (strftime('%Y-%m', NEW.tarih), NEW.tip, IFNULL(NEW.kategori_id, 0), NEW.miktar, 1)
+        ON CONFLICT (ay, tip, kategori_id) DO UPDATE SET toplam = toplam + excluded.toplam, adet = adet + 1;
+    END
+    ''')
+    conn.execute('''
+    CREATE TRIGGER trg_islemler_toplam_sil AFTER DELETE ON islemler
+    BEGIN
+        UPDATE aylik_toplamlar SET toplam = toplam - OLD.miktar, adet = adet - 1
+        WHERE ay = strftime('%Y-%m', OLD.tarih) AND tip = OLD.tip AND kategori_id = IFNULL(OLD.kategori_id, 0);
+        DELETE FROM aylik_toplamlar
+        WHERE ay = strftime('%Y-%m', OLD.tarih) AND tip = OLD.tip AND kategori_id = IFNULL(OLD.kategori_id, 0)
+          AND adet = 0;
+    END
+    ''')
+    conn.execute('''
+    CREATE TRIGGER trg_islemler_toplam_guncelle AFTER UPDATE OF tarih, miktar, kategori_id, tip ON islemler
+    BEGIN
+        UPDATE aylik_toplamlar SET toplam = toplam - OLD.miktar, adet = adet - 1
+        WHERE ay = strftime('%Y-%m', OLD.tarih) AND tip = OLD.tip AND kategori_id = IFNULL(OLD.kategori_id, 0);
+        DELETE FROM aylik_toplamlar
+        WHERE ay = strftime('%Y-%m', OLD.tarih) AND tip = OLD.tip AND kategori_id = IFNULL(OLD.kategori_id, 0)
+          AND adet = 0;
+        INSERT INTO aylik_toplamlar (ay, tip, kategori_id, toplam, adet)
+        VALUES (strftime('%Y-%m', NEW.tarih), NEW.tip, IFNULL(NEW.kategori_id, 0), NEW.miktar, 1)
+        ON CONFLICT (ay, tip, kategori_id) DO UPDATE SET toplam = toplam + excluded.toplam, adet = adet + 1;
+    END
+    ''')
+
+    conn.execute('''
+    INSERT INTO aylik_toplamlar (ay, tip, kategori_id, toplam, adet)
+    SELECT strftime('%Y-%m', tarih), tip, IFNULL(kategori_id, 0), SUM(miktar), COUNT(*)
+    FROM islemler
+    GROUP BY 1, 2, 3
+    ''')
+
+
+def _tabloyu_yeniden_kur(conn, tablo, yeni_tanim, hedef_sutunlar, kaynak_ifadeleri):
+    """Sütun tipi değişikliği gibi ALTER TABLE ile yapılamayan şema değişikliklerini uygular.
+
+    Yeni tablo geçici adla oluşturulup veriler kaynak_ifadeleri ile kopyalanır, eski tablo
+    silinip yenisi yeniden adlandırılır; eski tablonun indeks ve tetikleyicileri aynen geri yüklenir.
+    yeni_tanim, tablo adı yerine {tablo} yer tutucusunu içermelidir.
+    """
+    ekler = [sql for (sql,) in conn.execute(
+        "SELECT sql FROM sqlite_master WHERE tbl_name = ? AND type IN ('index', 'trigger') AND sql IS NOT NULL",
+        (tablo,))]
+
+    gecici = f"{tablo}_yeni"
+    conn.execute(yeni_tanim.format(tablo=gecici))
+    conn.execute(f"INSERT INTO {gecici} ({', '.join(hedef_sutunlar)}) "
+                 f"SELECT {', '.join(kaynak_ifadeleri)} FROM {tablo}")
+    conn.execute(f"DROP TABLE {tablo}")
+    conn.execute(f"ALTER TABLE {gecici} RENAME TO {tablo}")
+    for sql in ekler:
+        conn.execute(sql)
+
+
+def _goc_5_kurus(conn):
+    """Tutarları REAL TL yerine INTEGER kuruş olarak saklar"""
+    _tabloyu_yeniden_kur(conn, "islemler", '''
+    CREATE TABLE {tablo} (
+        id INTEGER PRIMARY KEY,
+        tarih TEXT NOT NULL,
+        miktar INTEGER NOT NULL,
+        aciklama TEXT,
+        kategori_id INTEGER,
+        tip TEXT NOT NULL,
+        FOREIGN KEY (kategori_id) REFERENCES kategoriler (id)
+    )
+    ''', ["id", "tarih", "miktar", "aciklama", "kategori_id", "tip"],
+        ["id", "tarih", "CAST(ROUND(miktar * 100) AS INTEGER)", "aciklama", "kategori_id", "tip"])
+
+    # Özet toplamlarını kayan nokta birikimi taşımaması için kuruş cinsinden baştan hesapla
+    conn.execute("DROP TABLE aylik_toplamlar")
+    conn.execute('''
+    CREATE TABLE aylik_toplamlar (
+        ay TEXT NOT NULL,
+        tip TEXT NOT NULL,
+        kategori_id INTEGER NOT NULL,
+        toplam INTEGER NOT NULL,
+        adet INTEGER NOT NULL,
+        PRIMARY KEY (ay, tip, kategori_id)
+    ) WITHOUT ROWID
+    ''')
+    conn.execute('''
+    INSERT INTO aylik_toplamlar (ay, tip, kategori_id, toplam, adet)
+    SELECT strftime('%Y-%m', tarih), tip, IFNULL(kategori_id, 0), SUM(miktar), COUNT(*)
+    FROM islemler
+    GROUP BY 1, 2, 3
+    ''')
+
+
+def _goc_6_aciklama_arama(conn):
+    """Açıklamalarda tam metin arama için FTS5 dizini ve arama filtreleri için indeksler.
+
+    islemler_fts içeriksiz (content='') bir dizindir: metnin kopyasını tutmaz, yalnızca
+    rowid = islemler.id olacak şekilde sözcük dizinini saklar ve tetikleyicilerle eş tutulur.
+    unicode61 büyük/küçük harfi ve aksanları (ş/s, ç/c, ö/o, ü/u, ğ/g) eşler; Türkçe noktasız
+    ı bunların dışında kaldığından dizine i olarak yazılır (arama metni de depo.fts_sorgusu'nda).
+    """
+    conn.execute('''
+    CREATE VIRTUAL TABLE islemler_fts USING fts5(
+        aciklama,
+        content = '',
+        tokenize = 'unicode61 remove_diacritics 2'
+    )
+    ''')
+    conn.execute('''
+    CREATE TRIGGER trg_islemler_fts_ekle AFTER INSERT ON islemler
+    BEGIN
+        INSERT INTO islemler_fts (rowid, aciklama) VALUES (NEW.id, replace(NEW.aciklama, 'ı', 'i'));
+    END
+    ''')
+    conn.execute('''
+    CREATE TRIGGER trg_islemler_fts_sil AFTER DELETE ON islemler
+    BEGIN
+        INSERT INTO islemler_fts (islemler_fts, rowid, aciklama)
+        VALUES ('delete', OLD.id, replace(OLD.aciklama, 'ı', 'i'));
+    END
+    ''')
+    conn.execute('''
+    CREATE TRIGGER trg_islemler_fts_guncelle AFTER UPDATE OF aciklama ON islemler
+    BEGIN
+        INSERT INTO islemler_fts (islemler_fts, rowid, aciklama)
+        VALUES ('delete', OLD.id, replace(OLD.aciklama, 'ı', 'i'));
+        INSERT INTO islemler_fts (rowid, aciklama) VALUES (NEW.id, replace(NEW.aciklama, 'ı', 'i'));
+    END
+    ''')
+    conn.execute("INSERT INTO islemler_fts (rowid, aciklama) SELECT id, replace(aciklama, 'ı', 'i') FROM islemler")
+
+    # Kategori filtresi tarih sırasıyla sayfalanabilsin; eski tek sütunlu indeks bunun öneki
+    conn.execute("DROP INDEX IF EXISTS idx_islemler_kategori")
+    conn.execute("CREATE INDEX idx_islemler_kategori_tarih ON islemler (kategori_id, tarih)")
+    conn.execute("CREATE INDEX idx_islemler_miktar ON islemler (miktar)")
+
+
+def _goc_7_gun_numarasi(conn):
+    """Tarihi metin yerine tam sayı Jülyen gün numarası (gun) olarak saklar.
+
+    tarih, date(gun) ile hesaplanan sanal bir sütun olarak kalır; okuma sorguları değişmez,
+    yazmalar ve aralık/sıralama koşulları gun üzerinden yapılır. Yıl-ay (ay) saklanan üretilmiş
+    bir sütundur ve (ay, tip, kategori_id, miktar) kapsayan indeksiyle aylık gruplamalar tabloya
+    dokunmadan yalnızca indeksten okunur. Geçersiz tarihli kayıt varsa göç uygulanmaz.
+    """
+    hatali = conn.execute(
+        "SELECT id, tarih FROM islemler WHERE date(tarih) IS NULL OR date(tarih) != substr(tarih, 1, 10) LIMIT 5"
+    ).fetchall()
+    if hatali:
+        ornekler = ", ".join(f"#{islem_id} {tarih!r}" for islem_id, tarih in hatali)
+        raise VeritabaniHatasi(f"Geçersiz tarihli işlemler var, önce düzeltilmeli: {ornekler}")
+
+    # tarih üzerindeki indeksler gun'a taşınır; özet tetikleyicileri sanal tarih sütununun
+    # güncellenmesini göremeyeceğinden (UPDATE OF tarih) gun ve ay ile yeniden yazılır
+    for indeks in ("idx_islemler_tarih", "idx_islemler_tip_tarih", "idx_islemler_kategori_tarih"):
+        conn.execute(f"DROP INDEX {indeks}")
+    for tetikleyici in ("trg_islemler_toplam_ekle", "trg_islemler_toplam_sil", "trg_islemler_toplam_guncelle"):
+        conn.execute(f"DROP TRIGGER {tetikleyici}")
+
+    _tabloyu_yeniden_kur(conn, "islemler", '''
+    CREATE TABLE {tablo} (
+        id INTEGER PRIMARY KEY,
+        gun INTEGER NOT NULL CHECK (typeof(gun) = 'integer'),
+        miktar INTEGER NOT NULL,
+        aciklama TEXT,
+        kategori_id INTEGER,
+        tip TEXT NOT NULL,
+        tarih TEXT GENERATED ALWAYS AS (date(gun)) VIRTUAL,
+        ay TEXT GENERATED ALWAYS AS (strftime('%Y-%m', gun)) STORED,
+        FOREIGN KEY (kategori_id) REFERENCES kategoriler (id)
+    )
+    ''', ["id", "gun", "miktar", "aciklama", "kategori_id", "tip"],
+        ["id", "CAST(julianday(tarih) + 0.5 AS INTEGER)", "miktar", "aciklama", "kategori_id", "tip"])
+
+    conn.execute("CREATE INDEX idx_islemler_gun ON islemler (gun)")
+    conn.execute("CREATE INDEX idx_islemler_tip_gun ON islemler (tip, gun)")
+    conn.execute("CREATE INDEX idx_islemler_kategori_gun ON islemler (kategori_id, gun)")
+    conn.execute("CREATE INDEX idx_islemler_ay ON islemler (ay, tip, kategori_id, miktar)")
+
+    conn.execute('''
+    CREATE TRIGGER trg_islemler_toplam_ekle AFTER INSERT ON islemler
+    BEGIN
+        INSERT INTO aylik_toplamlar (ay, tip, kategori_id, toplam, adet)
+        VALUES (NEW.ay, NEW.tip, IFNULL(NEW.kategori_id, 0), NEW.miktar, 1)
+        ON CONFLICT (ay, tip, kategori_id) DO UPDATE SET toplam = toplam + excluded.toplam, adet = adet + 1;
+    END
+    ''')
+    conn.execute('''
+    CREATE TRIGGER trg_islemler_toplam_sil AFTER DELETE ON islemler
+    BEGIN
+        UPDATE aylik_toplamlar SET toplam = toplam - OLD.miktar, adet = adet - 1
+        WHERE ay = OLD.ay AND tip = OLD.tip AND kategori_id = IFNULL(OLD.kategori_id, 0);
+        DELETE FROM aylik_toplamlar
+        WHERE ay = OLD.ay AND tip = OLD.tip AND kategori_id = IFNULL(OLD.kategori_id, 0) AND adet = 0;
+    END
+    ''')
+    conn.execute('''
+    CREATE TRIGGER trg_islemler_toplam_guncelle AFTER UPDATE OF gun, miktar, kategori_id, tip ON islemler
+    BEGIN
+        UPDATE aylik_toplamlar SET toplam = toplam - OLD.miktar, adet = adet - 1
+        WHERE ay = OLD.ay AND tip = OLD.tip AND kategori_id = IFNULL(OLD.kategori_id, 0);
+        DELETE FROM aylik_toplamlar
+        WHERE ay = OLD.ay AND tip = OLD.tip AND kategori_id = IFNULL(OLD.kategori_id, 0) AND adet = 0;
+        INSERT INTO aylik_toplamlar (ay, tip, kategori_id, toplam, adet)
+        VALUES (NEW.ay, NEW.tip, IFNULL(NEW.kategori_id, 0), NEW.miktar, 1)
+        ON CONFLICT (ay, tip, kategori_id) DO UPDATE SET toplam = toplam + excluded.toplam, adet = adet + 1;
+    END
+    ''')
+
+
+def _goc_8_gunluk_toplamlar(conn):
+    """(gun, tip) bazında tetikleyicilerle güncel tutulan günlük özet tablosu.
+
+    Uzun aralıklı zaman serileri (günlük bakiye ve harcama) ham işlemlere inmeden bu tablodan
+    okunur: on yıllık geçmiş en fazla ~7.300 satırdır. Arşivlenmiş yıllar göçte eklenemez
+    (arşivler bağlı değildir); 'python veritabani.py --ozet-yenile' ile eklenir.
+    """
+    conn.execute('''
+    CREATE TABLE gunluk_toplamlar (
+        gun INTEGER NOT NULL,
+        tip TEXT NOT NULL,
+        toplam INTEGER NOT NULL,
+        adet INTEGER NOT NULL,
+        PRIMARY KEY (gun, tip)
+    ) WITHOUT ROWID
+    ''')
+
+    conn.execute('''
+    CREATE TRIGGER trg_islemler_gunluk_ekle AFTER INSERT ON islemler
+    BEGIN
+        INSERT INTO gunluk_toplamlar (gun, tip, toplam, adet)
+        VALUES (NEW.gun, NEW.tip, NEW.miktar, 1)
+        ON CONFLICT (gun, tip) DO UPDATE SET toplam = toplam + excluded.toplam, adet = adet + 1;
+    END
+    ''')
+    conn.execute('''
+    CREATE TRIGGER trg_islemler_gunluk_sil AFTER DELETE ON islemler
+    BEGIN
+        UPDATE gunluk_toplamlar SET toplam = toplam - OLD.miktar, adet = adet - 1
+        WHERE gun = OLD.gun AND tip = OLD.tip;
+        DELETE FROM gunluk_toplamlar WHERE gun = OLD.gun AND tip = OLD.tip AND adet = 0;
+    END
+    ''')
+    conn.execute('''
+    CREATE TRIGGER trg_islemler_gunluk_guncelle AFTER UPDATE OF gun, miktar, tip ON islemler
+    BEGIN
+        UPDATE gunluk_toplamlar SET toplam = toplam - OLD.miktar, adet = adet - 1
+        WHERE gun = OLD.gun AND tip = OLD.tip;
+        DELETE FROM gunluk_toplamlar WHERE gun = OLD.gun AND tip = OLD.tip AND adet = 0;
+        INSERT INTO gunluk_toplamlar (gun, tip, toplam, adet)
+        VALUES (NEW.gun, NEW.tip, NEW.miktar, 1)
+        ON CONFLICT (gun, tip) DO UPDATE SET toplam = toplam + excluded.toplam, adet = adet + 1;
+    END
+    ''')
+
+    conn.execute('''
+    INSERT INTO gunluk_toplamlar (gun, tip, toplam, adet)
+    SELECT gun, tip, SUM(miktar), COUNT(*)
+    FROM islemler
+    GROUP BY gun, tip
+    ''')
+
+
+def _goc_9_parmak_izi(conn):
+    """Aynı işlemin iki kez kaydedildiğini indeksle bulmak için parmak_izi sütunu.
+
+    SQLite'ta blake2b olmadığından sütun üretilmiş sütun olamaz; değeri yazan taraf (depo,
+    ice_aktarma) parmak_izi() ile hesaplar. Mevcut satırlar, fonksiyon bu bağlantıya geçici
+    olarak tanıtılarak tek UPDATE ile doldurulur. Aynı gün aynı tutarda iki harcama gerçek
+    olabileceğinden indeks tekil değildir; kopya kararı ekleme anında verilir.
+    """
+    conn.execute("ALTER TABLE islemler ADD COLUMN parmak_izi INTEGER")
+    conn.create_function("parmak_izi", 5, parmak_izi, deterministic=True)
+    try:
+        conn.execute("UPDATE islemler SET parmak_izi = parmak_izi(gun, miktar, kategori_id, tip, aciklama)")
+    finally:
+        conn.create_function("parmak_izi", 5, None)
+    conn.execute("CREATE INDEX idx_islemler_parmak_izi ON islemler (parmak_izi)")
+
+
+# Sıralı göç listesi: i. eleman uygulandıktan sonra user_version = i + 1 olur.
+# Yayımlanmış bir göç asla değiştirilmez; şema değişiklikleri listenin sonuna eklenir.
+GOCLER = [
+    _goc_1_tablolar,
+    _goc_2_indeksler,
+    _goc_3_varsayilan_kategoriler,
+    _goc_4_aylik_toplamlar,
+    _goc_5_kurus,
+    _goc_6_aciklama_arama,
+    _goc_7_gun_numarasi,
+    _goc_8_gunluk_toplamlar,
+    _goc_9_parmak_izi,
+]
+
+SEMA_SURUMU = len(GOCLER)
+
+
+def sema_surumu(conn):
+    """Veritabanının mevcut şema sürümünü döndürür"""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def veritabanini_guncelle(conn):
+    """Eksik göçleri sırayla, her biri kendi işlemi (transaction) içinde uygular"""
+    mevcut = sema_surumu(conn)
+    if mevcut > SEMA_SURUMU:
+        raise VeritabaniHatasi(f"Veritabanı şema sürümü ({mevcut}) bu uygulamanın desteklediğinden "
+                               f"({SEMA_SURUMU}) daha yeni")
+
+    for surum in range(mevcut, SEMA_SURUMU):
+        try:
+            conn.execute("BEGIN")
+            GOCLER[surum](conn)
+            conn.execute(f"PRAGMA user_version = {surum + 1}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    return mevcut
+
+
+def _ayarla(conn, ayarlar):
+    for ad, deger in ayarlar.items():
+        conn.execute(f"PRAGMA {ad} = {deger}")
+
+
+def baglan(yol=VERITABANI_YOLU):
+    """Veritabanına yazma bağlantısı açar (WAL) ve şemayı güncel sürüme yükseltir"""
+    klasor = os.path.dirname(yol)
+    if klasor and not os.path.exists(klasor):
+        os.makedirs(klasor)
+
+    conn = sqlite3.connect(yol, factory=ZamanliBaglanti)
+    try:
+        _ayarla(conn, YAZICI_AYARLARI | BAGLANTI_AYARLARI)
+        veritabanini_guncelle(conn)
+    except Exception:
+        conn.close()
+        raise
+    return conn
+
+
+def ozetleri_yeniden_olustur(conn, kaynak="islemler"):
+    """Özet tablolarını kaynak tablodan/görünümden baştan hesaplar (tek işlem içinde).
+
+    Arşivlenmiş yıllar da toplamlara girmelidir; bunun için arşivler bağlanıp
+    kaynak olarak tum_islemler verilir (bkz. arsiv.arsivleri_bagla). islemler tablosunda
+    ay ve gun sütunlarından okunur; görünümde eski sürümlü arşivler olabileceğinden tarihten hesaplanır.
+    """
+    if kaynak == "islemler":
+        ay, gun = "ay", "gun"
+    else:
+        ay, gun = "strftime('%Y-%m', tarih)", "CAST(julianday(tarih) + 0.5 AS INTEGER)"
+    with conn:
+        conn.execute("DELETE FROM aylik_toplamlar")
+        conn.execute(f'''
+        INSERT INTO aylik_toplamlar (ay, tip, kategori_id, toplam, adet)
+        SELECT {ay}, tip, IFNULL(kategori_id, 0), SUM(miktar), COUNT(*)
+        FROM {kaynak}
+        GROUP BY 1, 2, 3
+        ''')
+        conn.execute("DELETE FROM gunluk_toplamlar")
+        conn.execute(f'''
+        INSERT INTO gunluk_toplamlar (gun, tip, toplam, adet)
+        SELECT {gun}, tip, SUM(miktar), COUNT(*)
+        FROM {kaynak}
+        GROUP BY 1, 2
+        ''')
+
+
+def salt_okunur_baglan(yol=VERITABANI_YOLU, check_same_thread=True):
+    """Arka plan işleri için salt okunur bağlantı açar (şemayı değiştirmez)"""
+    uri = pathlib.Path(yol).resolve().as_uri() + "?mode=ro"
+    conn = sqlite3.connect(uri, uri=True, check_same_thread=check_same_thread, factory=ZamanliBaglanti)
+    _ayarla(conn, BAGLANTI_AYARLARI)
+    return conn
+
+
+class BaglantiYoneticisi:
+    """Bir veritabanı için tek yazma bağlantısı ve küçük bir salt okunur bağlantı havuzu.
+
+    yazici ana iş parçacığına aittir. Okuma bağlantıları ilk istendiklerinde açılır,
+    herhangi bir iş parçacığında kullanılabilir ve okuyucu() ile ödünç alınıp geri verilir;
+    havuz doluysa bir bağlantı boşalana kadar beklenir.
+    """
+
+    def __init__(self, yol=VERITABANI_YOLU, okuyucu_sayisi=2):
+        self.yol = yol
+        self.yazici = baglan(yol)
+        self._bos_okuyucular = queue.LifoQueue()
+        self._acilabilecek = okuyucu_sayisi
+        self._kapali = False
+
+    @contextmanager
+    def okuyucu(self):
+        """Havuzdan bir salt okunur bağlantı ödünç verir"""
+        if self._kapali:
+            raise sqlite3.ProgrammingError("Bağlantı yöneticisi kapatıldı")
+        try:
+            conn = self._bos_okuyucular.get_nowait()
+        except queue.Empty:
+            conn = self._yeni_okuyucu()
+        try:
+            yield conn
+        finally:
+            if self._kapali:
+                conn.close()
+            else:
+                self._bos_okuyucular.put(conn)
+
+    def _yeni_okuyucu(self):
+        with self._bos_okuyucular.mutex:
+            acilabilir = self._acilabilecek > 0
+            if acilabilir:
+                self._acilabilecek -= 1
+        if not acilabilir:
+            return self._bos_okuyucular.get()
+        return salt_okunur_baglan(self.yol, check_same_thread=False)
+
+    def kapat(self):
+        """Boştaki okuyucuları kapatır, WAL dosyasını ana dosyaya aktarıp sıfırlar ve yazıcıyı kapatır.
+
+        O an ödünçte olan okuyucular geri verildiklerinde kapatılır.
+        """
+        if self._kapali:
+            return
+        self._kapali = True
+        while True:
+            try:
+                self._bos_okuyucular.get_nowait().close()
+            except queue.Empty:
+                break
+        try:
+            self.yazici.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        finally:
+            self.yazici.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Veritabanı şemasını güncel sürüme yükseltir")
+    parser.add_argument("--veritabani", default=VERITABANI_YOLU, help="Veritabanı dosyası")
+    parser.add_argument("--ozet-yenile", action="store_true",
+                        help="Özet tablolarını işlemlerden yeniden hesaplar")
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.veritabani)
+    try:
+        onceki = veritabanini_guncelle(conn)
+        print(f"Şema sürümü: {onceki} -> {SEMA_SURUMU}")
+        if args.ozet_yenile:
+            import arsiv
+
+            with arsiv.arsivler_bagli(conn) as arsivler:
+                ozetleri_yeniden_olustur(conn, "tum_islemler")
+            print(f"Özet tabloları yeniden oluşturuldu ({len(arsivler)} arşiv dahil)")
+    finally:
+        conn.close()